@@ -7,7 +7,9 @@ from app.api.api_v1.endpoints import (
     market_intelligence,
     compliance_tools,
     community,
-    marketplace
+    marketplace,
+    data_collection,
+    home
 )
 
 api_router = APIRouter()
@@ -35,3 +37,9 @@ api_router.include_router(community.router, prefix="/community", tags=["社区
 
 # 二手交易路由
 api_router.include_router(marketplace.router, prefix="/marketplace", tags=["二手交易"])
+
+# 数据采集路由
+api_router.include_router(data_collection.router, prefix="/data-collection", tags=["数据采集"])
+
+# 首页聚合路由
+api_router.include_router(home.router, prefix="/home", tags=["首页"])
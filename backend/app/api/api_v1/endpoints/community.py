@@ -3,6 +3,9 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from app.core.database import get_db
+from app.core.responses import RowSerializer
+from app.core.http_cache import conditional_get
+from app.core.cache import coalesced
 from app.core.deps import get_current_active_user, get_current_superuser
 from app.services.community_service import CommunityService
 from app.schemas.community import (
@@ -11,20 +14,31 @@ from app.schemas.community import (
     CommunityComment, CommunityCommentCreate, CommunityLikeCreate,
     CommunityFavoriteCreate, CommunityCategory, CommunityCategoryCreate
 )
+from app.schemas.tag import PopularTag
 from app.models.user import User as UserModel
 from app.models.community import (
+    CommunityPost as CommunityPostModel,
     PostType, PostStatus, PostPriority
 )
 
 router = APIRouter()
 
+# 列表接口直接由行元组组装响应，跳过逐行的pydantic校验
+post_rows = RowSerializer(CommunityPostModel, CommunityPost)
+
+def count_post_view(post_id: int, db: Session):
+    """详情未变化返回304时仍记录浏览次数"""
+    CommunityService.increment_view_count(db, post_id)
+
 @router.get("/", response_model=List[CommunityPost])
+@conditional_get("community")
 async def get_community_posts(
     post_type: Optional[PostType] = Query(None, description="帖子类型"),
     status: Optional[PostStatus] = Query(None, description="帖子状态"),
     priority: Optional[PostPriority] = Query(None, description="优先级"),
     category_id: Optional[int] = Query(None, description="分类ID"),
     keyword: Optional[str] = Query(None, description="关键词搜索"),
+    tag: Optional[str] = Query(None, description="按标签过滤（精确匹配）"),
     author_id: Optional[int] = Query(None, description="作者ID"),
     is_featured: Optional[bool] = Query(None, description="是否推荐"),
     is_official: Optional[bool] = Query(None, description="是否官方"),
@@ -45,6 +59,7 @@ async def get_community_posts(
         priority=priority,
         category_id=category_id,
         keyword=keyword,
+        tag=tag,
         author_id=author_id,
         is_featured=is_featured,
         is_official=is_official,
@@ -57,19 +72,22 @@ async def get_community_posts(
         sort_by=sort_by,
         sort_order=sort_order
     )
-    return CommunityService.get_posts_list(db, query)
+    return post_rows.response(CommunityService.build_posts_query(db, query))
 
 @router.get("/stats", response_model=CommunityStats)
+@conditional_get("community", max_age=300, time_window=300)
 async def get_community_stats(db: Session = Depends(get_db)):
     """获取社区统计信息 - 公开访问"""
-    return CommunityService.get_community_stats(db)
+    return await coalesced("community", CommunityStats, CommunityService.get_community_stats, stale_ttl=600)
 
 @router.get("/categories", response_model=List[CommunityCategory])
+@conditional_get("community", max_age=600)
 async def get_community_categories(db: Session = Depends(get_db)):
     """获取社区分类列表 - 公开访问"""
     return CommunityService.get_categories(db)
 
 @router.get("/featured", response_model=List[CommunityPost])
+@conditional_get("community")
 async def get_featured_posts(
     limit: int = Query(10, ge=1, le=50, description="返回记录数"),
     db: Session = Depends(get_db)
@@ -78,14 +96,16 @@ async def get_featured_posts(
     return CommunityService.get_featured_posts(db, limit)
 
 @router.get("/hot", response_model=List[CommunityPost])
+@conditional_get("community", time_window=300)
 async def get_hot_posts(
     limit: int = Query(10, ge=1, le=50, description="返回记录数"),
     db: Session = Depends(get_db)
 ):
     """获取热门帖子 - 公开访问"""
-    return CommunityService.get_hot_posts(db, limit)
+    return await coalesced("community", List[CommunityPost], CommunityService.get_hot_posts, limit)
 
 @router.get("/latest", response_model=List[CommunityPost])
+@conditional_get("community")
 async def get_latest_posts(
     limit: int = Query(20, ge=1, le=100, description="返回记录数"),
     db: Session = Depends(get_db)
@@ -94,15 +114,28 @@ async def get_latest_posts(
     return CommunityService.get_latest_posts(db, limit)
 
 @router.get("/trending", response_model=List[CommunityPost])
+@conditional_get("community", time_window=3600)
 async def get_trending_posts(
     days: int = Query(7, ge=1, le=30, description="天数范围"),
     limit: int = Query(10, ge=1, le=50, description="返回记录数"),
     db: Session = Depends(get_db)
 ):
     """获取趋势帖子 - 公开访问"""
-    return CommunityService.get_trending_posts(db, days, limit)
+    return await coalesced(
+        "community", List[CommunityPost], CommunityService.get_trending_posts, days, limit, ttl=300
+    )
+
+@router.get("/tags/popular", response_model=List[PopularTag])
+@conditional_get("community", max_age=300)
+async def get_popular_post_tags(
+    limit: int = Query(20, ge=1, le=100, description="返回标签数"),
+    db: Session = Depends(get_db)
+):
+    """获取热门帖子标签及帖子数 - 公开访问"""
+    return CommunityService.get_popular_tags(db, limit)
 
 @router.get("/search", response_model=List[CommunityPost])
+@conditional_get("community")
 async def search_posts(
     q: str = Query(..., min_length=1, description="搜索关键词"),
     limit: int = Query(20, ge=1, le=100, description="返回记录数"),
@@ -112,6 +145,7 @@ async def search_posts(
     return CommunityService.search_posts(db, q, limit)
 
 @router.get("/{post_id}", response_model=CommunityPost)
+@conditional_get("community", max_age=0, on_not_modified=count_post_view)
 async def get_post_detail(
     post_id: int,
     db: Session = Depends(get_db)
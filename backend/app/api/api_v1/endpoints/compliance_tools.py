@@ -3,6 +3,9 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from app.core.database import get_db
+from app.core.responses import RowSerializer
+from app.core.http_cache import conditional_get
+from app.core.cache import coalesced
 from app.core.deps import get_current_active_user, get_current_superuser
 from app.services.compliance_tool_service import ComplianceToolService
 from app.schemas.compliance_tool import (
@@ -12,18 +15,24 @@ from app.schemas.compliance_tool import (
 )
 from app.models.user import User as UserModel
 from app.models.compliance_tool import (
+    ComplianceTool as ComplianceToolModel,
     ToolType, ToolCategory, ToolStatus, AccessLevel
 )
 
 router = APIRouter()
 
+# 列表接口直接由行元组组装响应，跳过逐行的pydantic校验
+tool_rows = RowSerializer(ComplianceToolModel, ComplianceTool)
+
 @router.get("/", response_model=List[ComplianceTool])
+@conditional_get("compliance")
 async def get_compliance_tools(
     tool_type: Optional[ToolType] = Query(None, description="工具类型"),
     category: Optional[ToolCategory] = Query(None, description="工具分类"),
     status: Optional[ToolStatus] = Query(None, description="工具状态"),
     access_level: Optional[AccessLevel] = Query(None, description="访问级别"),
     keyword: Optional[str] = Query(None, description="关键词搜索"),
+    tag: Optional[str] = Query(None, description="按标签过滤（精确匹配）"),
     vendor: Optional[str] = Query(None, description="供应商"),
     is_featured: Optional[bool] = Query(None, description="是否推荐"),
     is_verified: Optional[bool] = Query(None, description="是否已验证"),
@@ -44,6 +53,7 @@ async def get_compliance_tools(
         status=status,
         access_level=access_level,
         keyword=keyword,
+        tag=tag,
         vendor=vendor,
         is_featured=is_featured,
         is_verified=is_verified,
@@ -56,14 +66,16 @@ async def get_compliance_tools(
         sort_by=sort_by,
         sort_order=sort_order
     )
-    return ComplianceToolService.get_tools_list(db, query)
+    return tool_rows.response(ComplianceToolService.build_tools_query(db, query))
 
 @router.get("/stats", response_model=ComplianceToolStats)
+@conditional_get("compliance", max_age=300)
 async def get_tool_stats(db: Session = Depends(get_db)):
     """获取合规工具统计信息 - 公开访问"""
-    return ComplianceToolService.get_tool_stats(db)
+    return await coalesced("compliance", ComplianceToolStats, ComplianceToolService.get_tool_stats, stale_ttl=600)
 
 @router.get("/featured", response_model=List[ComplianceTool])
+@conditional_get("compliance")
 async def get_featured_tools(
     limit: int = Query(10, ge=1, le=50, description="返回记录数"),
     db: Session = Depends(get_db)
@@ -72,6 +84,7 @@ async def get_featured_tools(
     return ComplianceToolService.get_featured_tools(db, limit)
 
 @router.get("/popular", response_model=List[ComplianceTool])
+@conditional_get("compliance")
 async def get_popular_tools(
     limit: int = Query(10, ge=1, le=50, description="返回记录数"),
     db: Session = Depends(get_db)
@@ -80,6 +93,7 @@ async def get_popular_tools(
     return ComplianceToolService.get_popular_tools(db, limit)
 
 @router.get("/free", response_model=List[ComplianceTool])
+@conditional_get("compliance")
 async def get_free_tools(
     limit: int = Query(20, ge=1, le=100, description="返回记录数"),
     db: Session = Depends(get_db)
@@ -88,6 +102,7 @@ async def get_free_tools(
     return ComplianceToolService.get_free_tools(db, limit)
 
 @router.get("/search", response_model=List[ComplianceTool])
+@conditional_get("compliance")
 async def search_tools(
     q: str = Query(..., min_length=1, description="搜索关键词"),
     limit: int = Query(20, ge=1, le=100, description="返回记录数"),
@@ -97,6 +112,7 @@ async def search_tools(
     return ComplianceToolService.search_tools(db, q, limit)
 
 @router.get("/{tool_id}", response_model=ComplianceTool)
+@conditional_get("compliance")
 async def get_tool_detail(
     tool_id: int,
     db: Session = Depends(get_db)
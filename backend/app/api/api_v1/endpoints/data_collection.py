@@ -1,53 +1,144 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-from app.core.database import get_db
+from app.core.database import get_db, SessionLocal
 from app.core.deps import get_current_superuser
-from app.services.data_collection_service import DataCollectionService
+from app.services.data_collection_service import DataCollectionService, COLLECTION_SOURCES, DATA_SOURCES
+from app.services.collection_job_service import CollectionJobService, SourceBusyError
+from app.services.collection_scheduler import CollectionScheduleService
+from app.tasks.collection import run_collection_job_task
+from app.schemas.collection_job import (
+    CollectionJob, CollectionStatus, CollectionSourceState, CollectionSourceStateUpdate
+)
+from app.models.collection_job import JobStatus, FINISHED_JOB_STATUSES
 from app.models.user import User as UserModel
 
 router = APIRouter()
 
-@router.post("/start-collection")
+@router.post("/start-collection", response_model=CollectionJob)
 async def start_data_collection(
-    background_tasks: BackgroundTasks,
+    mode: str = Query("insert", regex="^(insert|upsert)$", description="入库模式: insert只新增, upsert同时更新有变化的记录"),
+    sources: Optional[List[str]] = Query(None, description="要采集的数据源，默认全部"),
+    incremental: bool = Query(False, description="是否从上次采集的游标开始增量采集"),
     current_user: UserModel = Depends(get_current_superuser),
     db: Session = Depends(get_db)
 ):
-    """启动数据采集任务（仅管理员）"""
-    
-    async def run_collection():
-        collector = DataCollectionService()
-        results = await collector.collect_from_multiple_sources()
-        # 这里可以添加结果通知逻辑
-        print(f"数据采集完成，共采集 {results['total_collected']} 条数据")
+    """启动数据采集任务（仅管理员），任务写入队列由worker进程执行；同一数据源已在采集时返回409"""
+    sources = sources or list(COLLECTION_SOURCES)
+    unknown = [source for source in sources if source not in COLLECTION_SOURCES]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"未知的数据源: {', '.join(unknown)}"
+        )
     
-    background_tasks.add_task(run_collection)
+    try:
+        job = CollectionJobService.create_job(db, sources, mode, current_user.id)
+    except SourceBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     
-    return {
-        "message": "数据采集任务已启动",
-        "status": "running",
-        "initiated_by": current_user.username
-    }
+    try:
+        run_collection_job_task.enqueue(job_id=job.id, mode=mode, sources=sources, incremental=incremental)
+    except Exception as e:
+        CollectionJobService.mark_finished(db, job.id, JobStatus.FAILED, f"任务入队失败: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="采集任务入队失败，请稍后重试"
+        )
+    return job
 
-@router.get("/collection-status")
+@router.get("/collection-status", response_model=CollectionStatus)
 async def get_collection_status(
-    current_user: UserModel = Depends(get_current_superuser)
+    current_user: UserModel = Depends(get_current_superuser),
+    db: Session = Depends(get_db)
 ):
-    """获取数据采集状态"""
-    # 这里可以实现真实的状态查询逻辑
-    return {
-        "status": "idle",  # idle, running, completed, failed
-        "last_run": "2024-08-05T10:00:00Z",
-        "total_collected": 1250,
-        "sources": {
-            "alibaba": {"status": "completed", "count": 450},
-            "made_in_china": {"status": "completed", "count": 380},
-            "enterprise_api": {"status": "completed", "count": 320},
-            "industry_database": {"status": "completed", "count": 100}
-        }
-    }
+    """获取数据采集状态：执行中的任务和最近一次任务"""
+    return CollectionJobService.get_collection_status(db)
+
+@router.get("/jobs", response_model=List[CollectionJob])
+async def get_collection_jobs(
+    job_status: Optional[JobStatus] = Query(None, alias="status", description="任务状态"),
+    source: Optional[str] = Query(None, description="数据源"),
+    skip: int = Query(0, ge=0, description="跳过记录数"),
+    limit: int = Query(20, ge=1, le=100, description="返回记录数"),
+    current_user: UserModel = Depends(get_current_superuser),
+    db: Session = Depends(get_db)
+):
+    """获取采集任务列表"""
+    return CollectionJobService.get_jobs_list(db, job_status, source, skip, limit)
+
+@router.get("/jobs/{job_id}", response_model=CollectionJob)
+async def get_collection_job(
+    job_id: int,
+    current_user: UserModel = Depends(get_current_superuser),
+    db: Session = Depends(get_db)
+):
+    """获取采集任务详情及各数据源进度"""
+    job = CollectionJobService.get_job(db, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="采集任务不存在"
+        )
+    return job
+
+@router.get("/jobs/{job_id}/progress")
+async def stream_collection_progress(
+    job_id: int,
+    interval: float = Query(1.0, ge=0.5, le=30.0, description="推送间隔（秒）"),
+    current_user: UserModel = Depends(get_current_superuser),
+    db: Session = Depends(get_db)
+):
+    """以 Server-Sent Events 推送采集进度，进度变化时发送，任务结束后发送 end 事件并关闭"""
+    if not CollectionJobService.get_job(db, job_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="采集任务不存在"
+        )
+    
+    def load():
+        session = SessionLocal()
+        try:
+            job = CollectionJobService.get_job(session, job_id)
+            return CollectionJob.model_validate(job).model_dump_json(), job.status in FINISHED_JOB_STATUSES
+        finally:
+            session.close()
+    
+    async def event_stream():
+        last_payload = None
+        while True:
+            payload, finished = await asyncio.to_thread(load)
+            if payload != last_payload:
+                yield f"event: progress\ndata: {payload}\n\n"
+                last_payload = payload
+            if finished:
+                yield "event: end\ndata: {}\n\n"
+                return
+            await asyncio.sleep(interval)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/jobs/{job_id}/cancel", response_model=CollectionJob)
+async def cancel_collection_job(
+    job_id: int,
+    current_user: UserModel = Depends(get_current_superuser),
+    db: Session = Depends(get_db)
+):
+    """取消采集任务，执行中的任务在当前批次入库后停止"""
+    job = CollectionJobService.request_cancel(db, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="采集任务不存在"
+        )
+    return job
 
 @router.post("/manual-add-supplier")
 async def manual_add_supplier(
@@ -74,48 +165,67 @@ async def manual_add_supplier(
         )
 
 @router.get("/data-sources")
-async def get_available_data_sources():
-    """获取可用的数据源列表"""
-    return {
-        "sources": [
-            {
-                "name": "alibaba",
-                "display_name": "阿里巴巴",
-                "type": "b2b_platform",
-                "status": "available",
-                "description": "全球最大的B2B平台，包含大量供应商信息",
-                "estimated_records": 50000,
-                "update_frequency": "daily"
-            },
-            {
-                "name": "made_in_china",
-                "display_name": "中国制造网",
-                "type": "b2b_platform", 
-                "status": "available",
-                "description": "中国领先的B2B平台",
-                "estimated_records": 30000,
-                "update_frequency": "daily"
-            },
-            {
-                "name": "enterprise_api",
-                "display_name": "企业信息API",
-                "type": "api_service",
-                "status": "requires_key",
-                "description": "企查查、天眼查等企业信息API",
-                "estimated_records": 100000,
-                "update_frequency": "real_time"
-            },
-            {
-                "name": "industry_database",
-                "display_name": "行业数据库",
-                "type": "industry_data",
-                "status": "available",
-                "description": "半导体行业协会、展会等专业数据",
-                "estimated_records": 5000,
-                "update_frequency": "weekly"
-            }
-        ]
-    }
+async def get_available_data_sources(db: Session = Depends(get_db)):
+    """获取可用的数据源列表及定时采集状态"""
+    states = {state.source: state for state in CollectionScheduleService.get_states(db)}
+    sources = []
+    for name, definition in DATA_SOURCES.items():
+        state = states.get(name)
+        sources.append({
+            "name": name,
+            "display_name": definition["display_name"],
+            "type": definition["type"],
+            "status": definition["status"],
+            "description": definition["description"],
+            "estimated_records": definition["estimated_records"],
+            "update_frequency": state.update_frequency if state else definition["update_frequency"],
+            "schedule_enabled": state.enabled if state else False,
+            "last_run_at": state.last_run_at if state else None,
+            "last_status": state.last_status.value if state and state.last_status else None,
+            "next_run_at": state.next_run_at if state and state.enabled else None
+        })
+    return {"sources": sources}
+
+@router.get("/schedule", response_model=List[CollectionSourceState])
+async def get_collection_schedule(
+    current_user: UserModel = Depends(get_current_superuser),
+    db: Session = Depends(get_db)
+):
+    """获取各数据源的定时采集状态（上次/下次运行时间、结果和增量游标）"""
+    return CollectionScheduleService.get_states(db)
+
+@router.put("/schedule/{source}", response_model=CollectionSourceState)
+async def update_collection_schedule(
+    source: str,
+    schedule_update: CollectionSourceStateUpdate,
+    current_user: UserModel = Depends(get_current_superuser),
+    db: Session = Depends(get_db)
+):
+    """启用/停用数据源的定时采集或修改更新频率"""
+    state = CollectionScheduleService.update_state(
+        db, source, schedule_update.enabled, schedule_update.update_frequency
+    )
+    if not state:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="数据源不存在"
+        )
+    return state
+
+@router.post("/schedule/{source}/run-now", response_model=CollectionSourceState)
+async def run_collection_schedule_now(
+    source: str,
+    current_user: UserModel = Depends(get_current_superuser),
+    db: Session = Depends(get_db)
+):
+    """立即触发一次增量采集（由调度器在下一次检查时执行）"""
+    state = CollectionScheduleService.run_now(db, source)
+    if not state:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="数据源不存在"
+        )
+    return state
 
 @router.post("/configure-source")
 async def configure_data_source(
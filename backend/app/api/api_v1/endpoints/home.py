@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Request, Response
+from starlette.concurrency import run_in_threadpool
+import hashlib
+
+from app.core.cache import single_flight
+from app.core.http_cache import etag_matches
+from app.schemas.home import HomeSnapshot
+from app.services.home_service import HomeService, SNAPSHOT_KEY
+
+router = APIRouter()
+
+@router.get("/", response_model=HomeSnapshot)
+async def get_home(request: Request):
+    """获取首页聚合数据 - 公开访问（预先生成的快照）"""
+    payload = HomeService.get_snapshot()
+    if payload is None:
+        # 快照不存在或已过期：并发请求共享一次重建
+        payload = await single_flight("home", SNAPSHOT_KEY, lambda: run_in_threadpool(HomeService.rebuild))
+
+    etag = f'"{hashlib.blake2b(payload, digest_size=12).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=30"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload, media_type="application/json", headers=headers)
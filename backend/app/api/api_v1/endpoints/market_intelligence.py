@@ -3,6 +3,9 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from app.core.database import get_db
+from app.core.responses import RowSerializer
+from app.core.http_cache import conditional_get
+from app.core.cache import coalesced
 from app.core.deps import get_current_active_user, get_current_superuser
 from app.services.market_intelligence_service import MarketIntelligenceService
 from app.schemas.market_intelligence import (
@@ -10,20 +13,31 @@ from app.schemas.market_intelligence import (
     MarketIntelligenceQuery, MarketIntelligenceStats, MarketIntelligenceSummary,
     IntelligenceCommentCreate, IntelligenceComment, IntelligenceViewCreate
 )
+from app.schemas.tag import PopularTag
 from app.models.user import User as UserModel
 from app.models.market_intelligence import (
+    MarketIntelligence as MarketIntelligenceModel,
     IntelligenceType, IntelligencePriority, IntelligenceStatus, MarketRegion
 )
 
 router = APIRouter()
 
+# 列表接口直接由行元组组装响应，跳过逐行的pydantic校验
+intelligence_rows = RowSerializer(MarketIntelligenceModel, MarketIntelligence)
+
+def count_intelligence_view(intelligence_id: int, db: Session):
+    """详情未变化返回304时仍记录浏览次数"""
+    MarketIntelligenceService.increment_view_count(db, intelligence_id)
+
 @router.get("/", response_model=List[MarketIntelligence])
+@conditional_get("market")
 async def get_market_intelligence(
     intelligence_type: Optional[IntelligenceType] = Query(None, description="情报类型"),
     priority: Optional[IntelligencePriority] = Query(None, description="优先级"),
     status: Optional[IntelligenceStatus] = Query(None, description="状态"),
     region: Optional[MarketRegion] = Query(None, description="地区"),
     keyword: Optional[str] = Query(None, description="关键词搜索"),
+    tag: Optional[str] = Query(None, description="按标签过滤（精确匹配）"),
     author: Optional[str] = Query(None, description="作者"),
     organization: Optional[str] = Query(None, description="发布机构"),
     is_featured: Optional[bool] = Query(None, description="是否精选"),
@@ -41,6 +55,7 @@ async def get_market_intelligence(
         status=status,
         region=region,
         keyword=keyword,
+        tag=tag,
         author=author,
         organization=organization,
         is_featured=is_featured,
@@ -50,14 +65,18 @@ async def get_market_intelligence(
         sort_by=sort_by,
         sort_order=sort_order
     )
-    return MarketIntelligenceService.get_intelligence_list(db, query)
+    return intelligence_rows.response(MarketIntelligenceService.build_intelligence_query(db, query))
 
 @router.get("/stats", response_model=MarketIntelligenceStats)
+@conditional_get("market", max_age=300, time_window=300)
 async def get_intelligence_stats(db: Session = Depends(get_db)):
     """获取市场情报统计信息 - 公开访问"""
-    return MarketIntelligenceService.get_intelligence_stats(db)
+    return await coalesced(
+        "market", MarketIntelligenceStats, MarketIntelligenceService.get_intelligence_stats, stale_ttl=600
+    )
 
 @router.get("/featured", response_model=List[MarketIntelligence])
+@conditional_get("market")
 async def get_featured_intelligence(
     limit: int = Query(10, ge=1, le=50, description="返回记录数"),
     db: Session = Depends(get_db)
@@ -66,14 +85,18 @@ async def get_featured_intelligence(
     return MarketIntelligenceService.get_featured_intelligence(db, limit)
 
 @router.get("/trending", response_model=List[MarketIntelligence])
+@conditional_get("market", time_window=300)
 async def get_trending_intelligence(
     limit: int = Query(10, ge=1, le=50, description="返回记录数"),
     db: Session = Depends(get_db)
 ):
     """获取热门市场情报 - 公开访问"""
-    return MarketIntelligenceService.get_trending_intelligence(db, limit)
+    return await coalesced(
+        "market", List[MarketIntelligence], MarketIntelligenceService.get_trending_intelligence, limit
+    )
 
 @router.get("/latest", response_model=List[MarketIntelligence])
+@conditional_get("market")
 async def get_latest_intelligence(
     limit: int = Query(10, ge=1, le=50, description="返回记录数"),
     db: Session = Depends(get_db)
@@ -81,7 +104,17 @@ async def get_latest_intelligence(
     """获取最新市场情报 - 公开访问"""
     return MarketIntelligenceService.get_latest_intelligence(db, limit)
 
+@router.get("/tags/popular", response_model=List[PopularTag])
+@conditional_get("market", max_age=300)
+async def get_popular_intelligence_tags(
+    limit: int = Query(20, ge=1, le=100, description="返回标签数"),
+    db: Session = Depends(get_db)
+):
+    """获取热门情报标签及情报数 - 公开访问"""
+    return MarketIntelligenceService.get_popular_tags(db, limit)
+
 @router.get("/search", response_model=List[MarketIntelligence])
+@conditional_get("market")
 async def search_intelligence(
     q: str = Query(..., min_length=1, description="搜索关键词"),
     limit: int = Query(20, ge=1, le=100, description="返回记录数"),
@@ -91,6 +124,7 @@ async def search_intelligence(
     return MarketIntelligenceService.search_intelligence(db, q, limit)
 
 @router.get("/{intelligence_id}", response_model=MarketIntelligence)
+@conditional_get("market", max_age=0, on_not_modified=count_intelligence_view)
 async def get_intelligence_detail(
     intelligence_id: int,
     db: Session = Depends(get_db)
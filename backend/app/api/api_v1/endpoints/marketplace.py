@@ -3,6 +3,9 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from app.core.database import get_db
+from app.core.responses import RowSerializer
+from app.core.http_cache import conditional_get
+from app.core.cache import coalesced
 from app.core.deps import get_current_active_user, get_current_superuser
 from app.services.marketplace_service import MarketplaceService
 from app.schemas.marketplace import (
@@ -13,12 +16,21 @@ from app.schemas.marketplace import (
 )
 from app.models.user import User as UserModel
 from app.models.marketplace import (
+    MarketplaceListing as MarketplaceListingModel,
     ListingType, ListingStatus, ProductCondition, PriceType
 )
 
 router = APIRouter()
 
+# 列表接口直接由行元组组装响应，跳过逐行的pydantic校验
+listing_rows = RowSerializer(MarketplaceListingModel, MarketplaceListing)
+
+def count_listing_view(listing_id: int, db: Session):
+    """详情未变化返回304时仍记录浏览次数"""
+    MarketplaceService.increment_view_count(db, listing_id)
+
 @router.get("/", response_model=List[MarketplaceListing])
+@conditional_get("marketplace")
 async def get_marketplace_listings(
     listing_type: Optional[ListingType] = Query(None, description="交易类型"),
     status: Optional[ListingStatus] = Query(None, description="状态"),
@@ -28,6 +40,7 @@ async def get_marketplace_listings(
     price_type: Optional[PriceType] = Query(None, description="价格类型"),
     country: Optional[str] = Query(None, description="国家"),
     keyword: Optional[str] = Query(None, description="关键词搜索"),
+    tag: Optional[str] = Query(None, description="按标签过滤（精确匹配）"),
     min_price: Optional[float] = Query(None, ge=0, description="最低价格"),
     max_price: Optional[float] = Query(None, ge=0, description="最高价格"),
     is_verified: Optional[bool] = Query(None, description="是否已验证"),
@@ -49,6 +62,7 @@ async def get_marketplace_listings(
         price_type=price_type,
         country=country,
         keyword=keyword,
+        tag=tag,
         min_price=min_price,
         max_price=max_price,
         is_verified=is_verified,
@@ -59,14 +73,18 @@ async def get_marketplace_listings(
         sort_by=sort_by,
         sort_order=sort_order
     )
-    return MarketplaceService.get_listings_list(db, query)
+    return listing_rows.response(MarketplaceService.build_listings_query(db, query))
 
 @router.get("/stats", response_model=MarketplaceStats)
+@conditional_get("marketplace", max_age=300, time_window=300)
 async def get_marketplace_stats(db: Session = Depends(get_db)):
     """获取交易市场统计信息 - 公开访问"""
-    return MarketplaceService.get_marketplace_stats(db)
+    return await coalesced(
+        "marketplace", MarketplaceStats, MarketplaceService.get_marketplace_stats, stale_ttl=600
+    )
 
 @router.get("/featured", response_model=List[MarketplaceListing])
+@conditional_get("marketplace")
 async def get_featured_listings(
     limit: int = Query(10, ge=1, le=50, description="返回记录数"),
     db: Session = Depends(get_db)
@@ -75,6 +93,7 @@ async def get_featured_listings(
     return MarketplaceService.get_featured_listings(db, limit)
 
 @router.get("/urgent", response_model=List[MarketplaceListing])
+@conditional_get("marketplace")
 async def get_urgent_listings(
     limit: int = Query(10, ge=1, le=50, description="返回记录数"),
     db: Session = Depends(get_db)
@@ -83,6 +102,7 @@ async def get_urgent_listings(
     return MarketplaceService.get_urgent_listings(db, limit)
 
 @router.get("/latest", response_model=List[MarketplaceListing])
+@conditional_get("marketplace")
 async def get_latest_listings(
     limit: int = Query(20, ge=1, le=100, description="返回记录数"),
     db: Session = Depends(get_db)
@@ -91,6 +111,7 @@ async def get_latest_listings(
     return MarketplaceService.get_latest_listings(db, limit)
 
 @router.get("/search", response_model=List[MarketplaceListing])
+@conditional_get("marketplace")
 async def search_listings(
     q: str = Query(..., min_length=1, description="搜索关键词"),
     limit: int = Query(20, ge=1, le=100, description="返回记录数"),
@@ -100,6 +121,7 @@ async def search_listings(
     return MarketplaceService.search_listings(db, q, limit)
 
 @router.get("/{listing_id}", response_model=MarketplaceListing)
+@conditional_get("marketplace", max_age=0, on_not_modified=count_listing_view)
 async def get_listing_detail(
     listing_id: int,
     db: Session = Depends(get_db)
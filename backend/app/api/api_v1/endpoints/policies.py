@@ -3,15 +3,22 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from app.core.database import get_db
+from app.core.responses import RowSerializer
+from app.core.http_cache import conditional_get
+from app.core.cache import coalesced
 from app.core.deps import get_current_active_user, get_current_superuser
 from app.services.policy_service import PolicyService
 from app.schemas.policy import Policy, PolicyCreate, PolicyUpdate, PolicyQuery, PolicyStats
 from app.models.user import User as UserModel
-from app.models.policy import PolicyUrgency, PolicyStatus, PolicyCategory
+from app.models.policy import Policy as PolicyModel, PolicyUrgency, PolicyStatus, PolicyCategory
 
 router = APIRouter()
 
+# 列表接口直接由行元组组装响应，跳过逐行的pydantic校验
+policy_rows = RowSerializer(PolicyModel, Policy)
+
 @router.get("/", response_model=List[Policy])
+@conditional_get("policy")
 async def get_policies(
     country: Optional[str] = Query(None, description="按国家过滤"),
     category: Optional[PolicyCategory] = Query(None, description="按分类过滤"),
@@ -36,14 +43,16 @@ async def get_policies(
         sort_by=sort_by,
         sort_order=sort_order
     )
-    return PolicyService.get_policies(db, query)
+    return policy_rows.response(PolicyService.build_policies_query(db, query))
 
 @router.get("/stats", response_model=PolicyStats)
+@conditional_get("policy", max_age=300, time_window=3600)
 async def get_policy_stats(db: Session = Depends(get_db)):
     """获取政策统计信息 - 公开访问"""
-    return PolicyService.get_policy_stats(db)
+    return await coalesced("policy", PolicyStats, PolicyService.get_policy_stats, stale_ttl=600)
 
 @router.get("/recent", response_model=List[Policy])
+@conditional_get("policy")
 async def get_recent_policies(
     limit: int = Query(10, ge=1, le=50, description="返回记录数"),
     db: Session = Depends(get_db)
@@ -52,6 +61,7 @@ async def get_recent_policies(
     return PolicyService.get_recent_policies(db, limit)
 
 @router.get("/high-impact", response_model=List[Policy])
+@conditional_get("policy")
 async def get_high_impact_policies(
     limit: int = Query(10, ge=1, le=50, description="返回记录数"),
     db: Session = Depends(get_db)
@@ -60,6 +70,7 @@ async def get_high_impact_policies(
     return PolicyService.get_high_impact_policies(db, limit)
 
 @router.get("/search", response_model=List[Policy])
+@conditional_get("policy")
 async def search_policies(
     q: str = Query(..., min_length=1, description="搜索关键词"),
     limit: int = Query(20, ge=1, le=100, description="返回记录数"),
@@ -69,6 +80,7 @@ async def search_policies(
     return PolicyService.search_policies(db, q, limit)
 
 @router.get("/{policy_id}", response_model=Policy)
+@conditional_get("policy")
 async def get_policy(
     policy_id: int,
     db: Session = Depends(get_db)
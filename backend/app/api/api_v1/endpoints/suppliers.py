@@ -3,18 +3,26 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from app.core.database import get_db
+from app.core.responses import RowSerializer
+from app.core.http_cache import conditional_get
+from app.core.cache import coalesced
 from app.core.deps import get_current_active_user, get_current_superuser
 from app.services.supplier_service import SupplierService
 from app.schemas.supplier import (
     Supplier, SupplierCreate, SupplierUpdate, SupplierQuery,
     SupplierStats, SupplierSummary
 )
+from app.schemas.tag import PopularTag
 from app.models.user import User as UserModel
-from app.models.supplier import SupplierType, SupplierScale, CertificationLevel
+from app.models.supplier import Supplier as SupplierModel, SupplierType, SupplierScale, CertificationLevel
 
 router = APIRouter()
 
+# 列表接口直接由行元组组装响应，跳过逐行的pydantic校验
+supplier_rows = RowSerializer(SupplierModel, Supplier)
+
 @router.get("/", response_model=List[Supplier])
+@conditional_get("supplier")
 async def get_suppliers(
     country: Optional[str] = Query(None, description="按国家过滤"),
     supplier_type: Optional[SupplierType] = Query(None, description="按供应商类型过滤"),
@@ -22,6 +30,7 @@ async def get_suppliers(
     certification_level: Optional[CertificationLevel] = Query(None, description="按认证级别过滤"),
     product_category: Optional[str] = Query(None, description="按产品类别过滤"),
     keyword: Optional[str] = Query(None, description="关键词搜索"),
+    tag: Optional[str] = Query(None, description="按标签过滤（精确匹配）"),
     min_rating: Optional[float] = Query(None, ge=0.0, le=5.0, description="最低评分"),
     is_verified: Optional[bool] = Query(None, description="是否已验证"),
     is_featured: Optional[bool] = Query(None, description="是否推荐"),
@@ -39,6 +48,7 @@ async def get_suppliers(
         certification_level=certification_level,
         product_category=product_category,
         keyword=keyword,
+        tag=tag,
         min_rating=min_rating,
         is_verified=is_verified,
         is_featured=is_featured,
@@ -47,14 +57,16 @@ async def get_suppliers(
         sort_by=sort_by,
         sort_order=sort_order
     )
-    return SupplierService.get_suppliers(db, query)
+    return supplier_rows.response(SupplierService.build_suppliers_query(db, query))
 
 @router.get("/stats", response_model=SupplierStats)
+@conditional_get("supplier", max_age=300)
 async def get_supplier_stats(db: Session = Depends(get_db)):
     """获取供应商统计信息 - 公开访问"""
-    return SupplierService.get_supplier_stats(db)
+    return await coalesced("supplier", SupplierStats, SupplierService.get_supplier_stats, stale_ttl=600)
 
 @router.get("/featured", response_model=List[Supplier])
+@conditional_get("supplier")
 async def get_featured_suppliers(
     limit: int = Query(10, ge=1, le=50, description="返回记录数"),
     db: Session = Depends(get_db)
@@ -63,6 +75,7 @@ async def get_featured_suppliers(
     return SupplierService.get_featured_suppliers(db, limit)
 
 @router.get("/top-rated", response_model=List[Supplier])
+@conditional_get("supplier")
 async def get_top_rated_suppliers(
     limit: int = Query(10, ge=1, le=50, description="返回记录数"),
     db: Session = Depends(get_db)
@@ -70,7 +83,18 @@ async def get_top_rated_suppliers(
     """获取高评分供应商 - 公开访问"""
     return SupplierService.get_top_rated_suppliers(db, limit)
 
+@router.get("/tags/popular", response_model=List[PopularTag])
+@conditional_get("supplier", max_age=300)
+async def get_popular_supplier_tags(
+    field: str = Query("product_categories", regex="^(product_categories|main_products|tags)$", description="统计字段"),
+    limit: int = Query(20, ge=1, le=100, description="返回标签数"),
+    db: Session = Depends(get_db)
+):
+    """获取热门产品类别/主营产品/标签及供应商数 - 公开访问"""
+    return SupplierService.get_popular_tags(db, field, limit)
+
 @router.get("/search", response_model=List[Supplier])
+@conditional_get("supplier")
 async def search_suppliers(
     q: str = Query(..., min_length=1, description="搜索关键词"),
     limit: int = Query(20, ge=1, le=100, description="返回记录数"),
@@ -80,6 +104,7 @@ async def search_suppliers(
     return SupplierService.search_suppliers(db, q, limit)
 
 @router.get("/{supplier_id}", response_model=Supplier)
+@conditional_get("supplier")
 async def get_supplier(
     supplier_id: int,
     db: Session = Depends(get_db)
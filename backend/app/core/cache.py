@@ -0,0 +1,395 @@
+"""
+服务层读缓存
+- 后端可插拔：RedisCacheBackend（settings.REDIS_URL，多实例共享）和 MemoryCacheBackend（进程内 LRU+TTL，单机或测试用）；
+  配置为redis但未安装redis包或连接失败时自动退回进程内缓存
+- 键按业务域划分命名空间，每个命名空间带代数（generation），失效时代数加一，旧键不再被读到并随TTL过期
+- 值为响应模型的JSON，命中时按 @cached 声明的类型还原为响应模型实例
+- 业务域数据提交后由 DataVersionService 的提交回调使对应命名空间失效
+
+用法:
+    @staticmethod
+    @cached("supplier", List[SupplierSchema], ttl=300)
+    def get_featured_suppliers(db: Session, limit: int = 10) -> List[SupplierSchema]:
+        ...
+
+热门、趋势、统计等聚合接口用 coalesced()（单飞 + 过期后台刷新），见文件末尾。
+
+测试中可用 set_cache_backend(MemoryCacheBackend()) 替换后端，无需Redis。
+"""
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set
+import asyncio
+import functools
+import hashlib
+import inspect
+import logging
+import threading
+import time
+
+import orjson
+from pydantic import TypeAdapter
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.data_version_service import DataVersionService
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    """缓存后端接口，key 已包含命名空间代数"""
+
+    name = "base"
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """读取值，不存在或已过期时返回None"""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: int):
+        """写入值，ttl 秒后过期"""
+
+    @abstractmethod
+    def add(self, key: str, value: bytes, ttl: int) -> bool:
+        """键不存在时写入，返回是否写入（用作跨进程的短期锁）"""
+
+    @abstractmethod
+    def get_generation(self, namespace: str) -> int:
+        """命名空间当前代数"""
+
+    @abstractmethod
+    def bump_generation(self, namespace: str):
+        """命名空间代数加一，使其下旧键全部失效"""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """进程内 LRU+TTL 缓存，只在当前进程内失效"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: int):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def add(self, key: str, value: bytes, ttl: int) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return False
+            self._entries[key] = (time.monotonic() + ttl, value)
+            return True
+
+    def get_generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    def bump_generation(self, namespace: str):
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis缓存，多个API实例和worker进程共享键与失效"""
+
+    name = "redis"
+
+    def __init__(self, url: str, key_prefix: str = "semix:cache"):
+        import redis
+
+        self.client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self.key_prefix = key_prefix
+        self.client.ping()
+
+    def _generation_key(self, namespace: str) -> str:
+        return f"{self.key_prefix}:gen:{namespace}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(f"{self.key_prefix}:{key}")
+
+    def set(self, key: str, value: bytes, ttl: int):
+        self.client.set(f"{self.key_prefix}:{key}", value, ex=ttl)
+
+    def add(self, key: str, value: bytes, ttl: int) -> bool:
+        return bool(self.client.set(f"{self.key_prefix}:{key}", value, ex=ttl, nx=True))
+
+    def get_generation(self, namespace: str) -> int:
+        return int(self.client.get(self._generation_key(namespace)) or 0)
+
+    def bump_generation(self, namespace: str):
+        self.client.incr(self._generation_key(namespace))
+
+
+class CacheMetrics:
+    """按命名空间统计命中、未命中、后端错误次数，以及过期值返回（stale）和合并到进行中计算（coalesced）的次数"""
+
+    def __init__(self):
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, namespace: str, event: str):
+        with self._lock:
+            counters = self._counters.setdefault(
+                namespace, {"hits": 0, "misses": 0, "errors": 0, "stale": 0, "coalesced": 0}
+            )
+            counters[event] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            result = {}
+            for namespace, counters in self._counters.items():
+                lookups = counters["hits"] + counters["stale"] + counters["misses"]
+                served = counters["hits"] + counters["stale"]
+                result[namespace] = dict(counters, hit_rate=round(served / lookups, 4) if lookups else 0.0)
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+
+
+metrics = CacheMetrics()
+
+_backend: Optional[CacheBackend] = None
+
+
+def _create_backend() -> CacheBackend:
+    if settings.CACHE_BACKEND == "redis":
+        try:
+            return RedisCacheBackend(settings.REDIS_URL)
+        except Exception as e:
+            logger.warning(f"Redis缓存不可用，使用进程内缓存: {e}")
+    return MemoryCacheBackend(settings.CACHE_MAX_ENTRIES)
+
+
+def get_cache_backend() -> CacheBackend:
+    global _backend
+    if _backend is None:
+        _backend = _create_backend()
+    return _backend
+
+
+def set_cache_backend(backend: Optional[CacheBackend]):
+    """替换缓存后端（测试用）；传 None 时下次使用按配置重新创建"""
+    global _backend
+    _backend = backend
+    metrics.reset()
+
+
+def invalidate(namespaces: Iterable[str]):
+    """使命名空间下的所有缓存失效"""
+    backend = get_cache_backend()
+    for namespace in namespaces:
+        try:
+            backend.bump_generation(namespace)
+        except Exception as e:
+            metrics.record(namespace, "errors")
+            logger.error(f"缓存失效失败 {namespace}: {e}")
+
+
+def cache_stats() -> Dict[str, Any]:
+    return {"backend": get_cache_backend().name, "namespaces": metrics.snapshot()}
+
+
+def _call_key(func: Callable, signature: inspect.Signature, args, kwargs) -> str:
+    """由函数名和除 db 外的参数生成缓存键"""
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    params = {name: value for name, value in bound.arguments.items() if name != "db"}
+    digest = hashlib.blake2b(
+        orjson.dumps(params, default=str, option=orjson.OPT_SORT_KEYS), digest_size=12
+    ).hexdigest()
+    return f"{func.__qualname__}:{digest}"
+
+
+def cached(namespace: str, result_type: Any, ttl: Optional[int] = None) -> Callable:
+    """
+    服务层读方法的读穿缓存
+    namespace: 业务域（与 DataVersionService 的域一致）；result_type: 返回的响应模型类型，如 SupplierSchema、List[SupplierSchema]；
+    被装饰的方法返回ORM对象，命中和未命中时都返回 result_type 的实例；返回 None 时不缓存
+    """
+    adapter = TypeAdapter(result_type)
+    expire = ttl or settings.CACHE_DEFAULT_TTL
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            backend = get_cache_backend()
+            call_key = _call_key(func, signature, args, kwargs)
+            key = None
+            try:
+                key = f"{namespace}:{backend.get_generation(namespace)}:{call_key}"
+                payload = backend.get(key)
+            except Exception as e:
+                metrics.record(namespace, "errors")
+                logger.error(f"读取缓存失败 {call_key}: {e}")
+                payload = None
+            if payload is not None:
+                metrics.record(namespace, "hits")
+                return adapter.validate_json(payload)
+
+            metrics.record(namespace, "misses")
+            result = func(*args, **kwargs)
+            if result is None:
+                return None
+            value = adapter.validate_python(result)
+            if key is not None:
+                try:
+                    backend.set(key, adapter.dump_json(value), expire)
+                except Exception as e:
+                    metrics.record(namespace, "errors")
+                    logger.error(f"写入缓存失败 {call_key}: {e}")
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+# ---------------------------------------------------------------------------
+# 单飞 + 过期后台刷新（stale-while-revalidate）
+# 用于热门、趋势和统计等多查询聚合接口：
+# - 同一进程内相同参数的并发请求共享一次进行中的计算（单飞），计算在线程池中用独立会话执行，不阻塞事件循环
+# - 值超过 ttl 后的 stale_ttl 时间内仍直接返回旧值，并由一个请求在后台刷新；
+#   多进程部署时通过后端的 add() 短期锁保证每个过期值只有一个进程刷新
+# - 命名空间失效（数据写入）后不返回旧值
+# ---------------------------------------------------------------------------
+
+_inflight: Dict[str, "asyncio.Task"] = {}
+_refresh_tasks: Set["asyncio.Task"] = set()
+
+
+async def single_flight(namespace: str, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    同一进程内相同 key 的并发调用共享一次 compute() 的结果
+    compute() 在独立的任务中执行，任一调用方（包括发起者）被取消都不会中断计算或影响其他等待者
+    """
+    task = _inflight.get(key)
+    if task is not None:
+        metrics.record(namespace, "coalesced")
+    else:
+        task = asyncio.ensure_future(compute())
+        _inflight[key] = task
+        task.add_done_callback(functools.partial(_finish_flight, key))
+    return await asyncio.shield(task)
+
+
+def _finish_flight(key: str, task: "asyncio.Task"):
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    # 没有等待者时避免 "exception was never retrieved" 警告
+    if not task.cancelled():
+        task.exception()
+
+
+async def coalesced(
+    namespace: str,
+    result_type: Any,
+    loader: Callable,
+    *args,
+    ttl: int = 60,
+    stale_ttl: int = 300,
+    **kwargs,
+) -> Any:
+    """
+    以单飞 + 过期后台刷新的方式调用服务层读方法 loader(db, *args, **kwargs)，返回 result_type 的实例
+    loader 在线程池中以独立的数据库会话调用，调用方不传 db
+
+    用法:
+        return await coalesced("community", List[CommunityPost], CommunityService.get_hot_posts, limit)
+    """
+    adapter = TypeAdapter(result_type)
+    backend = get_cache_backend()
+    call_key = _call_key(loader, inspect.signature(loader), (None,) + args, kwargs)
+
+    def load() -> bytes:
+        db = SessionLocal()
+        try:
+            value = adapter.validate_python(loader(db, *args, **kwargs))
+        finally:
+            db.close()
+        return orjson.dumps(
+            {"fresh_until": time.time() + ttl, "data": adapter.dump_python(value, mode="json")}
+        )
+
+    async def compute(key: Optional[str]) -> bytes:
+        payload = await run_in_threadpool(load)
+        if key is not None:
+            try:
+                backend.set(key, payload, ttl + stale_ttl)
+            except Exception as e:
+                metrics.record(namespace, "errors")
+                logger.error(f"写入缓存失败 {call_key}: {e}")
+        return payload
+
+    key = None
+    try:
+        key = f"{namespace}:{backend.get_generation(namespace)}:{call_key}"
+        payload = backend.get(key)
+    except Exception as e:
+        metrics.record(namespace, "errors")
+        logger.error(f"读取缓存失败 {call_key}: {e}")
+        payload = None
+
+    if payload is not None:
+        entry = orjson.loads(payload)
+        if entry["fresh_until"] > time.time():
+            metrics.record(namespace, "hits")
+        else:
+            metrics.record(namespace, "stale")
+            if key not in _inflight and _acquire_refresh(namespace, backend, key, min(ttl, 30)):
+                task = asyncio.create_task(_refresh(namespace, key, compute))
+                _refresh_tasks.add(task)
+                task.add_done_callback(_refresh_tasks.discard)
+        return adapter.validate_python(entry["data"])
+
+    metrics.record(namespace, "misses")
+    payload = await single_flight(namespace, key or call_key, lambda: compute(key))
+    return adapter.validate_python(orjson.loads(payload)["data"])
+
+
+def _acquire_refresh(namespace: str, backend: CacheBackend, key: str, lock_ttl: int) -> bool:
+    try:
+        return backend.add(f"{key}:refresh", b"1", lock_ttl)
+    except Exception as e:
+        metrics.record(namespace, "errors")
+        logger.error(f"获取缓存刷新锁失败 {key}: {e}")
+        return False
+
+
+async def _refresh(namespace: str, key: str, compute: Callable[[Optional[str]], Awaitable[bytes]]):
+    try:
+        await single_flight(namespace, key, lambda: compute(key))
+    except Exception as e:
+        metrics.record(namespace, "errors")
+        logger.error(f"后台刷新缓存失败 {key}: {e}")
+
+
+# 业务域数据提交后使同名命名空间失效
+DataVersionService.add_commit_listener(invalidate)
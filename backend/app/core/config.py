@@ -34,9 +34,28 @@ class Settings(BaseSettings):
     # Redis配置
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379")
     
+    # 读缓存配置
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "redis")  # redis / memory，Redis不可用时退回memory
+    CACHE_DEFAULT_TTL: int = 300  # 秒
+    CACHE_MAX_ENTRIES: int = 10000  # 进程内缓存的最大条目数
+    
+    # 首页快照配置
+    HOME_SNAPSHOT_DEBOUNCE: float = 5.0  # 秒，数据变更后等待该时间再重建，期间的变更合并为一次
+    HOME_SNAPSHOT_MAX_AGE: int = 600  # 秒，快照最长保留时间（兜底其他进程的写入和随时间变化的统计）
+    
+    # 任务队列配置
+    TASK_WORKER_CONCURRENCY: int = int(os.getenv("TASK_WORKER_CONCURRENCY", "4"))
+    TASK_VISIBILITY_TIMEOUT: int = 300  # 秒，worker需在此时间内续期
+    TASK_POLL_INTERVAL: float = 1.0
+    
     # 爬虫配置
     USER_AGENT: str = "SemiX-Bot/1.0"
     
+    # 爬取队列、HTTP缓存、邮箱域名缓存等本地SQLite文件所在目录（默认 backend 目录，不随启动时的工作目录变化）
+    LOCAL_DATA_DIR: str = os.getenv(
+        "LOCAL_DATA_DIR", os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    )
+    
     # 日志配置
     LOG_LEVEL: str = "INFO"
     
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
@@ -44,4 +44,24 @@ def create_tables():
     from app.models.compliance_tool import ComplianceTool, ToolUsageLog, ToolReview, ComplianceRegulation
     from app.models.marketplace import MarketplaceListing, MarketplaceInquiry, MarketplaceFavorite, MarketplaceCategory, MarketplaceReport
     from app.models.community import CommunityPost, CommunityComment, CommunityLike, CommunityCommentLike, CommunityFavorite, CommunityCategory, CommunityReport, CommunityExpert
+    from app.models.collection_job import CollectionJob, CollectionJobSource, CollectionSourceState
+    from app.models.task_queue import QueuedTask, DeadLetterTask
+    from app.models.tag import Tag, EntityTag, TagCount
+    from app.models.data_version import DataVersion
     Base.metadata.create_all(bind=engine)
+    add_missing_columns()
+
+# 为已存在的表补齐新增的可空列（create_all不会修改已有表）
+def add_missing_columns():
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
@@ -0,0 +1,116 @@
+"""
+公开读接口的HTTP条件请求与缓存头
+ETag 由请求路径、查询参数和相关业务域的数据版本号（见 app/services/data_version_service.py）计算，
+客户端带 If-None-Match 且版本未变时直接返回304，不执行接口的查询和序列化。
+
+用法（放在 @router.get 之下）:
+    @router.get("/featured", response_model=List[Supplier])
+    @conditional_get("supplier", max_age=60)
+    async def get_featured_suppliers(limit: int = Query(10), db: Session = Depends(get_db)):
+        ...
+
+- 被装饰的接口须有 db 依赖；request/response 参数不存在时自动注入
+- 结果依赖当前时间的接口（近N天统计、趋势）或按浏览次数排序/汇总的接口传 time_window，
+  ETag 每个时间窗口变化一次；列表接口的 sort_by 为不改变版本号的字段（浏览次数等）时，
+  未传 time_window 也按 UNVERSIONED_SORT_WINDOW 的时间窗口计算ETag
+- ETag 为弱校验器：浏览次数变化不改变版本号
+- 详情页有浏览计数时用 max_age=0，使代理每次回源校验，304时通过 on_not_modified 计数
+"""
+from typing import Callable, Optional
+import functools
+import hashlib
+import inspect
+import time
+
+from fastapi import Request, Response
+
+from app.services.data_version_service import IGNORED_ATTRIBUTES, DataVersionService
+
+# 响应结构变化时递增，使客户端已缓存的ETag全部失效
+ETAG_FORMAT_VERSION = 1
+
+# 按不改变版本号的字段排序时ETag的时间窗口（秒）
+UNVERSIONED_SORT_WINDOW = 300
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """按弱比较判断 If-None-Match 是否命中"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def build_etag(request: Request, versions: dict, time_window: Optional[int] = None) -> str:
+    parts = [
+        str(ETAG_FORMAT_VERSION),
+        request.url.path,
+        "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items())),
+        ",".join(f"{domain}:{version}" for domain, version in sorted(versions.items())),
+    ]
+    if time_window:
+        parts.append(str(int(time.time()) // time_window))
+    digest = hashlib.blake2b("|".join(parts).encode("utf-8"), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def conditional_get(
+    *domains: str,
+    max_age: int = 60,
+    time_window: Optional[int] = None,
+    on_not_modified: Optional[Callable] = None,
+):
+    """
+    为公开读接口添加 ETag / If-None-Match / Cache-Control 处理
+    domains: 接口结果依赖的业务域；max_age: Cache-Control 的 max-age 秒数；
+    on_not_modified: 返回304时仍需执行的操作（如详情页浏览计数），以接口的参数调用
+    """
+    cache_control = f"public, max-age={max_age}"
+
+    def decorator(endpoint: Callable) -> Callable:
+        signature = inspect.signature(endpoint)
+        parameters = list(signature.parameters.values())
+        injected = []
+        for name, annotation in (("request", Request), ("response", Response)):
+            if name not in signature.parameters:
+                injected.append(name)
+                parameters.append(inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY, annotation=annotation))
+
+        @functools.wraps(endpoint)
+        async def wrapper(**kwargs):
+            request: Request = kwargs["request"]
+            response: Response = kwargs["response"]
+            endpoint_kwargs = {key: value for key, value in kwargs.items() if key not in injected}
+
+            versions = DataVersionService.get_versions(kwargs["db"], domains)
+            window = time_window
+            if window is None and request.query_params.get("sort_by") in IGNORED_ATTRIBUTES:
+                window = UNVERSIONED_SORT_WINDOW
+            etag = build_etag(request, versions, window)
+            headers = {"ETag": etag, "Cache-Control": cache_control}
+
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                if on_not_modified is not None:
+                    on_not_modified(**endpoint_kwargs)
+                return Response(status_code=304, headers=headers)
+
+            result = endpoint(**endpoint_kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            # 快速路径直接返回响应对象，其余情况由FastAPI按 response_model 序列化后合并 response 的头
+            target = result if isinstance(result, Response) else response
+            target.headers.update(headers)
+            return result
+
+        wrapper.__signature__ = signature.replace(parameters=parameters)
+        return wrapper
+
+    return decorator
@@ -0,0 +1,63 @@
+"""
+API响应序列化
+- ORJSONResponse: 应用默认响应类，用orjson代替标准库json编码
+- RowSerializer: 列表接口的快速路径，按响应模型的字段只查询对应列，
+  把行元组直接组装成字典后交给orjson，跳过逐行的pydantic校验和jsonable_encoder
+"""
+from typing import Any, Dict, List, Type
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy.orm import Query
+
+# UTC时间输出为 "Z" 结尾，与pydantic的JSON序列化结果一致
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z | orjson.OPT_SERIALIZE_NUMPY
+
+
+class ORJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+class RowSerializer:
+    """
+    按响应模型构建的行序列化器（在模块加载时创建一次）
+    响应模型的字段须是ORM模型的列，或带默认值的字段（如不落库的展示字段，输出默认值）；
+    枚举、datetime 由orjson原生编码，输出与经过响应模型序列化的结果一致
+
+    用法:
+        supplier_rows = RowSerializer(SupplierModel, SupplierSchema)
+        return supplier_rows.response(SupplierService.build_suppliers_query(db, query))
+    """
+
+    def __init__(self, model, schema: Type[BaseModel]):
+        table_columns = model.__table__.columns
+        self.fields: List[str] = []
+        self.columns = []
+        self.defaults: Dict[str, Any] = {}
+        for name, field in schema.model_fields.items():
+            if name in table_columns:
+                self.fields.append(name)
+                self.columns.append(getattr(model, name))
+            elif not field.is_required():
+                self.defaults[name] = field.get_default(call_default_factory=True)
+            else:
+                raise ValueError(f"{schema.__name__}.{name} 不是 {model.__name__} 的列，无法使用行序列化")
+
+    def to_dicts(self, rows) -> List[Dict[str, Any]]:
+        fields = self.fields
+        items = [dict(zip(fields, row)) for row in rows]
+        if self.defaults:
+            for item in items:
+                item.update(self.defaults)
+        return items
+
+    def rows(self, db_query: Query) -> List[Dict[str, Any]]:
+        """只查询响应字段对应的列（保留原查询的过滤、排序和分页）"""
+        return self.to_dicts(db_query.with_entities(*self.columns).all())
+
+    def response(self, db_query: Query) -> ORJSONResponse:
+        return ORJSONResponse(self.rows(db_query))
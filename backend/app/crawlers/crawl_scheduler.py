@@ -0,0 +1,196 @@
+"""
+爬虫调度器
+不同主机的请求并发执行，同一主机内按最小间隔排队并限制并发数；
+对超时、连接错误和 429/5xx 响应按指数退避重试（优先遵守 Retry-After）；
+配置robots缓存时，抓取前检查 Allow/Disallow，并以 Crawl-delay 作为该主机的请求间隔
+"""
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+from urllib.parse import urlparse
+import logging
+
+import aiohttp
+from multidict import CIMultiDict
+
+from app.crawlers.robots import RobotsCache
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class FetchResult:
+    """一次抓取的结果"""
+
+    __slots__ = ('url', 'status', 'headers', 'body', 'encoding')
+
+    def __init__(self, url: str, status: int, headers: Mapping[str, str], body: bytes, encoding: Optional[str]):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.encoding = encoding
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    def text(self) -> str:
+        return self.body.decode(self.encoding or 'utf-8', errors='replace')
+
+
+class HostState:
+    """单个主机的并发与节流状态"""
+
+    def __init__(self, max_concurrency: int, delay: Optional[float] = None):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.lock = asyncio.Lock()
+        self.delay = delay  # 固定间隔（秒），为None时使用调度器的随机间隔
+        self.next_allowed = 0.0
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.blocked = 0
+
+
+class CrawlScheduler:
+    """
+    按主机调度的抓取器
+    用法:
+        scheduler = CrawlScheduler(session)
+        result = await scheduler.fetch(url)                    # 单个URL，自动节流与重试
+        items = await scheduler.crawl(urls, handler)           # 多个URL并发，按输入顺序合并结果
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        delay_range: Tuple[float, float] = (1, 3),
+        max_per_host: int = 2,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        robots: Optional[RobotsCache] = None
+    ):
+        self.session = session
+        self.robots = robots
+        self.delay_range = delay_range
+        self.max_per_host = max_per_host
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hosts: Dict[str, HostState] = {}
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    def _host_state(self, host: str) -> HostState:
+        state = self.hosts.get(host)
+        if state is None:
+            state = HostState(self.max_per_host)
+            self.hosts[host] = state
+        return state
+
+    def set_host_delay(self, host: str, delay: Optional[float]):
+        """为主机设置固定请求间隔（如robots.txt的Crawl-delay），None恢复随机间隔"""
+        self._host_state(host.lower()).delay = delay
+
+    def _next_delay(self, state: HostState) -> float:
+        if state.delay is not None:
+            return state.delay
+        return random.uniform(*self.delay_range)
+
+    async def _wait_turn(self, state: HostState):
+        """同一主机相邻两次请求之间至少间隔一个delay"""
+        async with state.lock:
+            wait = state.next_allowed - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            state.next_allowed = time.monotonic() + self._next_delay(state)
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        delay = self.backoff_base * (2 ** attempt)
+        return min(delay + random.uniform(0, delay / 2), self.backoff_max)
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[FetchResult]:
+        """抓取单个URL；robots禁止或重试耗尽时返回None（4xx等不可重试的响应原样返回）"""
+        state = self._host_state(self.host_of(url))
+
+        if self.robots:
+            rules = await self.robots.rules_for(url)
+            if not rules.can_fetch(url):
+                state.blocked += 1
+                logger.info(f"robots.txt 禁止抓取: {url}")
+                return None
+            if rules.crawl_delay is not None:
+                state.delay = rules.crawl_delay
+
+        async with state.semaphore:
+            for attempt in range(self.max_retries + 1):
+                await self._wait_turn(state)
+                state.requests += 1
+                retry_after = None
+                try:
+                    async with self.session.get(url, headers=headers) as response:
+                        body = await response.read()
+                        result = FetchResult(
+                            url=str(response.url),
+                            status=response.status,
+                            headers=CIMultiDict(response.headers),
+                            body=body,
+                            encoding=response.get_encoding() if body else None
+                        )
+                    if result.status not in RETRY_STATUSES:
+                        return result
+                    retry_after = result.headers.get('Retry-After')
+                    error = f"HTTP {result.status}"
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    error = f"{type(e).__name__}: {e}"
+
+                if attempt == self.max_retries:
+                    break
+                state.retries += 1
+                delay = self._backoff(attempt, retry_after)
+                logger.warning(f"抓取 {url} 失败（{error}），{delay:.1f}秒后第{attempt + 1}次重试")
+                await asyncio.sleep(delay)
+
+        state.failures += 1
+        logger.error(f"抓取 {url} 失败，已重试{self.max_retries}次: {error}")
+        return None
+
+    async def crawl(
+        self,
+        urls: Iterable[str],
+        handler: Callable[[str], Awaitable[List[Dict]]]
+    ) -> List[Dict]:
+        """并发执行 handler(url)（handler内部通过 fetch() 抓取），按输入顺序合并结果"""
+        urls = list(urls)
+        results = await asyncio.gather(*(handler(url) for url in urls), return_exceptions=True)
+
+        items: List[Dict] = []
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                logger.error(f"爬取 {url} 失败: {result}")
+                continue
+            items.extend(result)
+        return items
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """各主机的请求、重试、失败和被robots禁止的次数"""
+        return {
+            host: {
+                "requests": state.requests,
+                "retries": state.retries,
+                "failures": state.failures,
+                "blocked": state.blocked
+            }
+            for host, state in self.hosts.items()
+        }
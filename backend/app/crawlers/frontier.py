@@ -0,0 +1,213 @@
+"""
+持久化爬取队列（Crawl Frontier）
+基于SQLite记录每个URL的状态、优先级、发现/抓取时间和内容哈希，
+支持链接发现去重、进程崩溃后续爬，以及按页面变化频率自适应安排重新抓取：
+页面变化则缩短重抓间隔，未变化则加倍，限制在 [min_interval, max_interval] 内
+"""
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urldefrag, urlparse, urlunparse
+import logging
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FRONTIER_PATH = os.path.join(settings.LOCAL_DATA_DIR, "crawl_frontier.db")
+DEFAULT_RECRAWL_INTERVAL = 24 * 3600
+MIN_RECRAWL_INTERVAL = 3600
+MAX_RECRAWL_INTERVAL = 30 * 24 * 3600
+
+# URL状态
+STATE_PENDING = "pending"
+STATE_IN_PROGRESS = "in_progress"
+STATE_DONE = "done"
+STATE_FAILED = "failed"
+
+
+def normalize_url(url: str) -> str:
+    """去除锚点，协议和主机名转小写"""
+    url, _ = urldefrag(url.strip())
+    parsed = urlparse(url)
+    return urlunparse(parsed._replace(scheme=parsed.scheme.lower(), netloc=parsed.netloc.lower()))
+
+
+class FrontierEntry:
+    """待抓取的URL"""
+
+    __slots__ = ('url', 'page_type', 'priority', 'depth', 'attempts', 'fetch_count')
+
+    def __init__(self, url: str, page_type: str, priority: int, depth: int, attempts: int, fetch_count: int):
+        self.url = url
+        self.page_type = page_type
+        self.priority = priority
+        self.depth = depth
+        self.attempts = attempts
+        self.fetch_count = fetch_count
+
+
+class CrawlFrontier:
+    """
+    爬取队列
+    add()/add_many() 发现URL（已存在的自动忽略）；claim() 领取到期的URL；
+    complete()/fail() 回写抓取结果；requeue_in_progress() 用于重启后恢复中断的URL
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_FRONTIER_PATH,
+        max_attempts: int = 3,
+        retry_delay: int = 600,
+        min_interval: int = MIN_RECRAWL_INTERVAL,
+        max_interval: int = MAX_RECRAWL_INTERVAL
+    ):
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS frontier ("
+            "url TEXT PRIMARY KEY, host TEXT NOT NULL, page_type TEXT NOT NULL, "
+            "state TEXT NOT NULL DEFAULT 'pending', priority INTEGER NOT NULL DEFAULT 0, "
+            "depth INTEGER NOT NULL DEFAULT 0, discovered_at REAL NOT NULL, fetched_at REAL, "
+            "next_fetch_at REAL NOT NULL, recrawl_interval REAL NOT NULL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, fetch_count INTEGER NOT NULL DEFAULT 0, "
+            "change_count INTEGER NOT NULL DEFAULT 0, content_hash TEXT, items TEXT, last_error TEXT)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_frontier_due ON frontier (state, next_fetch_at, priority)"
+        )
+        self._conn.commit()
+
+    def close(self):
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+    def add(self, url: str, page_type: str, priority: int = 0, depth: int = 0) -> bool:
+        """加入新URL，已见过的URL返回False"""
+        return self.add_many([url], page_type, priority, depth) == 1
+
+    def add_many(self, urls: Iterable[str], page_type: str, priority: int = 0, depth: int = 0) -> int:
+        now = time.time()
+        rows = []
+        for url in urls:
+            url = normalize_url(url)
+            rows.append((url, urlparse(url).netloc, page_type, priority, depth, now, now, DEFAULT_RECRAWL_INTERVAL))
+        if not rows:
+            return 0
+        before = self._conn.total_changes
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO frontier "
+            "(url, host, page_type, priority, depth, discovered_at, next_fetch_at, recrawl_interval) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        self._conn.commit()
+        return self._conn.total_changes - before
+
+    def claim(self, limit: int) -> List[FrontierEntry]:
+        """领取到期的URL（待抓取，或已抓取且到了重抓时间），按优先级从高到低"""
+        now = time.time()
+        rows = self._conn.execute(
+            "SELECT url, page_type, priority, depth, attempts, fetch_count FROM frontier "
+            "WHERE state IN (?, ?) AND next_fetch_at <= ? "
+            "ORDER BY priority DESC, next_fetch_at, discovered_at LIMIT ?",
+            (STATE_PENDING, STATE_DONE, now, limit)
+        ).fetchall()
+        if rows:
+            self._conn.executemany(
+                "UPDATE frontier SET state = ? WHERE url = ?",
+                [(STATE_IN_PROGRESS, row[0]) for row in rows]
+            )
+            self._conn.commit()
+        return [FrontierEntry(*row) for row in rows]
+
+    def complete(self, url: str, content_hash: Optional[str], items: Optional[List[Dict]] = None) -> bool:
+        """
+        记录抓取成功；content_hash 为None表示服务器返回304（未变化）
+        返回页面内容是否发生变化
+        """
+        row = self._conn.execute(
+            "SELECT content_hash, recrawl_interval, fetch_count FROM frontier WHERE url = ?", (url,)
+        ).fetchone()
+        if not row:
+            return False
+        old_hash, interval, fetch_count = row
+
+        changed = content_hash is not None and content_hash != old_hash
+        if fetch_count:
+            interval = interval / 2 if changed else interval * 2
+        interval = min(max(interval, self.min_interval), self.max_interval)
+
+        now = time.time()
+        self._conn.execute(
+            "UPDATE frontier SET state = ?, fetched_at = ?, next_fetch_at = ?, recrawl_interval = ?, "
+            "attempts = 0, fetch_count = fetch_count + 1, change_count = change_count + ?, "
+            "content_hash = COALESCE(?, content_hash), items = COALESCE(?, items), last_error = NULL "
+            "WHERE url = ?",
+            (STATE_DONE, now, now + interval, interval, int(changed and fetch_count > 0), content_hash,
+             json.dumps(items, ensure_ascii=False) if items is not None else None, url)
+        )
+        self._conn.commit()
+        return changed
+
+    def fail(self, url: str, error: str):
+        """
+        记录抓取失败，未达最大次数时延后重试，否则标记为失败；
+        已成功抓取过的页面重抓失败时保持已抓取状态和上次提取的数据，
+        达到最大次数后等到下一个重抓周期再试
+        """
+        row = self._conn.execute(
+            "SELECT attempts, fetch_count, recrawl_interval FROM frontier WHERE url = ?", (url,)
+        ).fetchone()
+        if not row:
+            return
+        attempts, fetch_count, interval = row[0] + 1, row[1], row[2]
+        delay = self.retry_delay * attempts
+        if fetch_count:
+            state = STATE_DONE
+            if attempts >= self.max_attempts:
+                delay = interval
+        else:
+            state = STATE_FAILED if attempts >= self.max_attempts else STATE_PENDING
+        self._conn.execute(
+            "UPDATE frontier SET state = ?, attempts = ?, last_error = ?, next_fetch_at = ? WHERE url = ?",
+            (state, attempts, error, time.time() + delay, url)
+        )
+        self._conn.commit()
+
+    def requeue_in_progress(self) -> int:
+        """把上次运行中断时处于抓取中的URL放回队列"""
+        cursor = self._conn.execute(
+            "UPDATE frontier SET state = ? WHERE state = ?", (STATE_PENDING, STATE_IN_PROGRESS)
+        )
+        self._conn.commit()
+        if cursor.rowcount:
+            logger.info(f"恢复 {cursor.rowcount} 个中断的URL")
+        return cursor.rowcount
+
+    def iter_items(self) -> Iterator[Dict]:
+        """所有抓取成功过的页面最近一次提取到的数据（重抓中或重抓失败的页面返回上次的数据）"""
+        for (items,) in self._conn.execute(
+            "SELECT items FROM frontier WHERE items IS NOT NULL ORDER BY discovered_at"
+        ):
+            yield from json.loads(items)
+
+    def stats(self) -> Dict[str, int]:
+        counts = dict(self._conn.execute("SELECT state, COUNT(*) FROM frontier GROUP BY state").fetchall())
+        due = self._conn.execute(
+            "SELECT COUNT(*) FROM frontier WHERE state IN (?, ?) AND next_fetch_at <= ?",
+            (STATE_PENDING, STATE_DONE, time.time())
+        ).fetchone()[0]
+        return {
+            STATE_PENDING: counts.get(STATE_PENDING, 0),
+            STATE_IN_PROGRESS: counts.get(STATE_IN_PROGRESS, 0),
+            STATE_DONE: counts.get(STATE_DONE, 0),
+            STATE_FAILED: counts.get(STATE_FAILED, 0),
+            "due": due
+        }
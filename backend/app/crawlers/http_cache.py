@@ -0,0 +1,146 @@
+"""
+爬虫HTTP条件请求缓存
+按URL持久化响应体（zlib压缩）、ETag、Last-Modified、内容哈希以及上次的解析结果；
+重复抓取时带 If-None-Match / If-Modified-Since，304 或内容哈希不变时直接复用解析结果。
+缓存总大小超过上限时按最近访问时间淘汰
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from typing import Dict, List, Mapping, Optional
+import logging
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HTTP_CACHE_PATH = os.path.join(settings.LOCAL_DATA_DIR, "crawler_http_cache.db")
+DEFAULT_HTTP_CACHE_MAX_BYTES = 200 * 1024 * 1024  # 200MB
+
+
+class CacheEntry:
+    """缓存条目"""
+
+    __slots__ = ('url', 'etag', 'last_modified', 'content_hash', 'items')
+
+    def __init__(self, url: str, etag: Optional[str], last_modified: Optional[str],
+                 content_hash: str, items: Optional[List[Dict]]):
+        self.url = url
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content_hash = content_hash
+        self.items = items
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+def content_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+class HttpCache:
+    """
+    磁盘HTTP缓存
+    get() 取条目生成条件请求头；store() 写入新响应；touch() 在304时刷新访问时间
+    """
+
+    def __init__(self, path: str = DEFAULT_HTTP_CACHE_PATH, max_bytes: int = DEFAULT_HTTP_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.not_modified = 0   # 304次数
+        self.unchanged = 0      # 200但内容哈希未变的次数
+        self.updated = 0        # 新增或内容变化的次数
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS http_cache ("
+            "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, content_hash TEXT NOT NULL, "
+            "body BLOB, items TEXT, size INTEGER NOT NULL, stored_at REAL NOT NULL, "
+            "accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_http_cache_accessed_at ON http_cache (accessed_at)")
+        self._conn.commit()
+
+    def close(self):
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        row = self._conn.execute(
+            "SELECT etag, last_modified, content_hash, items FROM http_cache WHERE url = ?", (url,)
+        ).fetchone()
+        if not row:
+            return None
+        items = json.loads(row[3]) if row[3] is not None else None
+        return CacheEntry(url, row[0], row[1], row[2], items)
+
+    def get_body(self, url: str) -> Optional[bytes]:
+        row = self._conn.execute("SELECT body FROM http_cache WHERE url = ?", (url,)).fetchone()
+        return zlib.decompress(row[0]) if row and row[0] is not None else None
+
+    def touch(self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """304时刷新访问时间，并更新服务器返回的新校验值"""
+        self.not_modified += 1
+        self._conn.execute(
+            "UPDATE http_cache SET accessed_at = ?, etag = COALESCE(?, etag), "
+            "last_modified = COALESCE(?, last_modified) WHERE url = ?",
+            (time.time(), etag, last_modified, url)
+        )
+        self._conn.commit()
+
+    def store(self, url: str, headers: Mapping[str, str], body: bytes,
+              items: Optional[List[Dict]], unchanged: bool = False):
+        """写入（或覆盖）缓存条目，写入后按总大小淘汰"""
+        if unchanged:
+            self.unchanged += 1
+        else:
+            self.updated += 1
+
+        compressed = zlib.compress(body)
+        items_json = json.dumps(items, ensure_ascii=False) if items is not None else None
+        size = len(compressed) + len(items_json or '')
+        now = time.time()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO http_cache "
+            "(url, etag, last_modified, content_hash, body, items, size, stored_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (url, headers.get('ETag'), headers.get('Last-Modified'), content_hash(body),
+             compressed, items_json, size, now, now)
+        )
+        self._conn.commit()
+        self._evict()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        removed = 0
+        for url, size in self._conn.execute(
+            "SELECT url, size FROM http_cache ORDER BY accessed_at"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM http_cache WHERE url = ?", (url,))
+            total -= size
+            removed += 1
+        self._conn.commit()
+        logger.info(f"HTTP缓存超出上限，淘汰 {removed} 个条目")
+
+    def stats(self) -> Dict[str, int]:
+        count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM http_cache").fetchone()
+        return {
+            "entries": count,
+            "bytes": total,
+            "not_modified": self.not_modified,
+            "unchanged": self.unchanged,
+            "updated": self.updated
+        }
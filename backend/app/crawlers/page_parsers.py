@@ -0,0 +1,194 @@
+"""
+页面解析
+列表页提取与链接发现均为模块级纯函数，可在子进程中执行；
+ParsePool 把解析放到进程池，避免大页面的HTML解析阻塞事件循环，
+并限制等待解析的页面数量，解析跟不上时反压抓取
+"""
+import asyncio
+import importlib.util
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urldefrag, urljoin, urlparse
+import logging
+
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+# 安装了lxml时使用C实现的解析器，否则退回标准库解析器
+DEFAULT_PARSER_BACKEND = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
+
+def _parse_member_element(element) -> Optional[Dict]:
+    """解析会员元素"""
+    try:
+        # 这里需要根据实际HTML结构调整
+        company_name = element.find('h3', class_='company-name')
+        contact_info = element.find('div', class_='contact-info')
+        country = element.find('span', class_='country')
+
+        if company_name:
+            supplier = {
+                'company_name': company_name.get_text().strip(),
+                'source': 'semi_association',
+                'data_source_url': element.get('data-url', ''),
+                'country': country.get_text().strip() if country else '',
+                'collected_at': time.time()
+            }
+
+            # 解析联系信息
+            if contact_info:
+                email_elem = contact_info.find('a', href=lambda x: x and 'mailto:' in x)
+                if email_elem:
+                    supplier['email'] = email_elem.get('href').replace('mailto:', '')
+
+                website_elem = contact_info.find('a', class_='website')
+                if website_elem:
+                    supplier['website'] = website_elem.get('href')
+
+            return supplier
+
+    except Exception as e:
+        logger.error(f"解析会员元素失败: {e}")
+
+    return None
+
+
+def _parse_exhibitor_element(element) -> Optional[Dict]:
+    """解析参展商元素"""
+    try:
+        # 根据实际HTML结构调整
+        company_name = element.find('h4', class_='exhibitor-name')
+        booth_info = element.find('span', class_='booth-number')
+        country = element.find('span', class_='country')
+
+        if company_name:
+            return {
+                'company_name': company_name.get_text().strip(),
+                'source': 'exhibition',
+                'booth_number': booth_info.get_text().strip() if booth_info else '',
+                'country': country.get_text().strip() if country else '',
+                'collected_at': time.time()
+            }
+
+    except Exception as e:
+        logger.error(f"解析参展商元素失败: {e}")
+
+    return None
+
+
+def _extract_semi_members(soup) -> List[Dict]:
+    """提取SEMI协会会员列表页"""
+    # 这里需要根据实际网站结构解析
+    # 以下是示例解析逻辑
+    suppliers = []
+    for element in soup.find_all('div', class_='member-item'):
+        supplier = _parse_member_element(element)
+        if supplier:
+            suppliers.append(supplier)
+    return suppliers
+
+
+def _extract_exhibitors(soup) -> List[Dict]:
+    """提取展会参展商列表页"""
+    suppliers = []
+    for element in soup.find_all('div', class_='exhibitor-item'):
+        supplier = _parse_exhibitor_element(element)
+        if supplier:
+            suppliers.append(supplier)
+    return suppliers
+
+
+# 页面类型 -> 提取函数
+PAGE_EXTRACTORS: Dict[str, Callable] = {
+    'semi_members': _extract_semi_members,
+    'exhibitors': _extract_exhibitors,
+}
+
+# 需要继续跟进的链接（翻页），根据实际网站结构调整
+FOLLOW_LINK_SELECTOR = 'a[rel~="next"], .pagination a[href], a.next-page'
+
+
+def extract_links(soup, base_url: str) -> List[str]:
+    """提取同一主机下需要跟进的链接（去除锚点、去重）"""
+    base_host = urlparse(base_url).netloc.lower()
+    links = []
+    seen = set()
+    for anchor in soup.select(FOLLOW_LINK_SELECTOR):
+        href = anchor.get('href')
+        if not href:
+            continue
+        link, _ = urldefrag(urljoin(base_url, href))
+        parsed = urlparse(link)
+        if parsed.scheme not in ('http', 'https') or parsed.netloc.lower() != base_host:
+            continue
+        if link != base_url and link not in seen:
+            seen.add(link)
+            links.append(link)
+    return links
+
+
+def parse_page(
+    html: str,
+    backend: str = DEFAULT_PARSER_BACKEND,
+    page_type: str = 'semi_members',
+    base_url: Optional[str] = None
+) -> Tuple[List[Dict], List[str]]:
+    """
+    解析列表页
+    返回: (提取到的供应商列表, 需要跟进的链接列表)；未提供 base_url 时不提取链接
+    """
+    soup = BeautifulSoup(html, backend)
+    items = PAGE_EXTRACTORS[page_type](soup)
+    links = extract_links(soup, base_url) if base_url else []
+    return items, links
+
+
+class ParsePool:
+    """
+    进程池解析阶段
+    parse() 等待期间事件循环继续处理其他抓取；等待解析的页面超过 max_pending 时，
+    新页面的 parse() 会先排队，从而限制内存中积压的HTML。workers=0 时在当前进程内直接解析
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_pending: Optional[int] = None,
+        backend: str = DEFAULT_PARSER_BACKEND
+    ):
+        self.workers = workers
+        self.backend = backend
+        self.max_pending = max_pending or max(workers, 1) * 4
+        self.parsed_pages = 0
+        self.parse_seconds = 0.0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def start(self):
+        if self.workers > 0 and self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        self._slots = asyncio.Semaphore(self.max_pending)
+
+    def close(self):
+        if self._executor:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    async def parse(self, html: str, page_type: str, base_url: Optional[str] = None) -> Tuple[List[Dict], List[str]]:
+        """解析页面，返回 (供应商列表, 跟进链接列表)"""
+        if self._slots is None:
+            self.start()
+
+        task = partial(parse_page, html, self.backend, page_type, base_url)
+        async with self._slots:
+            started = time.perf_counter()
+            if self._executor is None:
+                result = task()
+            else:
+                result = await asyncio.get_running_loop().run_in_executor(self._executor, task)
+            self.parsed_pages += 1
+            self.parse_seconds += time.perf_counter() - started
+            return result
@@ -0,0 +1,190 @@
+"""
+robots.txt 解析与缓存
+每个主机只抓取并解析一次（按TTL过期），支持 User-agent 分组、Allow/Disallow（含 * 和 $ 通配，
+按最长匹配规则判定，长度相同时 Allow 优先）、Crawl-delay 和 Sitemap。
+按 settings.USER_AGENT 的产品标识（如 "SemiX-Bot/1.0" 中的 "semix-bot"）选择分组，
+User-agent 行不区分大小写、按前缀匹配
+"""
+import asyncio
+import re
+import time
+from typing import Dict, List, Optional, Pattern, Tuple
+from urllib.parse import urlparse
+import logging
+
+import aiohttp
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROBOTS_TTL = 24 * 3600
+DEFAULT_ROBOTS_ERROR_TTL = 600  # 抓取失败时短时间内不再重试
+DEFAULT_ROBOTS_USER_AGENT = settings.USER_AGENT
+
+
+def product_token(user_agent: str) -> str:
+    """User-Agent 的产品标识：去掉版本号和注释并转小写，如 "SemiX-Bot/1.0 (+url)" 的产品标识为 semix-bot"""
+    token = user_agent.strip().split(None, 1)[0] if user_agent.strip() else ""
+    return token.split('/', 1)[0].lower()
+
+
+def _agent_match_length(agents: List[str], token: str) -> int:
+    """分组中与产品标识匹配（User-agent 值为其前缀）的最长值长度，不匹配时为0"""
+    return max((len(agent) for agent in agents if agent != '*' and token.startswith(agent)), default=0)
+
+
+def _compile_pattern(pattern: str) -> Pattern:
+    anchored = pattern.endswith('$')
+    if anchored:
+        pattern = pattern[:-1]
+    regex = '.*'.join(re.escape(part) for part in pattern.split('*'))
+    return re.compile(regex + ('$' if anchored else ''))
+
+
+class RobotsRules:
+    """单个主机针对本爬虫生效的robots规则"""
+
+    def __init__(
+        self,
+        rules: Optional[List[Tuple[bool, str]]] = None,
+        crawl_delay: Optional[float] = None,
+        sitemaps: Optional[List[str]] = None,
+        allow_all: bool = False,
+        disallow_all: bool = False
+    ):
+        # (是否Allow, 路径模式)，按模式长度降序、同长度Allow优先排列
+        self.rules = sorted(rules or [], key=lambda rule: (-len(rule[1]), not rule[0]))
+        self._compiled = [(allow, _compile_pattern(pattern)) for allow, pattern in self.rules]
+        self.crawl_delay = crawl_delay
+        self.sitemaps = sitemaps or []
+        self.allow_all = allow_all
+        self.disallow_all = disallow_all
+
+    @classmethod
+    def parse(cls, content: str, user_agent: str = DEFAULT_ROBOTS_USER_AGENT) -> "RobotsRules":
+        """解析robots.txt，选用与user_agent的产品标识匹配最长的分组（无匹配时用 * 分组）"""
+        groups: List[Dict] = []
+        current: Optional[Dict] = None
+        sitemaps: List[str] = []
+
+        for raw_line in content.splitlines():
+            line = raw_line.split('#', 1)[0].strip()
+            if ':' not in line:
+                continue
+            field, value = line.split(':', 1)
+            field, value = field.strip().lower(), value.strip()
+
+            if field == 'user-agent':
+                # 连续的User-agent行属于同一分组
+                if current is None or current['has_rules']:
+                    current = {'agents': [], 'rules': [], 'crawl_delay': None, 'has_rules': False}
+                    groups.append(current)
+                current['agents'].append(value.lower())
+            elif field == 'sitemap':
+                if value:
+                    sitemaps.append(value)
+            elif current is not None and field in ('allow', 'disallow'):
+                current['has_rules'] = True
+                if value:
+                    current['rules'].append((field == 'allow', value))
+            elif current is not None and field == 'crawl-delay':
+                current['has_rules'] = True
+                try:
+                    current['crawl_delay'] = float(value)
+                except ValueError:
+                    pass
+
+        token = product_token(user_agent)
+        lengths = [_agent_match_length(g['agents'], token) for g in groups]
+        best = max(lengths, default=0)
+        matched = [g for g, length in zip(groups, lengths) if best and length == best]
+        if not matched:
+            matched = [g for g in groups if '*' in g['agents']]
+
+        rules: List[Tuple[bool, str]] = []
+        crawl_delay = None
+        for group in matched:
+            rules.extend(group['rules'])
+            if group['crawl_delay'] is not None:
+                crawl_delay = group['crawl_delay']
+        return cls(rules, crawl_delay, sitemaps)
+
+    def can_fetch(self, url: str) -> bool:
+        if self.disallow_all:
+            return False
+        if self.allow_all:
+            return True
+
+        parsed = urlparse(url)
+        path = parsed.path or '/'
+        if parsed.query:
+            path += '?' + parsed.query
+        if path == '/robots.txt':
+            return True
+
+        for allow, pattern in self._compiled:
+            if pattern.match(path):
+                return allow
+        return True
+
+
+class RobotsCache:
+    """
+    按主机缓存robots规则
+    同一主机的并发请求只会触发一次robots.txt抓取
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        user_agent: str = DEFAULT_ROBOTS_USER_AGENT,
+        ttl: int = DEFAULT_ROBOTS_TTL,
+        error_ttl: int = DEFAULT_ROBOTS_ERROR_TTL
+    ):
+        self.session = session
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self._rules: Dict[str, Tuple[RobotsRules, float]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def rules_for(self, url: str) -> RobotsRules:
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc.lower()}"
+
+        cached = self._rules.get(origin)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+
+        lock = self._locks.setdefault(origin, asyncio.Lock())
+        async with lock:
+            cached = self._rules.get(origin)
+            if cached and cached[1] > time.monotonic():
+                return cached[0]
+            rules, ttl = await self._fetch(origin)
+            self._rules[origin] = (rules, time.monotonic() + ttl)
+            return rules
+
+    async def _fetch(self, origin: str) -> Tuple[RobotsRules, int]:
+        """
+        2xx 按内容解析；4xx 视为无限制；5xx 和网络错误视为全部禁止（RFC 9309），
+        错误结果只缓存 error_ttl
+        """
+        robots_url = f"{origin}/robots.txt"
+        try:
+            async with self.session.get(robots_url) as response:
+                if 200 <= response.status < 300:
+                    content = await response.text(errors='replace')
+                    rules = RobotsRules.parse(content, self.user_agent)
+                    logger.info(
+                        f"已加载 {robots_url}: {len(rules.rules)} 条规则, "
+                        f"Crawl-delay={rules.crawl_delay}, Sitemap {len(rules.sitemaps)} 个"
+                    )
+                    return rules, self.ttl
+                if 400 <= response.status < 500:
+                    return RobotsRules(allow_all=True), self.ttl
+                logger.warning(f"获取 {robots_url} 返回 {response.status}，暂时禁止抓取该主机")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"获取 {robots_url} 失败: {e}，暂时禁止抓取该主机")
+        return RobotsRules(disallow_all=True), self.error_ttl
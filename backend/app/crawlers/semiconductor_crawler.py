@@ -6,28 +6,91 @@
 import asyncio
 import aiohttp
 import json
-from bs4 import BeautifulSoup
 from typing import List, Dict, Optional
 import logging
-import time
 import random
-from urllib.parse import urljoin, urlparse
+
+from app.core.config import settings
+from app.crawlers.crawl_scheduler import CrawlScheduler, FetchResult
+from app.crawlers.http_cache import DEFAULT_HTTP_CACHE_PATH, HttpCache, content_hash
+from app.crawlers.frontier import DEFAULT_FRONTIER_PATH, CrawlFrontier, FrontierEntry
+from app.crawlers.page_parsers import ParsePool
+from app.crawlers.robots import RobotsCache
+from app.utils.entity_resolver import deduplicate_records
 
 logger = logging.getLogger(__name__)
 
+# 半导体行业协会网站列表
+ASSOCIATION_URLS = [
+    "https://www.semi.org/en/membership/member-directory",  # SEMI协会
+    "https://www.jedec.org/membership/member-companies",     # JEDEC协会
+    # 注意：这些是示例URL，实际使用时需要检查robots.txt
+]
+
+# 主要半导体展会网站
+EXHIBITION_URLS = [
+    "https://www.semiconchina.org/exhibitors",      # SEMICON China
+    "https://www.semiconjapan.org/exhibitors",      # SEMICON Japan
+    "https://www.semiconkorea.org/exhibitors",      # SEMICON Korea
+    # 注意：这些是示例URL，需要根据实际网站结构调整
+]
+
+# 入口页优先级，发现的链接每深一层优先级减1
+SEED_PRIORITY = 10
+
+
+class PageResult:
+    """
+    页面抓取解析结果
+    content_hash 为None表示未变化（304），error 非空表示失败，response 非空表示尚未解析
+    """
+    
+    __slots__ = ('items', 'links', 'content_hash', 'error', 'response')
+    
+    def __init__(
+        self,
+        items: Optional[List[Dict]] = None,
+        links: Optional[List[str]] = None,
+        content_hash: Optional[str] = None,
+        error: Optional[str] = None,
+        response: Optional[FetchResult] = None
+    ):
+        self.items = items or []
+        self.links = links or []
+        self.content_hash = content_hash
+        self.error = error
+        self.response = response
+
 class SemiconductorCrawler:
     """半导体供应商爬虫"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        max_per_host: int = 2,
+        max_retries: int = 3,
+        cache_path: Optional[str] = DEFAULT_HTTP_CACHE_PATH,
+        respect_robots: bool = True,
+        parse_workers: int = 2
+    ):
         self.session = None
+        self.scheduler: Optional[CrawlScheduler] = None
+        self.respect_robots = respect_robots
+        self.robots: Optional[RobotsCache] = None
+        self.parse_pool = ParsePool(workers=parse_workers)
+        # 条件请求缓存，cache_path 为 None 时不启用
+        self.cache_path = cache_path
+        self.http_cache: Optional[HttpCache] = None
+        self.max_per_host = max_per_host
+        self.max_retries = max_retries
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            # 与 robots.txt 分组匹配使用同一标识
+            'User-Agent': settings.USER_AGENT,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
             'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive',
         }
-        self.delay_range = (1, 3)  # 请求间隔（秒）
+        self.delay_range = (1, 3)  # 同一主机的请求间隔（秒），robots.txt 声明了 Crawl-delay 时以其为准
     
     async def __aenter__(self):
         """异步上下文管理器入口"""
@@ -38,53 +101,96 @@ class SemiconductorCrawler:
             connector=connector,
             timeout=timeout
         )
+        if self.respect_robots:
+            self.robots = RobotsCache(self.session, settings.USER_AGENT)
+        # 不同主机并发抓取，同一主机内节流（并发数不超过连接池的 limit_per_host）
+        self.scheduler = CrawlScheduler(
+            self.session,
+            delay_range=self.delay_range,
+            max_per_host=min(self.max_per_host, connector.limit_per_host),
+            max_retries=self.max_retries,
+            robots=self.robots
+        )
+        if self.cache_path:
+            self.http_cache = HttpCache(self.cache_path)
+        self.parse_pool.start()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """异步上下文管理器出口"""
         if self.session:
             await self.session.close()
+        if self.http_cache:
+            self.http_cache.close()
+        self.parse_pool.close()
     
     async def crawl_industry_associations(self) -> List[Dict]:
         """爬取行业协会会员信息"""
-        suppliers = []
-        
-        # 半导体行业协会网站列表
-        association_urls = [
-            "https://www.semi.org/en/membership/member-directory",  # SEMI协会
-            "https://www.jedec.org/membership/member-companies",     # JEDEC协会
-            # 注意：这些是示例URL，实际使用时需要检查robots.txt
-        ]
-        
-        for url in association_urls:
-            try:
-                await self._random_delay()
-                suppliers.extend(await self._crawl_semi_members(url))
-            except Exception as e:
-                logger.error(f"爬取 {url} 失败: {e}")
-        
-        return suppliers
+        return await self.scheduler.crawl(ASSOCIATION_URLS, self._crawl_semi_members)
     
     async def crawl_exhibition_exhibitors(self) -> List[Dict]:
         """爬取展会参展商信息"""
-        suppliers = []
+        return await self.scheduler.crawl(EXHIBITION_URLS, self._crawl_exhibition_exhibitors)
+    
+    def seed_frontier(self, frontier: CrawlFrontier) -> int:
+        """把协会和展会入口页加入爬取队列（已存在的忽略）"""
+        return (
+            frontier.add_many(ASSOCIATION_URLS, 'semi_members', priority=SEED_PRIORITY)
+            + frontier.add_many(EXHIBITION_URLS, 'exhibitors', priority=SEED_PRIORITY)
+        )
+    
+    async def crawl_frontier(
+        self,
+        frontier: CrawlFrontier,
+        concurrency: int = 10,
+        max_pages: Optional[int] = None,
+        max_depth: int = 5
+    ) -> int:
+        """
+        从持久化队列抓取到期的页面，提取结果写回队列，发现的翻页链接加入队列
+        可随时中断，下次调用从中断处继续；返回本次处理的页面数
+        """
+        frontier.requeue_in_progress()
+        processed = 0
+        active = 0
         
-        # 主要半导体展会网站
-        exhibition_urls = [
-            "https://www.semiconchina.org/exhibitors",      # SEMICON China
-            "https://www.semiconjapan.org/exhibitors",      # SEMICON Japan
-            "https://www.semiconkorea.org/exhibitors",      # SEMICON Korea
-            # 注意：这些是示例URL，需要根据实际网站结构调整
-        ]
+        async def worker():
+            nonlocal processed, active
+            while max_pages is None or processed < max_pages:
+                entries = frontier.claim(1)
+                if not entries:
+                    # 其他页面仍在抓取时可能发现新链接，稍后再看
+                    if active == 0:
+                        return
+                    await asyncio.sleep(0.2)
+                    continue
+                processed += 1
+                active += 1
+                try:
+                    await self._crawl_frontier_entry(frontier, entries[0], max_depth)
+                finally:
+                    active -= 1
         
-        for url in exhibition_urls:
-            try:
-                await self._random_delay()
-                suppliers.extend(await self._crawl_exhibition_exhibitors(url))
-            except Exception as e:
-                logger.error(f"爬取展会 {url} 失败: {e}")
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return processed
+    
+    async def _crawl_frontier_entry(self, frontier: CrawlFrontier, entry: FrontierEntry, max_depth: int):
+        try:
+            # 首次抓取的页面需要完整解析以发现链接，不走条件请求
+            result = await self._fetch_and_parse(
+                entry.url, entry.page_type, discover_links=True, revalidate=entry.fetch_count > 0
+            )
+        except Exception as e:
+            logger.error(f"爬取 {entry.url} 失败: {e}")
+            frontier.fail(entry.url, str(e))
+            return
         
-        return suppliers
+        if result.error:
+            frontier.fail(entry.url, result.error)
+            return
+        frontier.complete(entry.url, result.content_hash, result.items)
+        if result.links and entry.depth < max_depth:
+            frontier.add_many(result.links, entry.page_type, entry.priority - 1, entry.depth + 1)
     
     async def crawl_b2b_platforms(self, keywords: List[str]) -> List[Dict]:
         """爬取B2B平台供应商信息"""
@@ -106,150 +212,129 @@ class SemiconductorCrawler:
     
     async def _crawl_semi_members(self, url: str) -> List[Dict]:
         """爬取SEMI协会会员信息"""
-        suppliers = []
-        
         try:
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    # 这里需要根据实际网站结构解析
-                    # 以下是示例解析逻辑
-                    member_elements = soup.find_all('div', class_='member-item')
-                    
-                    for element in member_elements:
-                        supplier = await self._parse_member_element(element)
-                        if supplier:
-                            suppliers.append(supplier)
-                            
+            return (await self._fetch_and_parse(url, 'semi_members')).items
         except Exception as e:
             logger.error(f"解析SEMI会员页面失败: {e}")
-        
-        return suppliers
+            return []
     
     async def _crawl_exhibition_exhibitors(self, url: str) -> List[Dict]:
         """爬取展会参展商信息"""
-        suppliers = []
-        
         try:
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    # 解析参展商信息
-                    exhibitor_elements = soup.find_all('div', class_='exhibitor-item')
-                    
-                    for element in exhibitor_elements:
-                        supplier = await self._parse_exhibitor_element(element)
-                        if supplier:
-                            suppliers.append(supplier)
-                            
+            return (await self._fetch_and_parse(url, 'exhibitors')).items
         except Exception as e:
             logger.error(f"解析展会参展商页面失败: {e}")
-        
-        return suppliers
+            return []
     
-    async def _parse_member_element(self, element) -> Optional[Dict]:
-        """解析会员元素"""
-        try:
-            # 这里需要根据实际HTML结构调整
-            company_name = element.find('h3', class_='company-name')
-            contact_info = element.find('div', class_='contact-info')
-            
-            if company_name:
-                supplier = {
-                    'company_name': company_name.get_text().strip(),
-                    'source': 'semi_association',
-                    'data_source_url': element.get('data-url', ''),
-                    'collected_at': time.time()
-                }
-                
-                # 解析联系信息
-                if contact_info:
-                    email_elem = contact_info.find('a', href=lambda x: x and 'mailto:' in x)
-                    if email_elem:
-                        supplier['email'] = email_elem.get('href').replace('mailto:', '')
-                    
-                    website_elem = contact_info.find('a', class_='website')
-                    if website_elem:
-                        supplier['website'] = website_elem.get('href')
-                
-                return supplier
-                
-        except Exception as e:
-            logger.error(f"解析会员元素失败: {e}")
+    async def _fetch_and_parse(
+        self,
+        url: str,
+        page_type: str,
+        discover_links: bool = False,
+        revalidate: bool = True
+    ) -> "PageResult":
+        """条件请求抓取页面并解析"""
+        return await self.parse_fetched(
+            url, await self.fetch_page(url, revalidate), page_type, discover_links
+        )
+    
+    async def fetch_page(self, url: str, revalidate: bool = True) -> "PageResult":
+        """
+        条件请求抓取页面
+        304 或内容哈希未变时直接返回缓存中的上次解析结果；否则返回待解析的响应（result.response）
+        """
+        entry = self.http_cache.get(url) if self.http_cache and revalidate else None
+        response = await self.scheduler.fetch(url, headers=entry.conditional_headers() if entry else None)
+        if response is None:
+            return PageResult(error="抓取失败或被robots.txt禁止")
+        
+        if response.status == 304 and entry and entry.items is not None:
+            self.http_cache.touch(url, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            return PageResult(entry.items)
+        if response.status != 200:
+            return PageResult(error=f"HTTP {response.status}")
+        
+        body_hash = content_hash(response.body)
+        if entry and entry.items is not None and entry.content_hash == body_hash:
+            self.http_cache.store(url, response.headers, response.body, entry.items, unchanged=True)
+            return PageResult(entry.items, content_hash=body_hash)
         
-        return None
+        return PageResult(content_hash=body_hash, response=response)
     
-    async def _parse_exhibitor_element(self, element) -> Optional[Dict]:
-        """解析参展商元素"""
-        try:
-            # 根据实际HTML结构调整
-            company_name = element.find('h4', class_='exhibitor-name')
-            booth_info = element.find('span', class_='booth-number')
-            
-            if company_name:
-                supplier = {
-                    'company_name': company_name.get_text().strip(),
-                    'source': 'exhibition',
-                    'booth_number': booth_info.get_text().strip() if booth_info else '',
-                    'collected_at': time.time()
-                }
-                
-                return supplier
-                
-        except Exception as e:
-            logger.error(f"解析参展商元素失败: {e}")
+    async def parse_fetched(
+        self,
+        url: str,
+        result: "PageResult",
+        page_type: str,
+        discover_links: bool = False
+    ) -> "PageResult":
+        """解析 fetch_page() 返回的响应（在进程池中执行，不阻塞其他页面的抓取）"""
+        response = result.response
+        if response is None:
+            return result
         
-        return None
+        items, links = await self.parse_pool.parse(
+            response.text(), page_type, response.url if discover_links else None
+        )
+        if self.http_cache:
+            self.http_cache.store(url, response.headers, response.body, items)
+        return PageResult(items, links, result.content_hash)
     
     async def _random_delay(self):
         """随机延迟，避免过于频繁的请求"""
         delay = random.uniform(*self.delay_range)
         await asyncio.sleep(delay)
     
-    def validate_robots_txt(self, url: str) -> bool:
+    async def validate_robots_txt(self, url: str) -> bool:
         """检查robots.txt是否允许爬取"""
-        try:
-            parsed_url = urlparse(url)
-            robots_url = f"{parsed_url.scheme}://{parsed_url.netloc}/robots.txt"
-            
-            # 这里应该实现robots.txt检查逻辑
-            # 简化示例，实际应该解析robots.txt内容
-            logger.info(f"检查robots.txt: {robots_url}")
+        if not self.robots:
             return True
-            
+        try:
+            rules = await self.robots.rules_for(url)
+            return rules.can_fetch(url)
         except Exception as e:
             logger.error(f"检查robots.txt失败: {e}")
             return False
 
 # 使用示例
-async def run_crawler():
-    """运行爬虫示例"""
+async def run_crawler(frontier_path: Optional[str] = DEFAULT_FRONTIER_PATH):
+    """
+    运行爬虫示例
+    指定 frontier_path 时使用持久化队列：中断后重新运行会从断点继续，已抓取页面按变化频率定期重抓；
+    为 None 时只抓取一次入口页
+    """
     async with SemiconductorCrawler() as crawler:
-        # 爬取行业协会数据
-        association_suppliers = await crawler.crawl_industry_associations()
-        print(f"从行业协会采集到 {len(association_suppliers)} 家供应商")
-        
-        # 爬取展会数据
-        exhibition_suppliers = await crawler.crawl_exhibition_exhibitors()
-        print(f"从展会采集到 {len(exhibition_suppliers)} 家供应商")
-        
-        # 合并数据
-        all_suppliers = association_suppliers + exhibition_suppliers
+        if frontier_path:
+            frontier = CrawlFrontier(frontier_path)
+            try:
+                crawler.seed_frontier(frontier)
+                processed = await crawler.crawl_frontier(frontier)
+                print(f"本次抓取 {processed} 个页面，队列状态: {frontier.stats()}")
+                all_suppliers = list(frontier.iter_items())
+            finally:
+                frontier.close()
+        else:
+            # 爬取行业协会数据
+            association_suppliers = await crawler.crawl_industry_associations()
+            print(f"从行业协会采集到 {len(association_suppliers)} 家供应商")
+            
+            # 爬取展会数据
+            exhibition_suppliers = await crawler.crawl_exhibition_exhibitors()
+            print(f"从展会采集到 {len(exhibition_suppliers)} 家供应商")
+            
+            # 合并数据
+            all_suppliers = association_suppliers + exhibition_suppliers
         
-        # 去重
-        unique_suppliers = {}
-        for supplier in all_suppliers:
-            key = supplier.get('company_name', '').lower()
-            if key and key not in unique_suppliers:
-                unique_suppliers[key] = supplier
+        # 去重（模糊实体解析，合并名称写法不同的同一企业）
+        unique_suppliers = deduplicate_records(
+            [supplier for supplier in all_suppliers if supplier.get('company_name')]
+        )
         
         print(f"去重后共 {len(unique_suppliers)} 家供应商")
+        if crawler.http_cache:
+            print(f"HTTP缓存: {crawler.http_cache.stats()}")
         
-        return list(unique_suppliers.values())
+        return unique_suppliers
 
 if __name__ == "__main__":
     # 运行爬虫
@@ -4,12 +4,15 @@ from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from app.core.config import settings
 from app.api.api_v1.api import api_router
 from app.core.database import create_tables
+from app.core.responses import ORJSONResponse
+from app.core.cache import cache_stats
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description="半导体出海信息服务平台 - 为半导体企业提供出海全链条信息服务",
     version="1.0.0",
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse
 )
 
 # 设置CORS
@@ -50,6 +53,11 @@ async def root():
 async def health_check():
     return {"status": "healthy", "service": "SemiX API"}
 
+@app.get("/health/cache")
+async def cache_health():
+    """读缓存后端及各命名空间的命中率"""
+    return cache_stats()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
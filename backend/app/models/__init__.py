@@ -19,6 +19,10 @@ from .community import (
     CommunityFavorite, CommunityCategory, CommunityReport, CommunityExpert,
     PostType, PostStatus, PostPriority
 )
+from .collection_job import CollectionJob, CollectionJobSource, CollectionSourceState, JobStatus
+from .task_queue import QueuedTask, DeadLetterTask, TaskStatus
+from .tag import Tag, EntityTag, TagCount
+from .data_version import DataVersion
 
 __all__ = [
     "User",
@@ -33,5 +37,9 @@ __all__ = [
     "ListingType", "ListingStatus", "ProductCondition", "PriceType",
     "CommunityPost", "CommunityComment", "CommunityLike", "CommunityCommentLike",
     "CommunityFavorite", "CommunityCategory", "CommunityReport", "CommunityExpert",
-    "PostType", "PostStatus", "PostPriority"
+    "PostType", "PostStatus", "PostPriority",
+    "CollectionJob", "CollectionJobSource", "CollectionSourceState", "JobStatus",
+    "QueuedTask", "DeadLetterTask", "TaskStatus",
+    "Tag", "EntityTag", "TagCount",
+    "DataVersion"
 ]
@@ -0,0 +1,95 @@
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, Enum, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.core.database import Base
+import enum
+
+class JobStatus(enum.Enum):
+    PENDING = "pending"       # 等待执行
+    RUNNING = "running"       # 执行中
+    COMPLETED = "completed"   # 已完成
+    FAILED = "failed"         # 失败
+    CANCELLED = "cancelled"   # 已取消
+
+# 已结束的状态
+FINISHED_JOB_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+class CollectionJob(Base):
+    __tablename__ = "collection_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    status = Column(Enum(JobStatus), default=JobStatus.PENDING, nullable=False, index=True)
+    mode = Column(String(20), nullable=False, default="insert")  # 入库模式
+    cancel_requested = Column(Boolean, default=False)
+    error = Column(Text, nullable=True)
+
+    # 时间信息
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)  # 执行进程定期刷新，用于识别异常退出的任务
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+
+    sources = relationship(
+        "CollectionJobSource", back_populates="job",
+        order_by="CollectionJobSource.id", cascade="all, delete-orphan"
+    )
+
+class CollectionJobSource(Base):
+    """任务中单个数据源的进度"""
+    __tablename__ = "collection_job_sources"
+    __table_args__ = (
+        # active 在执行期间为True、结束后为NULL；NULL不参与唯一约束，
+        # 因此同一数据源同时只能有一个执行中的任务
+        UniqueConstraint("source", "active", name="uq_collection_job_source_active"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("collection_jobs.id"), nullable=False, index=True)
+    source = Column(String(50), nullable=False, index=True)
+    status = Column(Enum(JobStatus), default=JobStatus.PENDING, nullable=False)
+    active = Column(Boolean, nullable=True, default=True)
+
+    # 进度计数
+    total = Column(Integer, nullable=True)  # 预计记录数（未知时为空）
+    fetched = Column(Integer, default=0)
+    cleaned = Column(Integer, default=0)
+    inserted = Column(Integer, default=0)
+    updated = Column(Integer, default=0)
+    skipped = Column(Integer, default=0)  # 未变化、已存在及重复的记录
+    failed = Column(Integer, default=0)
+    throughput = Column(Float, default=0.0)  # 记录/秒
+    eta_seconds = Column(Float, nullable=True)
+    error = Column(Text, nullable=True)
+
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+
+    job = relationship("CollectionJob", back_populates="sources")
+
+class CollectionSourceState(Base):
+    """数据源的定时采集状态与增量游标"""
+    __tablename__ = "collection_source_states"
+
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String(50), nullable=False, unique=True, index=True)
+    enabled = Column(Boolean, default=True)  # 是否参与定时采集
+    update_frequency = Column(String(20), nullable=False)  # real_time, daily, weekly
+
+    # 增量游标（JSON格式，如 {"updated_since": "..."}），只采集此后变化的记录
+    cursor = Column(Text, nullable=True)
+
+    # 运行状态
+    next_run_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    last_scheduled_at = Column(DateTime(timezone=True), nullable=True)
+    last_run_at = Column(DateTime(timezone=True), nullable=True)
+    last_success_at = Column(DateTime(timezone=True), nullable=True)
+    last_status = Column(Enum(JobStatus), nullable=True)
+    last_error = Column(Text, nullable=True)
+    last_job_id = Column(Integer, nullable=True)
+    consecutive_failures = Column(Integer, default=0)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class DataVersion(Base):
+    """
+    业务域数据版本号
+    域内数据每次提交写入后加一（见 app/services/data_version_service.py），用于生成ETag
+    """
+    __tablename__ = "data_versions"
+
+    id = Column(Integer, primary_key=True)
+    domain = Column(String(50), nullable=False, unique=True, index=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -100,6 +100,9 @@ class Supplier(Base):
     is_featured = Column(Boolean, default=False)  # 是否推荐
     is_verified = Column(Boolean, default=False)  # 是否已验证
     
+    # 采集数据的内容哈希，用于增量更新时判断记录是否变化
+    content_hash = Column(String(64), nullable=True)
+    
     # 系统字段
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
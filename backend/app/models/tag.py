@@ -0,0 +1,54 @@
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, UniqueConstraint, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class Tag(Base):
+    """标签字典：各业务表的标签、产品类别、主营产品统一归一化到此表"""
+    __tablename__ = "tags"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(200), nullable=False)  # 首次出现时的写法，用于展示
+    normalized_name = Column(String(200), nullable=False, unique=True, index=True)  # 归一化后的名称，用于精确匹配
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class EntityTag(Base):
+    """
+    实体与标签的关联
+    entity_type 为业务表类型（supplier、market_intelligence 等），field 为来源字段（tags、product_categories 等）
+    visible 为实体当前是否公开可见（如已发布），只有可见实体的关联计入 tag_counts；
+    草稿等未公开的实体仍保留关联，按状态+标签筛选时照常使用索引
+    """
+    __tablename__ = "entity_tags"
+
+    id = Column(Integer, primary_key=True)
+    entity_type = Column(String(50), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    field = Column(String(50), nullable=False)
+    tag_id = Column(Integer, ForeignKey("tags.id"), nullable=False)
+    visible = Column(Boolean, nullable=False, default=True)
+
+    __table_args__ = (
+        # 按标签筛选实体：(entity_type, field, tag_id) 前缀定位，entity_id 直接从索引读取
+        UniqueConstraint("entity_type", "field", "tag_id", "entity_id", name="uq_entity_tags_tag"),
+        # 写入/删除某个实体的标签时按实体定位
+        Index("ix_entity_tags_entity", "entity_type", "entity_id"),
+    )
+
+class TagCount(Base):
+    """
+    各实体类型、字段下每个标签关联的公开可见实体数（与列表接口默认展示的范围一致）
+    由 TagService 在写入/删除关联时增量维护，可通过 app/scripts/backfill_tags.py --counts-only 重建
+    """
+    __tablename__ = "tag_counts"
+
+    id = Column(Integer, primary_key=True)
+    entity_type = Column(String(50), nullable=False)
+    field = Column(String(50), nullable=False)
+    tag_id = Column(Integer, ForeignKey("tags.id"), nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("entity_type", "field", "tag_id", name="uq_tag_counts_tag"),
+        # 热门标签：按 (entity_type, field) 定位后沿 count 倒序读取前N条
+        Index("ix_tag_counts_rank", "entity_type", "field", "count"),
+    )
@@ -0,0 +1,52 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Enum, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+import enum
+
+class TaskStatus(enum.Enum):
+    QUEUED = "queued"         # 等待执行（含等待重试）
+    RUNNING = "running"       # 已被worker领取
+    SUCCEEDED = "succeeded"   # 执行成功
+
+class QueuedTask(Base):
+    __tablename__ = "task_queue"
+    __table_args__ = (
+        # worker按 队列 + 状态 + 可执行时间 领取任务
+        Index("ix_task_queue_claim", "queue", "status", "run_at", "priority"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), nullable=False, index=True)  # 任务名称
+    queue = Column(String(50), nullable=False, default="default")
+    payload = Column(Text, nullable=False, default="{}")  # JSON格式的任务参数
+    status = Column(Enum(TaskStatus), default=TaskStatus.QUEUED, nullable=False)
+    priority = Column(Integer, default=0)  # 数值越大越先执行
+
+    # 重试信息
+    attempts = Column(Integer, default=0)
+    max_attempts = Column(Integer, default=3)
+    last_error = Column(Text, nullable=True)
+
+    # 领取信息：locked_until 之前其他worker不可见，超时未续期视为worker异常退出
+    run_at = Column(DateTime(timezone=True), nullable=False)
+    locked_by = Column(String(100), nullable=True)
+    locked_until = Column(DateTime(timezone=True), nullable=True, index=True)
+
+    result = Column(Text, nullable=True)  # JSON格式的执行结果
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+class DeadLetterTask(Base):
+    """重试次数用尽的任务"""
+    __tablename__ = "task_dead_letters"
+
+    id = Column(Integer, primary_key=True, index=True)
+    task_id = Column(Integer, nullable=False, index=True)  # 原任务ID
+    name = Column(String(100), nullable=False, index=True)
+    queue = Column(String(50), nullable=False)
+    payload = Column(Text, nullable=False)
+    attempts = Column(Integer, default=0)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=True)  # 原任务创建时间
+    failed_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,68 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, List
+from datetime import datetime
+from app.models.collection_job import JobStatus
+
+# 数据源进度
+class CollectionJobSource(BaseModel):
+    source: str
+    status: JobStatus
+    total: Optional[int] = None
+    fetched: int = 0
+    cleaned: int = 0
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+    failed: int = 0
+    throughput: float = 0.0
+    eta_seconds: Optional[float] = None
+    error: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+# 采集任务
+class CollectionJob(BaseModel):
+    id: int
+    status: JobStatus
+    mode: str
+    cancel_requested: bool = False
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    heartbeat_at: Optional[datetime] = None
+    created_by: Optional[int] = None
+    sources: List[CollectionJobSource] = []
+
+    model_config = ConfigDict(from_attributes=True)
+
+# 采集状态概览
+class CollectionStatus(BaseModel):
+    status: str  # idle, running, completed, failed, cancelled
+    running_jobs: List[CollectionJob] = []
+    last_job: Optional[CollectionJob] = None
+
+# 数据源调度状态
+class CollectionSourceState(BaseModel):
+    source: str
+    enabled: bool
+    update_frequency: str
+    cursor: Optional[str] = None
+    next_run_at: Optional[datetime] = None
+    last_scheduled_at: Optional[datetime] = None
+    last_run_at: Optional[datetime] = None
+    last_success_at: Optional[datetime] = None
+    last_status: Optional[JobStatus] = None
+    last_error: Optional[str] = None
+    last_job_id: Optional[int] = None
+    consecutive_failures: int = 0
+
+    model_config = ConfigDict(from_attributes=True)
+
+# 数据源调度设置更新
+class CollectionSourceStateUpdate(BaseModel):
+    enabled: Optional[bool] = None
+    update_frequency: Optional[str] = Field(None, pattern="^(real_time|daily|weekly)$")
@@ -104,6 +104,7 @@ class CommunityPostQuery(BaseModel):
     priority: Optional[PostPriority] = None
     category_id: Optional[int] = None
     keyword: Optional[str] = None
+    tag: Optional[str] = None
     author_id: Optional[int] = None
     is_featured: Optional[bool] = None
     is_official: Optional[bool] = None
@@ -125,6 +125,7 @@ class ComplianceToolQuery(BaseModel):
     status: Optional[ToolStatus] = None
     access_level: Optional[AccessLevel] = None
     keyword: Optional[str] = None
+    tag: Optional[str] = None
     vendor: Optional[str] = None
     is_featured: Optional[bool] = None
     is_verified: Optional[bool] = None
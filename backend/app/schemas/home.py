@@ -0,0 +1,30 @@
+from pydantic import BaseModel
+from typing import List
+from datetime import datetime
+from app.schemas.supplier import Supplier, SupplierStats
+from app.schemas.policy import Policy, PolicyStats
+from app.schemas.market_intelligence import MarketIntelligence, MarketIntelligenceStats
+from app.schemas.compliance_tool import ComplianceTool, ComplianceToolStats
+from app.schemas.community import CommunityPost, CommunityStats
+from app.schemas.marketplace import MarketplaceListing, MarketplaceStats
+
+# 首页各板块统计
+class HomeStats(BaseModel):
+    suppliers: SupplierStats
+    policies: PolicyStats
+    market: MarketIntelligenceStats
+    compliance: ComplianceToolStats
+    community: CommunityStats
+    marketplace: MarketplaceStats
+
+# 首页聚合数据快照
+class HomeSnapshot(BaseModel):
+    featured_suppliers: List[Supplier]
+    recent_policies: List[Policy]
+    high_impact_policies: List[Policy]
+    trending_intelligence: List[MarketIntelligence]
+    featured_tools: List[ComplianceTool]
+    hot_posts: List[CommunityPost]
+    latest_listings: List[MarketplaceListing]
+    stats: HomeStats
+    generated_at: datetime
@@ -113,6 +113,7 @@ class MarketIntelligenceQuery(BaseModel):
     status: Optional[IntelligenceStatus] = None
     region: Optional[MarketRegion] = None
     keyword: Optional[str] = None
+    tag: Optional[str] = None
     author: Optional[str] = None
     organization: Optional[str] = None
     is_featured: Optional[bool] = None
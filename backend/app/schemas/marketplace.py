@@ -131,6 +131,7 @@ class MarketplaceListingQuery(BaseModel):
     price_type: Optional[PriceType] = None
     country: Optional[str] = None
     keyword: Optional[str] = None
+    tag: Optional[str] = None
     min_price: Optional[float] = Field(None, ge=0)
     max_price: Optional[float] = Field(None, ge=0)
     is_verified: Optional[bool] = None
@@ -128,6 +128,7 @@ class SupplierQuery(BaseModel):
     certification_level: Optional[CertificationLevel] = None
     product_category: Optional[str] = None
     keyword: Optional[str] = None
+    tag: Optional[str] = None
     min_rating: Optional[float] = Field(None, ge=0.0, le=5.0)
     is_verified: Optional[bool] = None
     is_featured: Optional[bool] = None
@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+# 热门标签
+class PopularTag(BaseModel):
+    name: str
+    count: int
@@ -0,0 +1,54 @@
+"""
+标签索引回填脚本
+为已有的供应商、市场情报、社区帖子、商品和合规工具数据建立标签索引（tags / entity_tags 表）；
+可重复执行，只写入与当前字段值不一致的关联，完成后重建热门标签计数（tag_counts 表）
+
+用法:
+    python app/scripts/backfill_tags.py
+    python app/scripts/backfill_tags.py --entity supplier --batch-size 1000
+    python app/scripts/backfill_tags.py --counts-only     # 只按现有关联重建标签计数
+"""
+import sys
+import os
+import argparse
+import time
+
+# 添加项目根目录到Python路径
+backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, backend_dir)
+
+from app.core.database import SessionLocal, create_tables
+from app.services.tag_service import TagService, TAGGED_ENTITIES
+
+
+def main():
+    parser = argparse.ArgumentParser(description="标签索引回填")
+    parser.add_argument("--entity", action="append", choices=list(TAGGED_ENTITIES), help="只回填指定实体类型，可重复")
+    parser.add_argument("--batch-size", type=int, default=500, help="每批处理的记录数")
+    parser.add_argument("--counts-only", action="store_true", help="只重建标签计数")
+    args = parser.parse_args()
+
+    create_tables()
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        if args.counts_only:
+            results = TagService.rebuild_counts(db, args.entity)
+            for entity_type, counters in results.items():
+                print(f"✅ {entity_type}: {counters} 个标签计数")
+            print(f"✅ 标签计数重建完成，耗时 {time.perf_counter() - started:.1f} 秒")
+            return
+        results = TagService.backfill(db, args.entity, batch_size=args.batch_size)
+        for entity_type, processed in results.items():
+            print(f"✅ {entity_type}: 已处理 {processed} 条记录")
+        print(f"✅ 标签索引回填完成，耗时 {time.perf_counter() - started:.1f} 秒")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ 标签索引回填失败: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+数据清洗多进程扩展性基准测试
+生成合成供应商数据，分别用单进程和不同进程数的ParallelCleaner清洗，输出吞吐量和加速比
+
+用法:
+    python app/scripts/benchmark_cleaning.py --records 50000
+    python app/scripts/benchmark_cleaning.py --records 100000 --workers 1,2,4,8
+    python app/scripts/benchmark_cleaning.py --records 50000 --check   # 校验 clean_batch 与逐条清洗结果完全一致
+"""
+import sys
+import os
+import argparse
+import random
+import math
+import time
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+# 添加项目根目录到Python路径
+backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, backend_dir)
+
+from app.utils.data_cleaner import DataCleaner, CLEANED_COLUMNS
+from app.utils.parallel_cleaner import ParallelCleaner
+
+CITIES = ["深圳", "上海", "苏州", "无锡", "北京", "新竹", "东京", "首尔"]
+PRODUCTS = ["集成电路", "传感器", "LED芯片", "晶圆", "功率器件", "PCB", "封装测试", "MCU"]
+COUNTRIES = ["china", "Japan", "korea", "taiwan", "usa", "germany", "中国"]
+TYPES = ["制造商", "分销商", "trader", "service provider", "代理商"]
+
+
+def generate_records(count: int, seed: int = 42) -> List[Dict]:
+    """生成合成供应商原始数据"""
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        city = rng.choice(CITIES)
+        records.append({
+            "company_name": f"  {city}市{rng.choice(['华芯', '中微', '晶辉', '芯源'])}{i}半导体有限公司 ",
+            "company_name_en": f"{city} Semi {i} Co., Ltd.",
+            "contact_person": rng.choice(["张经理", "李工", "Wang Lei"]),
+            "email": f"sales{i % 500}@semi{i % 300}.com",
+            "phone": f"+86-755-{rng.randint(10000000, 99999999)}",
+            "website": f"www.semi{i % 300}.com",
+            "country": rng.choice(COUNTRIES),
+            "supplier_type": rng.choice(TYPES),
+            "employee_count": str(rng.randint(5, 5000)),
+            "annual_revenue": rng.uniform(10, 20000),
+            "established_year": rng.randint(1980, 2023),
+            "main_products": rng.sample(PRODUCTS, 3),
+        })
+    return records
+
+
+def _same_value(expected, actual) -> bool:
+    """逐值严格比较：浮点数须逐位相同（NaN视为相同），其余取值须类型和值都相同"""
+    if isinstance(expected, float) and isinstance(actual, float):
+        return expected == actual or (math.isnan(expected) and math.isnan(actual))
+    return type(expected) is type(actual) and expected == actual
+
+
+def check_batch_parity(records: List[Dict], max_report: int = 10) -> int:
+    """比较 clean_batch 与 clean_supplier_data 的每个字段和警告，返回不一致的记录数"""
+    cleaner = DataCleaner()
+    batch = DataCleaner().clean_batch(pd.DataFrame(records))
+    mismatches = 0
+    for i, record in enumerate(records):
+        expected, expected_warnings = cleaner.clean_supplier_data(record)
+        row = batch.iloc[i]
+        diff = [
+            (field, expected[field], row[field]) for field in CLEANED_COLUMNS
+            if not _same_value(expected[field], row[field])
+        ]
+        if list(row["warnings"]) != expected_warnings:
+            diff.append(("warnings", expected_warnings, list(row["warnings"])))
+        if diff:
+            mismatches += 1
+            if mismatches <= max_report:
+                print(f"❌ 第 {i} 条不一致: {diff}")
+    return mismatches
+
+
+def run_serial(records: List[Dict]) -> Tuple[float, Dict]:
+    cleaner = DataCleaner()
+    started = time.perf_counter()
+    for record in records:
+        cleaner.clean_supplier_data(record)
+    return time.perf_counter() - started, cleaner.phone_cache_stats()
+
+
+def run_parallel(records: List[Dict], workers: int, chunk_size: int) -> float:
+    started = time.perf_counter()
+    with ParallelCleaner(workers=workers, chunk_size=chunk_size) as executor:
+        for _ in executor.clean(records):
+            pass
+    return time.perf_counter() - started
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="数据清洗扩展性基准测试")
+    parser.add_argument("--records", type=int, default=50000, help="记录数")
+    parser.add_argument("--workers", default=None, help="进程数列表，如 1,2,4,8（默认到CPU核数为止按2倍递增）")
+    parser.add_argument("--chunk-size", type=int, default=500, help="每批记录数")
+    parser.add_argument("--check", action="store_true", help="只校验 clean_batch 与逐条清洗的结果是否完全一致")
+    args = parser.parse_args()
+
+    if args.check:
+        records = generate_records(args.records)
+        mismatches = check_batch_parity(records)
+        if mismatches:
+            print(f"❌ {mismatches}/{len(records)} 条记录的批量清洗结果与逐条清洗不一致")
+            sys.exit(1)
+        print(f"✅ {len(records)} 条记录的批量清洗结果与逐条清洗完全一致")
+        return
+
+    if args.workers:
+        worker_counts = [int(w) for w in args.workers.split(",")]
+    else:
+        cpu_count = os.cpu_count() or 1
+        worker_counts = []
+        w = 1
+        while w < cpu_count:
+            worker_counts.append(w)
+            w *= 2
+        worker_counts.append(cpu_count)
+
+    records = generate_records(args.records)
+    print(f"记录数: {len(records)}，CPU核数: {os.cpu_count()}")
+
+    serial, phone_stats = run_serial(records)
+    print(f"电话号码缓存: {phone_stats}")
+    print(f"\n{'模式':<16}{'耗时(s)':>10}{'记录/秒':>12}{'加速比':>10}")
+    print(f"{'单进程':<16}{serial:>10.2f}{len(records) / serial:>12.0f}{1.0:>10.2f}")
+
+    for workers in worker_counts:
+        elapsed = run_parallel(records, workers, args.chunk_size)
+        label = f"{workers} 进程"
+        print(f"{label:<16}{elapsed:>10.2f}{len(records) / elapsed:>12.0f}{serial / elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
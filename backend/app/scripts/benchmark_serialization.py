@@ -0,0 +1,156 @@
+"""
+列表接口响应序列化基准测试
+为各列表接口生成合成数据行，对比三种序列化路径每个请求的耗时：
+- pydantic+json: 原路径，响应模型逐行 from_attributes 校验、转为JSON兼容对象后由标准库json编码
+- pydantic+orjson: 仅把默认响应类换成 ORJSONResponse
+- rows+orjson: RowSerializer 快速路径，行元组直接组装字典后由orjson编码
+同时校验快速路径与原路径输出的JSON内容一致
+
+用法:
+    python app/scripts/benchmark_serialization.py
+    python app/scripts/benchmark_serialization.py --rows 100 --repeat 200
+"""
+import sys
+import os
+import argparse
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional, Tuple
+
+# 添加项目根目录到Python路径
+backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, backend_dir)
+
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy import Boolean, DateTime, Enum, Float, Integer, String
+
+from app.core.responses import ORJSON_OPTIONS, RowSerializer
+from app.models.supplier import Supplier as SupplierModel
+from app.models.market_intelligence import MarketIntelligence as MarketIntelligenceModel
+from app.models.community import CommunityPost as CommunityPostModel
+from app.models.marketplace import MarketplaceListing as MarketplaceListingModel
+from app.models.compliance_tool import ComplianceTool as ComplianceToolModel
+from app.models.policy import Policy as PolicyModel
+from app.schemas.supplier import Supplier
+from app.schemas.market_intelligence import MarketIntelligence
+from app.schemas.community import CommunityPost
+from app.schemas.marketplace import MarketplaceListing
+from app.schemas.compliance_tool import ComplianceTool
+from app.schemas.policy import Policy
+
+ENDPOINTS = [
+    ("GET /suppliers/", SupplierModel, Supplier),
+    ("GET /market/", MarketIntelligenceModel, MarketIntelligence),
+    ("GET /community/", CommunityPostModel, CommunityPost),
+    ("GET /marketplace/", MarketplaceListingModel, MarketplaceListing),
+    ("GET /compliance/", ComplianceToolModel, ComplianceTool),
+    ("GET /policies/", PolicyModel, Policy),
+]
+
+SAMPLE_TEXT = '["集成电路", "功率器件", "MCU"] 半导体出海信息服务平台 sample text'
+
+
+def value_bounds(field) -> Tuple[Optional[float], Optional[float]]:
+    """读取响应模型字段的数值范围约束（ge/gt/le/lt）"""
+    low = high = None
+    for constraint in getattr(field, "metadata", []):
+        low = getattr(constraint, "ge", getattr(constraint, "gt", low))
+        high = getattr(constraint, "le", getattr(constraint, "lt", high))
+    return low, high
+
+
+def synthetic_value(column, index: int, field=None):
+    """按列类型生成合成值，数值落在响应模型字段的约束范围内"""
+    column_type = column.type
+    low, high = value_bounds(field) if field is not None else (None, None)
+    if isinstance(column_type, Enum):
+        members = list(column_type.enum_class)
+        return members[index % len(members)]
+    if isinstance(column_type, Boolean):
+        return index % 2 == 0
+    if isinstance(column_type, Integer):
+        low = int(low) if low is not None else 0
+        high = int(high) if high is not None else low + 1000
+        return low + index % (high - low + 1)
+    if isinstance(column_type, Float):
+        low = low if low is not None else 0.0
+        high = high if high is not None else low + 100.0
+        return round(low + (high - low) * (index % 10) / 10, 1)
+    if isinstance(column_type, DateTime):
+        return datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=index)
+    if isinstance(column_type, String) and column_type.length:
+        return f"{column.name}-{index}"[:column_type.length]
+    return f"{SAMPLE_TEXT} {index}"
+
+
+def build_objects(model, schema, count: int) -> List:
+    objects = []
+    for index in range(count):
+        values = {
+            column.name: synthetic_value(column, index, schema.model_fields.get(column.name))
+            for column in model.__table__.columns
+        }
+        objects.append(model(**values))
+    return objects
+
+
+def per_call_ms(func: Callable, repeat: int) -> float:
+    func()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="列表接口响应序列化基准测试")
+    parser.add_argument("--rows", type=int, default=100, help="每个响应的记录数")
+    parser.add_argument("--repeat", type=int, default=100, help="每种路径重复次数")
+    args = parser.parse_args()
+
+    print(f"每个响应 {args.rows} 条记录，重复 {args.repeat} 次（单位: 毫秒/请求）")
+    print(f"{'接口':<20}{'字段数':>6}{'pydantic+json':>16}{'pydantic+orjson':>18}{'rows+orjson':>14}{'加速比':>9}")
+
+    all_equal = True
+    for name, model, schema in ENDPOINTS:
+        objects = build_objects(model, schema, args.rows)
+        adapter = TypeAdapter(List[schema])
+        serializer = RowSerializer(model, schema)
+        # 快速路径的输入是查询返回的行元组
+        rows = [tuple(getattr(obj, field) for field in serializer.fields) for obj in objects]
+
+        def legacy() -> bytes:
+            content = adapter.dump_python(adapter.validate_python(objects), mode="json")
+            return json.dumps(
+                content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+            ).encode("utf-8")
+
+        def pydantic_orjson() -> bytes:
+            content = adapter.dump_python(adapter.validate_python(objects), mode="json")
+            return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+        def fast() -> bytes:
+            return orjson.dumps(serializer.to_dicts(rows), option=ORJSON_OPTIONS)
+
+        equal = json.loads(legacy()) == json.loads(fast())
+        all_equal = all_equal and equal
+
+        legacy_ms = per_call_ms(legacy, args.repeat)
+        pydantic_orjson_ms = per_call_ms(pydantic_orjson, args.repeat)
+        fast_ms = per_call_ms(fast, args.repeat)
+        print(
+            f"{name:<20}{len(schema.model_fields):>6}{legacy_ms:>16.3f}{pydantic_orjson_ms:>18.3f}"
+            f"{fast_ms:>14.3f}{legacy_ms / fast_ms:>8.1f}x" + ("" if equal else "  ❌ 输出不一致")
+        )
+
+    if all_equal:
+        print("✅ 快速路径输出与响应模型序列化结果一致")
+    else:
+        print("❌ 部分接口快速路径输出与响应模型序列化结果不一致")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+供应商批量去重脚本
+对库中所有有效供应商做模糊实体解析，输出疑似重复的企业簇；
+加 --apply 时保留每簇的主记录，补全其缺失的联系信息，并软删除其余重复记录
+
+用法:
+    python app/scripts/dedupe_suppliers.py
+    python app/scripts/dedupe_suppliers.py --threshold 0.8 --apply
+"""
+import sys
+import os
+import argparse
+from datetime import datetime
+
+# 添加项目根目录到Python路径
+backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, backend_dir)
+
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.supplier import Supplier
+from app.services.tag_service import TagService
+from app.utils.entity_resolver import EntityResolver
+
+# 合并时从重复记录补全到主记录的字段
+MERGE_FIELDS = [
+    "company_name_en", "contact_person", "email", "phone", "website",
+    "province", "city", "address", "company_description"
+]
+
+
+def canonical_sort_key(supplier: Supplier):
+    """已验证、评价多、创建早的记录优先作为主记录"""
+    return (not supplier.is_verified, -(supplier.review_count or 0), supplier.id)
+
+
+def find_duplicate_clusters(db: Session, threshold: float):
+    """返回按主记录排序的重复簇列表"""
+    suppliers = {
+        supplier.id: supplier
+        for supplier in db.query(Supplier).filter(Supplier.is_active == True).yield_per(1000)
+    }
+
+    resolver = EntityResolver(threshold=threshold)
+    clusters = resolver.find_duplicates(
+        (supplier_id, {
+            "company_name": supplier.company_name,
+            "company_name_en": supplier.company_name_en,
+            "country": supplier.country,
+            "website": supplier.website,
+            "email": supplier.email,
+            "phone": supplier.phone,
+        })
+        for supplier_id, supplier in suppliers.items()
+    )
+
+    return [sorted((suppliers[i] for i in members), key=canonical_sort_key) for members in clusters]
+
+
+def merge_cluster(db: Session, cluster):
+    """补全主记录的空字段，软删除其余记录并移除其标签关联"""
+    canonical, duplicates = cluster[0], cluster[1:]
+    now = datetime.utcnow()
+    for duplicate in duplicates:
+        for field in MERGE_FIELDS:
+            if not getattr(canonical, field) and getattr(duplicate, field):
+                setattr(canonical, field, getattr(duplicate, field))
+        duplicate.is_active = False
+        duplicate.updated_at = now
+        TagService.remove_entity(db, "supplier", duplicate.id)
+    canonical.updated_at = now
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="供应商模糊去重")
+    parser.add_argument("--threshold", type=float, default=0.75, help="判定为同一企业的相似度阈值")
+    parser.add_argument("--apply", action="store_true", help="合并并软删除重复记录")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        clusters = find_duplicate_clusters(db, args.threshold)
+        duplicate_count = sum(len(cluster) - 1 for cluster in clusters)
+        print(f"发现 {len(clusters)} 组疑似重复企业，共 {duplicate_count} 条重复记录")
+
+        for cluster in clusters:
+            canonical = cluster[0]
+            print(f"\n保留 #{canonical.id} {canonical.company_name} ({canonical.country})")
+            for duplicate in cluster[1:]:
+                print(f"  重复 #{duplicate.id} {duplicate.company_name} ({duplicate.country})")
+
+        if args.apply and clusters:
+            for cluster in clusters:
+                merge_cluster(db, cluster)
+            db.commit()
+            print(f"\n✅ 已合并 {duplicate_count} 条重复记录")
+
+    except Exception as e:
+        print(f"❌ 供应商去重失败: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+"""
+HTTP压测脚本
+在进程内通过httpx的ASGI传输驱动 app.main:app，或对本地启动的uvicorn发起请求，
+按权重混合执行匿名浏览、搜索、登录、详情查看和写入等场景，
+输出每个路由的吞吐量、p50/p95/p99延迟和错误率。全程无需外网。
+
+用法:
+    python app/scripts/load_test.py --users 20 --duration 30
+    python app/scripts/load_test.py --base-url http://127.0.0.1:8000 --users 50
+"""
+import sys
+import os
+import argparse
+import asyncio
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+# 添加项目根目录到Python路径
+backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, backend_dir)
+
+import httpx
+
+API_PREFIX = "/api/v1"
+
+LOADTEST_EMAIL = "loadtest@semix.com"
+LOADTEST_USERNAME = "loadtest"
+LOADTEST_PASSWORD = "LoadTest123"
+
+SEARCH_TERMS = ["芯片", "半导体", "出口", "EUV", "晶圆", "封装", "传感器", "关税"]
+
+
+@dataclass
+class RouteStats:
+    """单个路由的统计数据"""
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    status_codes: Dict[int, int] = field(default_factory=dict)
+
+    @property
+    def count(self) -> int:
+        return len(self.latencies)
+
+    def percentile(self, pct: float) -> float:
+        """最近秩法计算百分位延迟（毫秒）"""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+        return ordered[index] * 1000
+
+
+class LoadTestStats:
+    """按路由模板汇总的请求统计"""
+
+    def __init__(self):
+        self.routes: Dict[str, RouteStats] = {}
+        self.started_at = time.perf_counter()
+        self.finished_at: Optional[float] = None
+
+    def record(self, route: str, elapsed: float, status_code: Optional[int]):
+        stats = self.routes.setdefault(route, RouteStats())
+        stats.latencies.append(elapsed)
+        if status_code is None:
+            stats.errors += 1
+            status_code = 0
+        elif status_code >= 400:
+            stats.errors += 1
+        stats.status_codes[status_code] = stats.status_codes.get(status_code, 0) + 1
+
+    @property
+    def elapsed(self) -> float:
+        end = self.finished_at or time.perf_counter()
+        return max(end - self.started_at, 1e-9)
+
+    def report(self) -> str:
+        """生成文本报表"""
+        lines = []
+        header = f"{'路由':<42}{'请求数':>8}{'RPS':>9}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'错误率':>9}"
+        lines.append(header)
+        lines.append("-" * len(header))
+
+        total = RouteStats()
+        for route in sorted(self.routes):
+            stats = self.routes[route]
+            total.latencies.extend(stats.latencies)
+            total.errors += stats.errors
+            lines.append(self._format_row(route, stats))
+
+        lines.append("-" * len(header))
+        lines.append(self._format_row("总计", total))
+        return "\n".join(lines)
+
+    def _format_row(self, route: str, stats: RouteStats) -> str:
+        error_rate = stats.errors / stats.count if stats.count else 0.0
+        return (
+            f"{route:<42}{stats.count:>8}{stats.count / self.elapsed:>9.1f}"
+            f"{stats.percentile(50):>10.1f}{stats.percentile(95):>10.1f}{stats.percentile(99):>10.1f}"
+            f"{error_rate:>9.1%}"
+        )
+
+
+class VirtualUser:
+    """虚拟用户，持有独立的登录状态"""
+
+    def __init__(self, client: httpx.AsyncClient, stats: LoadTestStats, rng: random.Random):
+        self.client = client
+        self.stats = stats
+        self.rng = rng
+        self.token: Optional[str] = None
+        self.known_post_ids: List[int] = []
+        self.known_policy_ids: List[int] = []
+
+    async def request(self, method: str, route: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        """发起请求并以路由模板为键记录耗时"""
+        headers = kwargs.pop("headers", {})
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, API_PREFIX + url, headers=headers, **kwargs)
+        except httpx.HTTPError:
+            self.stats.record(f"{method} {route}", time.perf_counter() - started, None)
+            return None
+
+        self.stats.record(f"{method} {route}", time.perf_counter() - started, response.status_code)
+        return response
+
+    def _remember_ids(self, response: Optional[httpx.Response], target: List[int]):
+        if response is None or response.status_code != 200:
+            return
+        items = response.json()
+        if isinstance(items, list):
+            target[:] = [item["id"] for item in items if isinstance(item, dict) and "id" in item][:50]
+
+
+# 压测场景：每个场景是一个接收虚拟用户的协程函数
+async def browse_scenario(user: VirtualUser):
+    """匿名浏览：列表、推荐和统计"""
+    user._remember_ids(await user.request("GET", "/community/", "/community/"), user.known_post_ids)
+    await user.request("GET", "/community/hot", "/community/hot")
+    await user.request("GET", "/community/categories", "/community/categories")
+    user._remember_ids(await user.request("GET", "/policies/", "/policies/"), user.known_policy_ids)
+    await user.request("GET", "/suppliers/featured", "/suppliers/featured")
+    await user.request("GET", "/market/latest", "/market/latest")
+    await user.request("GET", "/compliance/featured", "/compliance/featured")
+    await user.request("GET", "/marketplace/latest", "/marketplace/latest")
+
+
+async def stats_scenario(user: VirtualUser):
+    """统计面板"""
+    for route in ("/suppliers/stats", "/policies/stats", "/market/stats", "/community/stats", "/marketplace/stats"):
+        await user.request("GET", route, route)
+
+
+async def search_scenario(user: VirtualUser):
+    """关键词搜索"""
+    term = user.rng.choice(SEARCH_TERMS)
+    await user.request("GET", "/suppliers/search", "/suppliers/search", params={"q": term})
+    await user.request("GET", "/community/search", "/community/search", params={"q": term})
+    await user.request("GET", "/policies/search", "/policies/search", params={"q": term})
+    await user.request("GET", "/market/search", "/market/search", params={"q": term})
+
+
+async def detail_scenario(user: VirtualUser):
+    """详情页查看"""
+    if not user.known_post_ids or not user.known_policy_ids:
+        await browse_scenario(user)
+    if user.known_post_ids:
+        post_id = user.rng.choice(user.known_post_ids)
+        await user.request("GET", "/community/{post_id}", f"/community/{post_id}")
+    if user.known_policy_ids:
+        policy_id = user.rng.choice(user.known_policy_ids)
+        await user.request("GET", "/policies/{policy_id}", f"/policies/{policy_id}")
+
+
+async def login_scenario(user: VirtualUser):
+    """登录并获取当前用户信息"""
+    response = await user.request(
+        "POST", "/auth/login-json", "/auth/login-json",
+        json={"email": LOADTEST_EMAIL, "password": LOADTEST_PASSWORD}
+    )
+    if response is not None and response.status_code == 200:
+        user.token = response.json()["access_token"]
+        await user.request("GET", "/auth/me", "/auth/me")
+
+
+async def write_scenario(user: VirtualUser):
+    """写入：发帖和评论"""
+    if not user.token:
+        await login_scenario(user)
+        if not user.token:
+            return
+
+    response = await user.request("POST", "/community/", "/community/", json={
+        "title": f"压测帖子 {user.rng.randint(1, 10 ** 6)}",
+        "content": "压测脚本自动生成的内容",
+        "post_type": "question",
+        "tags": '["压测"]'
+    })
+    if response is not None and response.status_code == 201:
+        post_id = response.json()["id"]
+        await user.request(
+            "POST", "/community/{post_id}/comments", f"/community/{post_id}/comments",
+            json={"post_id": post_id, "content": "压测评论"}
+        )
+
+
+SCENARIOS: Dict[str, Callable[[VirtualUser], Awaitable[None]]] = {
+    "browse": browse_scenario,
+    "stats": stats_scenario,
+    "search": search_scenario,
+    "detail": detail_scenario,
+    "login": login_scenario,
+    "write": write_scenario,
+}
+
+DEFAULT_WEIGHTS = {
+    "browse": 40,
+    "stats": 10,
+    "search": 20,
+    "detail": 20,
+    "login": 5,
+    "write": 5,
+}
+
+
+def parse_weights(value: Optional[str]) -> Dict[str, int]:
+    """解析 browse=40,search=20 形式的场景权重"""
+    if not value:
+        return dict(DEFAULT_WEIGHTS)
+
+    weights = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"未知场景: {name}")
+        weights[name] = int(weight or 1)
+    return weights
+
+
+async def ensure_loadtest_user(client: httpx.AsyncClient):
+    """注册压测账号（已存在时接口返回400，忽略即可）"""
+    await client.post(f"{API_PREFIX}/auth/register", json={
+        "email": LOADTEST_EMAIL,
+        "username": LOADTEST_USERNAME,
+        "password": LOADTEST_PASSWORD,
+        "confirm_password": LOADTEST_PASSWORD,
+    })
+
+
+async def run_virtual_user(
+    client: httpx.AsyncClient,
+    stats: LoadTestStats,
+    weights: Dict[str, int],
+    deadline: float,
+    iterations: Optional[int],
+    seed: int
+):
+    """单个虚拟用户循环执行加权随机场景"""
+    rng = random.Random(seed)
+    user = VirtualUser(client, stats, rng)
+    names = list(weights)
+    population = [weights[name] for name in names]
+
+    done = 0
+    while time.perf_counter() < deadline and (iterations is None or done < iterations):
+        scenario = SCENARIOS[rng.choices(names, population)[0]]
+        await scenario(user)
+        done += 1
+
+
+async def run_load_test(
+    users: int = 10,
+    duration: float = 30.0,
+    iterations: Optional[int] = None,
+    base_url: Optional[str] = None,
+    weights: Optional[Dict[str, int]] = None,
+    seed: int = 42
+) -> LoadTestStats:
+    """执行压测并返回统计结果"""
+    weights = weights or dict(DEFAULT_WEIGHTS)
+
+    if base_url:
+        transport = None
+        client_base_url = base_url
+    else:
+        # 进程内模式不会触发startup事件，需手动建表
+        from app.main import app
+        from app.core.database import create_tables
+        create_tables()
+        transport = httpx.ASGITransport(app=app)
+        client_base_url = "http://loadtest"
+
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(
+        transport=transport, base_url=client_base_url, limits=limits, timeout=30.0
+    ) as client:
+        await ensure_loadtest_user(client)
+
+        stats = LoadTestStats()
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*[
+            run_virtual_user(client, stats, weights, deadline, iterations, seed + i)
+            for i in range(users)
+        ])
+        stats.finished_at = time.perf_counter()
+
+    return stats
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="SemiX API 压测")
+    parser.add_argument("--users", type=int, default=10, help="并发虚拟用户数")
+    parser.add_argument("--duration", type=float, default=30.0, help="压测时长（秒）")
+    parser.add_argument("--iterations", type=int, default=None, help="每个用户执行的场景数（优先于时长结束）")
+    parser.add_argument("--base-url", default=None, help="目标服务地址，不填则在进程内驱动ASGI应用")
+    parser.add_argument("--database-url", default=None, help="进程内模式使用的数据库URL")
+    parser.add_argument("--weights", default=None, help="场景权重，如 browse=40,search=20,write=5")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    args = parser.parse_args()
+
+    if args.database_url:
+        # 必须在导入app之前设置
+        os.environ["DATABASE_URL"] = args.database_url
+
+    mode = args.base_url or "进程内ASGI"
+    print(f"开始压测: {mode}，{args.users} 个并发用户，时长 {args.duration}s")
+
+    stats = asyncio.run(run_load_test(
+        users=args.users,
+        duration=args.duration,
+        iterations=args.iterations,
+        base_url=args.base_url,
+        weights=parse_weights(args.weights),
+        seed=args.seed
+    ))
+
+    print(f"\n✅ 压测完成，耗时 {stats.elapsed:.1f}s\n")
+    print(stats.report())
+
+
+if __name__ == "__main__":
+    main()
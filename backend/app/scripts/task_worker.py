@@ -0,0 +1,99 @@
+"""
+后台任务worker进程
+Web进程只负责把任务写入队列，任务由本进程执行；可启动多个进程水平扩展
+
+用法:
+    python app/scripts/task_worker.py
+    python app/scripts/task_worker.py --queues default --concurrency 8
+    python app/scripts/task_worker.py --scheduler        # 同时运行定时采集调度器
+    python app/scripts/task_worker.py --stats
+    python app/scripts/task_worker.py --retry-dead 12
+    python app/scripts/task_worker.py --purge-days 7
+"""
+import sys
+import os
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import signal
+from datetime import timedelta
+
+# 添加项目根目录到Python路径
+backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, backend_dir)
+
+from app.core.config import settings
+from app.core.database import create_tables
+from app.tasks import TASK_MODULES, get_task_queue
+from app.tasks.queue import DEFAULT_QUEUE
+from app.tasks.worker import Worker
+from app.services.collection_scheduler import CollectionScheduler, SCHEDULER_POLL_INTERVAL
+
+
+def run_worker(args):
+    for module in TASK_MODULES:
+        importlib.import_module(module)
+
+    worker = Worker(
+        queues=[queue.strip() for queue in args.queues.split(",") if queue.strip()],
+        concurrency=args.concurrency,
+        visibility_timeout=args.visibility_timeout,
+        shutdown_timeout=args.shutdown_timeout
+    )
+
+    async def run():
+        stop_event = asyncio.Event()
+
+        def stop():
+            stop_event.set()
+            worker.stop()
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop)
+        if args.scheduler:
+            scheduler = CollectionScheduler(poll_interval=args.scheduler_interval)
+            await asyncio.gather(worker.run(), scheduler.run(stop_event))
+        else:
+            await worker.run()
+
+    asyncio.run(run())
+    print(f"✅ worker已停止: 完成 {worker.processed} 个任务, 失败 {worker.failed} 个")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="后台任务worker")
+    parser.add_argument("--queues", default=DEFAULT_QUEUE, help="监听的队列，逗号分隔")
+    parser.add_argument("--concurrency", type=int, default=settings.TASK_WORKER_CONCURRENCY, help="最大并发任务数")
+    parser.add_argument("--visibility-timeout", type=float, default=settings.TASK_VISIBILITY_TIMEOUT, help="可见性超时（秒）")
+    parser.add_argument("--shutdown-timeout", type=float, default=30.0, help="停止时等待执行中任务的时间（秒）")
+    parser.add_argument("--scheduler", action="store_true", help="同时运行定时采集调度器")
+    parser.add_argument("--scheduler-interval", type=float, default=SCHEDULER_POLL_INTERVAL, help="调度检查间隔（秒）")
+    parser.add_argument("--stats", action="store_true", help="输出队列统计后退出")
+    parser.add_argument("--retry-dead", type=int, metavar="ID", help="把指定死信任务重新入队后退出")
+    parser.add_argument("--purge-days", type=int, metavar="DAYS", help="删除早于指定天数的成功任务记录后退出")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=settings.LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    create_tables()
+    task_queue = get_task_queue()
+
+    if args.stats:
+        print(json.dumps(task_queue.stats(), ensure_ascii=False, indent=2))
+    elif args.retry_dead is not None:
+        task_id = task_queue.retry_dead_letter(args.retry_dead)
+        if task_id:
+            print(f"✅ 死信任务 {args.retry_dead} 已重新入队，新任务ID {task_id}")
+        else:
+            print(f"❌ 死信任务 {args.retry_dead} 不存在")
+    elif args.purge_days is not None:
+        deleted = task_queue.purge_succeeded(timedelta(days=args.purge_days))
+        print(f"✅ 已删除 {deleted} 条成功任务记录")
+    else:
+        run_worker(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
 from .user_service import UserService
+from .data_version_service import DataVersionService
 
-__all__ = ["UserService"]
+__all__ = ["UserService", "DataVersionService"]
@@ -0,0 +1,420 @@
+"""
+采集任务服务
+记录每次采集任务及各数据源的进度（抓取、清洗、入库、跳过数量、吞吐量和预计剩余时间），
+同一数据源同时只允许一个任务执行，支持取消执行中的任务
+"""
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import logging
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.database import SessionLocal
+from app.models.collection_job import CollectionJob, CollectionJobSource, JobStatus, FINISHED_JOB_STATUSES
+
+logger = logging.getLogger(__name__)
+
+# 进度写库间隔（秒），执行期间计数只在内存中累加
+DEFAULT_FLUSH_INTERVAL = 2.0
+
+# 执行中的任务超过该时间没有心跳，视为执行进程异常退出并释放其数据源
+# （等待中的任务保存在持久化队列里，不会丢失，因此不做超时处理）
+STALE_RUNNING_TIMEOUT = 5 * 60
+
+# 进度计数字段
+PROGRESS_FIELDS = ("fetched", "cleaned", "inserted", "updated", "skipped", "failed")
+
+
+class SourceBusyError(Exception):
+    """请求的数据源已有执行中的任务"""
+
+    def __init__(self, sources: List[str]):
+        self.sources = sources
+        super().__init__(f"数据源正在采集中: {', '.join(sources)}")
+
+
+class SourceProgress:
+    """单个数据源在内存中的进度"""
+
+    __slots__ = PROGRESS_FIELDS + ('total', 'status', 'error', 'started', 'started_at', 'finished_at', 'dirty')
+
+    def __init__(self):
+        for field in PROGRESS_FIELDS:
+            setattr(self, field, 0)
+        self.total: Optional[int] = None
+        self.status = JobStatus.PENDING
+        self.error: Optional[str] = None
+        self.started: Optional[float] = None
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.dirty = False
+
+    @property
+    def processed(self) -> int:
+        """已处理完（入库、跳过或失败）的记录数"""
+        return self.inserted + self.updated + self.skipped + self.failed
+
+    def throughput(self) -> float:
+        if self.started is None:
+            return 0.0
+        elapsed = time.monotonic() - self.started
+        return round(self.processed / elapsed, 2) if elapsed > 0 else 0.0
+
+    def eta_seconds(self) -> Optional[float]:
+        if self.status != JobStatus.RUNNING or not self.total:
+            return None
+        throughput = self.throughput()
+        if not throughput:
+            return None
+        return round(max(self.total - self.processed, 0) / throughput, 1)
+
+
+class JobProgress:
+    """
+    采集任务进度上报
+    采集代码调用 add()/record_ingest() 在内存中累加计数（线程安全），
+    run_flusher() 按 flush_interval 批量写库并刷新心跳，同时读取取消请求设置 cancelled
+    """
+
+    def __init__(self, job_id: int, flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        self.job_id = job_id
+        self.flush_interval = flush_interval
+        self.cancelled = False
+        self._sources: Dict[str, SourceProgress] = {}
+        self._lock = threading.Lock()
+        self._stopped = asyncio.Event()
+
+    def _get(self, source: str) -> SourceProgress:
+        progress = self._sources.get(source)
+        if progress is None:
+            progress = self._sources[source] = SourceProgress()
+        return progress
+
+    def start_source(self, source: str, total: Optional[int] = None):
+        with self._lock:
+            progress = self._get(source)
+            progress.status = JobStatus.RUNNING
+            progress.total = total
+            progress.started = time.monotonic()
+            progress.started_at = datetime.utcnow()
+            progress.dirty = True
+
+    def set_total(self, source: str, total: Optional[int]):
+        with self._lock:
+            progress = self._get(source)
+            progress.total = total
+            progress.dirty = True
+
+    def add(self, source: str, **counts: int):
+        with self._lock:
+            progress = self._get(source)
+            for field, count in counts.items():
+                setattr(progress, field, getattr(progress, field) + count)
+            progress.dirty = True
+
+    def record_ingest(self, source: str, stats: Dict):
+        """累加 bulk_save_suppliers 返回的入库统计"""
+        self.add(
+            source,
+            inserted=stats.get("inserted", 0),
+            updated=stats.get("updated", 0),
+            skipped=stats.get("skipped", 0) + stats.get("unchanged", 0) + stats.get("fuzzy_duplicates", 0),
+            failed=stats.get("failed", 0)
+        )
+
+    def source_result(self, source: str):
+        """数据源的最终状态和错误信息: (JobStatus, error)"""
+        with self._lock:
+            progress = self._sources.get(source)
+            if progress is None:
+                return (JobStatus.CANCELLED if self.cancelled else JobStatus.PENDING), None
+            return progress.status, progress.error
+
+    def finish_source(self, source: str, error: Optional[str] = None):
+        """标记数据源结束，重复调用时以第一次为准"""
+        with self._lock:
+            progress = self._get(source)
+            if progress.status in FINISHED_JOB_STATUSES:
+                return
+            if error:
+                progress.status = JobStatus.FAILED
+                progress.error = error
+            elif self.cancelled:
+                progress.status = JobStatus.CANCELLED
+            else:
+                progress.status = JobStatus.COMPLETED
+            progress.finished_at = datetime.utcnow()
+            progress.dirty = True
+
+    def flush(self, db: Optional[Session] = None) -> bool:
+        """把有变化的数据源进度写入数据库并刷新心跳，返回任务是否被请求取消"""
+        with self._lock:
+            snapshot = {}
+            for source, progress in self._sources.items():
+                if not progress.dirty:
+                    continue
+                snapshot[source] = {field: getattr(progress, field) for field in PROGRESS_FIELDS}
+                snapshot[source].update(
+                    total=progress.total,
+                    status=progress.status,
+                    error=progress.error,
+                    started_at=progress.started_at,
+                    finished_at=progress.finished_at,
+                    throughput=progress.throughput(),
+                    eta_seconds=progress.eta_seconds()
+                )
+                if progress.status in FINISHED_JOB_STATUSES:
+                    snapshot[source]["active"] = None
+                progress.dirty = False
+
+        own_session = db is None
+        db = db or SessionLocal()
+        try:
+            now = datetime.utcnow()
+            job = db.query(CollectionJob).filter(CollectionJob.id == self.job_id).first()
+            if job is None:
+                return False
+            job.heartbeat_at = now
+            if snapshot:
+                rows = db.query(CollectionJobSource).filter(
+                    CollectionJobSource.job_id == self.job_id,
+                    CollectionJobSource.source.in_(list(snapshot))
+                ).all()
+                for row in rows:
+                    for field, value in snapshot[row.source].items():
+                        setattr(row, field, value)
+                    row.updated_at = now
+            db.commit()
+            if job.cancel_requested and not self.cancelled:
+                logger.info(f"采集任务 {self.job_id} 收到取消请求")
+                self.cancelled = True
+            return self.cancelled
+        except Exception as e:
+            db.rollback()
+            # 写入失败的进度下次重试
+            with self._lock:
+                for source in snapshot:
+                    self._sources[source].dirty = True
+            logger.error(f"写入采集任务 {self.job_id} 进度失败: {e}")
+            return self.cancelled
+        finally:
+            if own_session:
+                db.close()
+
+    async def run_flusher(self):
+        """任务执行期间定期写入进度，直到调用 stop()"""
+        while not self._stopped.is_set():
+            try:
+                await asyncio.wait_for(self._stopped.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                await asyncio.to_thread(self.flush)
+
+    def stop(self):
+        self._stopped.set()
+
+
+class CollectionJobService:
+    """采集任务服务类"""
+
+    @staticmethod
+    def create_job(db: Session, sources: List[str], mode: str = "insert", user_id: Optional[int] = None) -> CollectionJob:
+        """创建采集任务并占用数据源，已有数据源在执行时抛出 SourceBusyError"""
+        CollectionJobService.release_stale_jobs(db)
+
+        job = CollectionJob(status=JobStatus.PENDING, mode=mode, created_by=user_id)
+        job.sources = [CollectionJobSource(source=source, status=JobStatus.PENDING, active=True) for source in sources]
+        db.add(job)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            busy = db.query(CollectionJobSource.source).filter(
+                CollectionJobSource.source.in_(sources),
+                CollectionJobSource.active == True
+            ).all()
+            raise SourceBusyError(sorted({source for source, in busy}) or sources)
+        db.refresh(job)
+        return job
+
+    @staticmethod
+    def release_stale_jobs(db: Session) -> int:
+        """把心跳超时的执行中任务标记为失败，释放其数据源"""
+        stale_jobs = db.query(CollectionJob).filter(
+            CollectionJob.status == JobStatus.RUNNING,
+            CollectionJob.heartbeat_at < datetime.utcnow() - timedelta(seconds=STALE_RUNNING_TIMEOUT)
+        ).all()
+        for job in stale_jobs:
+            logger.warning(f"采集任务 {job.id} 长时间无响应，标记为失败")
+            CollectionJobService._finish(job, JobStatus.FAILED, "执行进程无响应")
+        if stale_jobs:
+            db.commit()
+        return len(stale_jobs)
+
+    @staticmethod
+    def _finish(job: CollectionJob, status: JobStatus, error: Optional[str] = None):
+        now = datetime.utcnow()
+        job.status = status
+        job.error = error
+        job.finished_at = now
+        for source in job.sources:
+            source.active = None
+            source.eta_seconds = None
+            if source.status not in FINISHED_JOB_STATUSES:
+                source.status = status
+                source.finished_at = now
+
+    @staticmethod
+    def mark_started(db: Session, job_id: int) -> bool:
+        """开始执行任务，任务已被取消或不存在时返回False"""
+        job = db.query(CollectionJob).filter(
+            CollectionJob.id == job_id,
+            CollectionJob.status == JobStatus.PENDING
+        ).first()
+        if not job:
+            return False
+        now = datetime.utcnow()
+        job.status = JobStatus.RUNNING
+        job.started_at = now
+        job.heartbeat_at = now
+        db.commit()
+        return True
+
+    @staticmethod
+    def mark_finished(db: Session, job_id: int, status: JobStatus, error: Optional[str] = None):
+        job = db.query(CollectionJob).filter(CollectionJob.id == job_id).first()
+        if job:
+            CollectionJobService._finish(job, status, error)
+            db.commit()
+
+    @staticmethod
+    def get_job(db: Session, job_id: int) -> Optional[CollectionJob]:
+        return db.query(CollectionJob).options(
+            selectinload(CollectionJob.sources)
+        ).filter(CollectionJob.id == job_id).first()
+
+    @staticmethod
+    def get_jobs_list(
+        db: Session,
+        status: Optional[JobStatus] = None,
+        source: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 20
+    ) -> List[CollectionJob]:
+        query = db.query(CollectionJob).options(selectinload(CollectionJob.sources))
+        if status:
+            query = query.filter(CollectionJob.status == status)
+        if source:
+            query = query.filter(CollectionJob.sources.any(CollectionJobSource.source == source))
+        return query.order_by(CollectionJob.id.desc()).offset(skip).limit(limit).all()
+
+    @staticmethod
+    def request_cancel(db: Session, job_id: int) -> Optional[CollectionJob]:
+        """
+        取消任务：未开始的任务直接标记为已取消；执行中的任务记录取消请求，
+        由执行进程在下一次写入进度时读取并在当前批次完成后停止
+        """
+        job = CollectionJobService.get_job(db, job_id)
+        if not job:
+            return None
+        if job.status == JobStatus.PENDING:
+            CollectionJobService._finish(job, JobStatus.CANCELLED)
+        elif job.status == JobStatus.RUNNING:
+            job.cancel_requested = True
+        db.commit()
+        db.refresh(job)
+        return job
+
+    @staticmethod
+    def get_collection_status(db: Session) -> Dict:
+        """当前执行中的任务和最近一次任务"""
+        running = db.query(CollectionJob).options(selectinload(CollectionJob.sources)).filter(
+            CollectionJob.status.in_([JobStatus.PENDING, JobStatus.RUNNING])
+        ).order_by(CollectionJob.id.desc()).all()
+        last_job = db.query(CollectionJob).options(
+            selectinload(CollectionJob.sources)
+        ).order_by(CollectionJob.id.desc()).first()
+        if running:
+            status = "running"
+        elif last_job:
+            status = last_job.status.value
+        else:
+            status = "idle"
+        return {"status": status, "running_jobs": running, "last_job": last_job}
+
+
+async def run_collection_job(
+    job_id: int,
+    mode: str,
+    sources: List[str],
+    incremental: bool = False,
+    flush_interval: float = DEFAULT_FLUSH_INTERVAL
+) -> Optional[Dict]:
+    """
+    执行采集任务并持续上报进度
+    incremental=True 时从各数据源的增量游标开始采集；结束后记录各数据源的运行结果并推进游标
+    """
+    from app.services.collection_scheduler import CollectionScheduleService
+    from app.services.data_collection_service import DataCollectionService
+
+    def start() -> Optional[Dict[str, Dict]]:
+        db = SessionLocal()
+        try:
+            if not CollectionJobService.mark_started(db, job_id):
+                return None
+            return CollectionScheduleService.load_cursors(db, sources) if incremental else {}
+        finally:
+            db.close()
+
+    def finish(status: JobStatus, error: Optional[str] = None):
+        db = SessionLocal()
+        try:
+            progress.flush(db)
+            CollectionJobService.mark_finished(db, job_id, status, error)
+            for source in sources:
+                source_status, source_error = progress.source_result(source)
+                if status == JobStatus.FAILED and source_status != JobStatus.FAILED:
+                    source_status, source_error = JobStatus.FAILED, error
+                CollectionScheduleService.record_run(
+                    db, source, job_id, source_status,
+                    cursor=collector.next_cursors.get(source) if collector else None,
+                    error=source_error
+                )
+        finally:
+            db.close()
+
+    cursors = await asyncio.to_thread(start)
+    if cursors is None:
+        logger.info(f"采集任务 {job_id} 已取消或不存在，跳过")
+        return None
+
+    progress = JobProgress(job_id, flush_interval)
+    flusher = asyncio.create_task(progress.run_flusher())
+    collector = None
+    status, error, results = JobStatus.COMPLETED, None, None
+    try:
+        collector = DataCollectionService(mode=mode, progress=progress, cursors=cursors)
+        results = await collector.collect_from_multiple_sources(sources)
+        if progress.cancelled:
+            status = JobStatus.CANCELLED
+    except asyncio.CancelledError:
+        status = JobStatus.CANCELLED
+        raise
+    except Exception as e:
+        logger.error(f"采集任务 {job_id} 失败: {e}")
+        status, error = JobStatus.FAILED, str(e)
+    finally:
+        # 等待进行中的写入结束，避免其覆盖最终状态
+        progress.stop()
+        await flusher
+        await asyncio.to_thread(finish, status, error)
+
+    if results:
+        logger.info(
+            f"采集任务 {job_id} 结束（{status.value}），新增 {results['total_collected']} 条，"
+            f"更新 {results['total_updated']} 条数据"
+        )
+    return results
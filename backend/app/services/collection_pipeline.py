@@ -0,0 +1,202 @@
+"""
+流式采集管道
+爬取队列 → 抓取 → 解析 → 清洗 → 去重 → 批量入库，
+各阶段通过有界队列连接、并发数可配，全程不在内存中累积完整结果
+"""
+import asyncio
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import logging
+
+from app.core.database import SessionLocal
+from app.crawlers.frontier import CrawlFrontier, FrontierEntry
+from app.crawlers.semiconductor_crawler import PageResult, SemiconductorCrawler
+from app.services.data_collection_service import DataCollectionService
+from app.utils.data_cleaner import DataCleaner
+from app.utils.pipeline import Pipeline, Stage
+
+logger = logging.getLogger(__name__)
+
+# 本次采集内精确去重记住的 (企业名称, 国家) 数量上限，超出后淘汰最久未出现的键
+DEDUPE_CACHE_SIZE = 100_000
+
+
+class CollectionPipeline:
+    """
+    采集管道
+    用法:
+        async with SemiconductorCrawler() as crawler:
+            pipeline = CollectionPipeline(crawler, CrawlFrontier())
+            crawler.seed_frontier(pipeline.frontier)
+            result = await pipeline.run()   # {"stages": 各阶段统计, "ingest": 入库统计}
+    """
+
+    def __init__(
+        self,
+        crawler: SemiconductorCrawler,
+        frontier: CrawlFrontier,
+        service: Optional[DataCollectionService] = None,
+        cleaner: Optional[DataCleaner] = None,
+        fetch_workers: int = 10,
+        parse_workers: Optional[int] = None,
+        clean_workers: int = 1,
+        batch_size: int = 500,
+        queue_size: int = 100,
+        max_depth: int = 5,
+        max_pages: Optional[int] = None,
+        dedupe_cache_size: int = DEDUPE_CACHE_SIZE,
+        progress=None,
+        source: str = "industry_database"
+    ):
+        self.crawler = crawler
+        self.frontier = frontier
+        self.service = service or DataCollectionService(chunk_size=batch_size, mode="upsert")
+        self.cleaner = cleaner or DataCleaner()
+        self._seen_keys: "OrderedDict[Tuple[str, str], None]" = OrderedDict()
+        self.dedupe_cache_size = dedupe_cache_size
+        self.fetch_workers = fetch_workers
+        # 解析在进程池中执行，并发数默认与进程数一致
+        self.parse_workers = parse_workers or max(crawler.parse_pool.workers, 1)
+        self.clean_workers = clean_workers
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.ingest_stats: Dict[str, int] = {
+            "inserted": 0, "updated": 0, "unchanged": 0, "skipped": 0, "duplicates": 0, "fuzzy_duplicates": 0, "failed": 0
+        }
+        self.pipeline: Optional[Pipeline] = None
+        # 采集任务进度上报（JobProgress），按 source 记入对应数据源
+        self.progress = progress
+        self.source = source
+
+    def build(self) -> Pipeline:
+        self.pipeline = Pipeline(self._source(), [
+            Stage("fetch", self._fetch, workers=self.fetch_workers, queue_size=self.queue_size),
+            Stage("parse", self._parse, workers=self.parse_workers, queue_size=self.queue_size),
+            Stage("clean", self._clean, workers=self.clean_workers, queue_size=self.queue_size),
+            Stage("dedupe", self._dedupe, workers=1, queue_size=self.queue_size),
+            Stage("write", self._write, workers=1, queue_size=self.batch_size * 2, batch_size=self.batch_size),
+        ])
+        return self.pipeline
+
+    async def run(self) -> Dict:
+        pipeline = self.build()
+        self.frontier.requeue_in_progress()
+        if self.progress:
+            self.progress.start_source(self.source)
+        try:
+            stages = await pipeline.run()
+        except Exception as e:
+            if self.progress:
+                self.progress.finish_source(self.source, error=str(e))
+            raise
+        if self.progress:
+            self.progress.finish_source(self.source)
+        return {"stages": stages, "ingest": dict(self.ingest_stats)}
+
+    async def _source(self) -> AsyncIterator[FrontierEntry]:
+        """从爬取队列领取到期的URL；队列暂空但抓取/解析仍在进行时等待新发现的链接"""
+        claimed = 0
+        while self.max_pages is None or claimed < self.max_pages:
+            if self.progress and self.progress.cancelled:
+                logger.info("采集任务已取消，停止领取新的URL")
+                return
+            entries = self.frontier.claim(1)
+            if not entries:
+                if self.pipeline.is_idle(2):
+                    return
+                await asyncio.sleep(0.2)
+                continue
+            claimed += 1
+            yield entries[0]
+
+    async def _fetch(self, entry: FrontierEntry):
+        # 首次抓取的页面需要完整解析以发现链接，不走条件请求
+        result = await self.crawler.fetch_page(entry.url, revalidate=entry.fetch_count > 0)
+        if result.error:
+            self.frontier.fail(entry.url, result.error)
+            return
+        yield entry, result
+
+    async def _parse(self, fetched):
+        entry, result = fetched
+        try:
+            parsed: PageResult = await self.crawler.parse_fetched(entry.url, result, entry.page_type, discover_links=True)
+        except Exception as e:
+            self.frontier.fail(entry.url, str(e))
+            raise
+        self.frontier.complete(entry.url, parsed.content_hash)
+        if parsed.links and entry.depth < self.max_depth:
+            self.frontier.add_many(parsed.links, entry.page_type, entry.priority - 1, entry.depth + 1)
+        if self.progress:
+            self.progress.add(self.source, fetched=len(parsed.items))
+        for item in parsed.items:
+            yield item
+
+    async def _clean(self, item: Dict):
+        # 清洗是CPU密集的同步调用，放到线程中执行，避免阻塞抓取和解析
+        cleaned_data, warnings = await asyncio.to_thread(self.cleaner.clean_supplier_data, item)
+        # DataCleaner 不处理产品类别，按原值交给入库服务序列化
+        cleaned_data["product_categories"] = item.get("product_categories", [])
+        if not cleaned_data["company_name"]:
+            if self.progress:
+                self.progress.add(self.source, failed=1)
+            return
+        if self.progress:
+            self.progress.add(self.source, cleaned=1)
+        yield cleaned_data
+
+    async def _dedupe(self, cleaned_data: Dict):
+        """
+        本次采集内按 (企业名称, 国家) 精确去重，只记住最近 dedupe_cache_size 个键；
+        被淘汰的键再次出现时由入库服务按库中已有记录处理。模糊去重由入库服务完成，
+        其实体解析索引已包含库中企业和此前各批次写入的记录
+        """
+        key = (cleaned_data["company_name"], cleaned_data["country"])
+        if key in self._seen_keys:
+            self._seen_keys.move_to_end(key)
+            self.ingest_stats["duplicates"] += 1
+            if self.progress:
+                self.progress.add(self.source, skipped=1)
+            return
+        self._seen_keys[key] = None
+        if len(self._seen_keys) > self.dedupe_cache_size:
+            self._seen_keys.popitem(last=False)
+        yield cleaned_data
+
+    async def _write(self, batch: List[Dict]):
+        def run() -> Dict:
+            db = SessionLocal()
+            try:
+                # 清洗阶段已由 DataCleaner 处理，入库时不再重复清洗
+                return self.service.bulk_save_suppliers(db, batch, cleaned=True)
+            finally:
+                db.close()
+
+        stats = await asyncio.to_thread(run)
+        for field in self.ingest_stats:
+            self.ingest_stats[field] += stats.get(field, 0)
+        if self.progress:
+            self.progress.record_ingest(self.source, stats)
+        yield stats
+
+
+# 使用示例
+async def run_collection_pipeline(frontier_path: Optional[str] = None):
+    """运行流式采集"""
+    async with SemiconductorCrawler() as crawler:
+        frontier = CrawlFrontier(frontier_path) if frontier_path else CrawlFrontier()
+        try:
+            crawler.seed_frontier(frontier)
+            result = await CollectionPipeline(crawler, frontier).run()
+        finally:
+            frontier.close()
+
+    for name, metrics in result["stages"].items():
+        print(f"{name}: {metrics}")
+    print(f"入库: {result['ingest']}")
+    return result
+
+if __name__ == "__main__":
+    asyncio.run(run_collection_pipeline())
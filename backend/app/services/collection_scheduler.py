@@ -0,0 +1,243 @@
+"""
+定时增量采集
+按各数据源的 update_frequency 定期创建增量采集任务并写入任务队列，
+记录每个数据源的上次/下次运行时间、运行结果和增量游标；
+多个调度进程同时运行时，通过带条件的UPDATE保证同一周期只调度一次
+"""
+import asyncio
+import json
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+import logging
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.collection_job import CollectionSourceState, JobStatus
+from app.services.collection_job_service import CollectionJobService, SourceBusyError
+from app.services.data_collection_service import DATA_SOURCES, UPDATE_FREQUENCY_INTERVALS
+
+logger = logging.getLogger(__name__)
+
+# 调度检查间隔（秒）
+SCHEDULER_POLL_INTERVAL = 60
+
+# 失败后提前重试的间隔：FAILURE_RETRY_BASE * 2^(连续失败次数-1)，不超过正常周期
+FAILURE_RETRY_BASE = 5 * 60
+
+# 数据源正被其他任务采集时，推迟的时间（秒）
+BUSY_RETRY_DELAY = 5 * 60
+
+# 定时采集的入库模式
+SCHEDULED_MODE = "upsert"
+
+
+def interval_for(update_frequency: str) -> int:
+    return UPDATE_FREQUENCY_INTERVALS[update_frequency]
+
+
+class CollectionScheduleService:
+    """数据源调度状态服务类"""
+
+    @staticmethod
+    def ensure_states(db: Session):
+        """为尚无调度状态的数据源创建记录：可用的数据源默认启用并立即执行首次采集"""
+        existing = {source for source, in db.query(CollectionSourceState.source)}
+        now = datetime.utcnow()
+        created = False
+        for source, definition in DATA_SOURCES.items():
+            if source in existing:
+                continue
+            db.add(CollectionSourceState(
+                source=source,
+                enabled=definition["status"] == "available",
+                update_frequency=definition["update_frequency"],
+                next_run_at=now
+            ))
+            created = True
+        if created:
+            db.commit()
+
+    @staticmethod
+    def get_states(db: Session) -> List[CollectionSourceState]:
+        CollectionScheduleService.ensure_states(db)
+        return db.query(CollectionSourceState).order_by(CollectionSourceState.id).all()
+
+    @staticmethod
+    def get_state(db: Session, source: str) -> Optional[CollectionSourceState]:
+        CollectionScheduleService.ensure_states(db)
+        return db.query(CollectionSourceState).filter(CollectionSourceState.source == source).first()
+
+    @staticmethod
+    def update_state(
+        db: Session,
+        source: str,
+        enabled: Optional[bool] = None,
+        update_frequency: Optional[str] = None
+    ) -> Optional[CollectionSourceState]:
+        """修改启用状态或更新频率，频率变化时按新周期重新计算下次运行时间"""
+        state = CollectionScheduleService.get_state(db, source)
+        if not state:
+            return None
+        if enabled is not None:
+            state.enabled = enabled
+        if update_frequency and update_frequency != state.update_frequency:
+            state.update_frequency = update_frequency
+            base = state.last_scheduled_at or datetime.utcnow()
+            state.next_run_at = base + timedelta(seconds=interval_for(update_frequency))
+        db.commit()
+        db.refresh(state)
+        return state
+
+    @staticmethod
+    def run_now(db: Session, source: str) -> Optional[CollectionSourceState]:
+        """把下次运行时间提前到现在，由调度器在下一次检查时执行"""
+        state = CollectionScheduleService.get_state(db, source)
+        if not state:
+            return None
+        state.next_run_at = datetime.utcnow()
+        db.commit()
+        db.refresh(state)
+        return state
+
+    @staticmethod
+    def load_cursors(db: Session, sources: Iterable[str]) -> Dict[str, Dict]:
+        rows = db.query(CollectionSourceState.source, CollectionSourceState.cursor).filter(
+            CollectionSourceState.source.in_(list(sources))
+        ).all()
+        return {source: json.loads(cursor) for source, cursor in rows if cursor}
+
+    @staticmethod
+    def claim_due_sources(db: Session) -> List[str]:
+        """领取到期的数据源并把其下次运行时间推后一个周期"""
+        CollectionScheduleService.ensure_states(db)
+        now = datetime.utcnow()
+        due = db.query(
+            CollectionSourceState.source, CollectionSourceState.next_run_at, CollectionSourceState.update_frequency
+        ).filter(
+            CollectionSourceState.enabled == True,
+            CollectionSourceState.next_run_at <= now
+        ).all()
+
+        claimed = []
+        for source, next_run_at, update_frequency in due:
+            result = db.execute(
+                update(CollectionSourceState)
+                .where(
+                    CollectionSourceState.source == source,
+                    CollectionSourceState.next_run_at == next_run_at
+                )
+                .values(
+                    next_run_at=now + timedelta(seconds=interval_for(update_frequency)),
+                    last_scheduled_at=now
+                )
+            )
+            if result.rowcount == 1:
+                claimed.append(source)
+        db.commit()
+        return claimed
+
+    @staticmethod
+    def postpone(db: Session, source: str, delay: float):
+        db.query(CollectionSourceState).filter(CollectionSourceState.source == source).update(
+            {CollectionSourceState.next_run_at: datetime.utcnow() + timedelta(seconds=delay)},
+            synchronize_session=False
+        )
+        db.commit()
+
+    @staticmethod
+    def set_last_job(db: Session, source: str, job_id: int):
+        db.query(CollectionSourceState).filter(CollectionSourceState.source == source).update(
+            {CollectionSourceState.last_job_id: job_id},
+            synchronize_session=False
+        )
+        db.commit()
+
+    @staticmethod
+    def record_run(
+        db: Session,
+        source: str,
+        job_id: int,
+        status: JobStatus,
+        cursor: Optional[Dict] = None,
+        error: Optional[str] = None
+    ):
+        """
+        记录一次采集结果：成功时推进增量游标；失败时按连续失败次数提前安排重试
+        （手动触发的全量采集同样会推进游标）
+        """
+        state = CollectionScheduleService.get_state(db, source)
+        if not state:
+            return
+        now = datetime.utcnow()
+        state.last_run_at = now
+        state.last_job_id = job_id
+        state.last_status = status
+        state.last_error = error
+        if status == JobStatus.COMPLETED:
+            state.last_success_at = now
+            state.consecutive_failures = 0
+            if cursor:
+                state.cursor = json.dumps(cursor, ensure_ascii=False)
+        elif status == JobStatus.FAILED:
+            state.consecutive_failures = (state.consecutive_failures or 0) + 1
+            retry_at = now + timedelta(seconds=min(
+                FAILURE_RETRY_BASE * 2 ** (state.consecutive_failures - 1),
+                interval_for(state.update_frequency)
+            ))
+            if state.next_run_at is None or retry_at < state.next_run_at:
+                state.next_run_at = retry_at
+        db.commit()
+
+
+class CollectionScheduler:
+    """
+    定时采集调度器
+    每 poll_interval 秒检查一次到期的数据源，为每个数据源创建一个增量采集任务并入队；
+    通常与任务worker在同一进程中运行（python app/scripts/task_worker.py --scheduler）
+    """
+
+    def __init__(self, poll_interval: float = SCHEDULER_POLL_INTERVAL, mode: str = SCHEDULED_MODE):
+        self.poll_interval = poll_interval
+        self.mode = mode
+
+    def tick(self) -> List[int]:
+        """调度一轮，返回创建的采集任务ID"""
+        from app.tasks.collection import run_collection_job_task
+
+        db = SessionLocal()
+        job_ids = []
+        try:
+            for source in CollectionScheduleService.claim_due_sources(db):
+                try:
+                    job = CollectionJobService.create_job(db, [source], self.mode)
+                except SourceBusyError:
+                    logger.info(f"数据源 {source} 正在采集中，{BUSY_RETRY_DELAY} 秒后再调度")
+                    CollectionScheduleService.postpone(db, source, BUSY_RETRY_DELAY)
+                    continue
+                try:
+                    run_collection_job_task.enqueue(job_id=job.id, mode=self.mode, sources=[source], incremental=True)
+                except Exception as e:
+                    logger.error(f"数据源 {source} 的定时采集任务入队失败: {e}")
+                    CollectionJobService.mark_finished(db, job.id, JobStatus.FAILED, f"任务入队失败: {e}")
+                    CollectionScheduleService.postpone(db, source, BUSY_RETRY_DELAY)
+                    continue
+                CollectionScheduleService.set_last_job(db, source, job.id)
+                job_ids.append(job.id)
+                logger.info(f"已调度数据源 {source} 的增量采集任务 {job.id}")
+        finally:
+            db.close()
+        return job_ids
+
+    async def run(self, stop_event: asyncio.Event):
+        logger.info(f"采集调度器启动，检查间隔 {self.poll_interval} 秒")
+        while not stop_event.is_set():
+            try:
+                await asyncio.to_thread(self.tick)
+            except Exception as e:
+                logger.error(f"采集调度失败: {e}")
+            try:
+                await asyncio.wait_for(stop_event.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
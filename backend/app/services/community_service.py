@@ -1,4 +1,4 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, Query
 from sqlalchemy import desc, asc, func, and_, or_
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
@@ -14,6 +14,11 @@ from app.schemas.community import (
     CommunityStats, CommunityCommentCreate, CommunityLikeCreate,
     CommunityFavoriteCreate, CommunityCategoryCreate
 )
+from app.services.tag_service import TagService
+from app.schemas.community import CommunityPost as CommunityPostSchema, CommunityCategory as CommunityCategorySchema
+from app.core.cache import cached
+
+TAG_ENTITY_TYPE = "community_post"
 
 class CommunityService:
     
@@ -30,6 +35,8 @@ class CommunityService:
             published_at=datetime.utcnow() if post_data.post_type != PostType.DISCUSSION else None
         )
         db.add(db_post)
+        db.flush()
+        TagService.sync_entity(db, TAG_ENTITY_TYPE, db_post, active=db_post.status != PostStatus.DELETED)
         
         # 更新分类帖子数量
         if post_data.category_id:
@@ -44,13 +51,14 @@ class CommunityService:
         return db_post
     
     @staticmethod
-    def get_post_by_id(db: Session, post_id: int) -> Optional[CommunityPost]:
+    @cached("community", CommunityPostSchema)
+    def get_post_by_id(db: Session, post_id: int) -> Optional[CommunityPostSchema]:
         """根据ID获取帖子"""
         return db.query(CommunityPost).filter(CommunityPost.id == post_id).first()
     
     @staticmethod
-    def get_posts_list(db: Session, query: CommunityPostQuery) -> List[CommunityPost]:
-        """获取帖子列表"""
+    def build_posts_query(db: Session, query: CommunityPostQuery) -> Query:
+        """构建帖子列表查询（已应用过滤、排序和分页）"""
         db_query = db.query(CommunityPost)
         
         # 应用过滤条件
@@ -72,6 +80,9 @@ class CommunityService:
         if query.author_id:
             db_query = db_query.filter(CommunityPost.created_by == query.author_id)
         
+        if query.tag:
+            db_query = db_query.filter(TagService.has_tag(TAG_ENTITY_TYPE, CommunityPost.id, query.tag))
+        
         if query.keyword:
             keyword_filter = or_(
                 CommunityPost.title.contains(query.keyword),
@@ -105,7 +116,12 @@ class CommunityService:
             db_query = db_query.order_by(asc(getattr(CommunityPost, query.sort_by)))
         
         # 分页
-        return db_query.offset(query.skip).limit(query.limit).all()
+        return db_query.offset(query.skip).limit(query.limit)
+    
+    @staticmethod
+    def get_posts_list(db: Session, query: CommunityPostQuery) -> List[CommunityPost]:
+        """获取帖子列表"""
+        return CommunityService.build_posts_query(db, query).all()
     
     @staticmethod
     def update_post(
@@ -128,6 +144,11 @@ class CommunityService:
         update_data = post_update.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_post, field, value)
+        TagService.sync_entity(
+            db, TAG_ENTITY_TYPE, db_post,
+            None if "status" in update_data else update_data.keys(),
+            active=db_post.status != PostStatus.DELETED
+        )
         
         db_post.updated_at = datetime.utcnow()
         db.commit()
@@ -149,6 +170,7 @@ class CommunityService:
         
         # 软删除
         db_post.status = PostStatus.DELETED
+        TagService.remove_entity(db, TAG_ENTITY_TYPE, db_post.id)
         db.commit()
         return True
     
@@ -255,7 +277,8 @@ class CommunityService:
         )
     
     @staticmethod
-    def get_featured_posts(db: Session, limit: int = 10) -> List[CommunityPost]:
+    @cached("community", List[CommunityPostSchema])
+    def get_featured_posts(db: Session, limit: int = 10) -> List[CommunityPostSchema]:
         """获取推荐帖子"""
         return db.query(CommunityPost).filter(
             CommunityPost.is_featured == True,
@@ -271,7 +294,8 @@ class CommunityService:
         ).order_by(desc(CommunityPost.view_count)).limit(limit).all()
     
     @staticmethod
-    def get_latest_posts(db: Session, limit: int = 20) -> List[CommunityPost]:
+    @cached("community", List[CommunityPostSchema])
+    def get_latest_posts(db: Session, limit: int = 20) -> List[CommunityPostSchema]:
         """获取最新帖子"""
         return db.query(CommunityPost).filter(
             CommunityPost.status == PostStatus.PUBLISHED
@@ -288,6 +312,11 @@ class CommunityService:
             desc(CommunityPost.like_count + CommunityPost.comment_count * 2)
         ).limit(limit).all()
     
+    @staticmethod
+    def get_popular_tags(db: Session, limit: int = 20) -> List[Dict[str, Any]]:
+        """获取热门标签及对应的帖子数"""
+        return TagService.get_popular_tags(db, TAG_ENTITY_TYPE, "tags", limit)
+    
     @staticmethod
     def search_posts(db: Session, search_term: str, limit: int = 20) -> List[CommunityPost]:
         """搜索帖子"""
@@ -430,7 +459,8 @@ class CommunityService:
         return db_favorite
 
     @staticmethod
-    def get_categories(db: Session) -> List[CommunityCategory]:
+    @cached("community", List[CommunityCategorySchema])
+    def get_categories(db: Session) -> List[CommunityCategorySchema]:
         """获取所有分类"""
         return db.query(CommunityCategory).filter(
             CommunityCategory.is_active == True
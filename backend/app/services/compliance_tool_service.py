@@ -1,4 +1,4 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, Query
 from sqlalchemy import desc, asc, func, and_, or_
 from typing import List, Optional, Dict, Any
 from datetime import datetime
@@ -11,6 +11,11 @@ from app.schemas.compliance_tool import (
     ComplianceToolCreate, ComplianceToolUpdate, ComplianceToolQuery,
     ComplianceToolStats, ToolUsageLogCreate, ToolReviewCreate
 )
+from app.services.tag_service import TagService
+from app.schemas.compliance_tool import ComplianceTool as ComplianceToolSchema
+from app.core.cache import cached
+
+TAG_ENTITY_TYPE = "compliance_tool"
 
 class ComplianceToolService:
     
@@ -26,18 +31,21 @@ class ComplianceToolService:
             created_by=created_by
         )
         db.add(db_tool)
+        db.flush()
+        TagService.sync_entity(db, TAG_ENTITY_TYPE, db_tool)
         db.commit()
         db.refresh(db_tool)
         return db_tool
     
     @staticmethod
-    def get_tool_by_id(db: Session, tool_id: int) -> Optional[ComplianceTool]:
+    @cached("compliance", ComplianceToolSchema)
+    def get_tool_by_id(db: Session, tool_id: int) -> Optional[ComplianceToolSchema]:
         """根据ID获取合规工具"""
         return db.query(ComplianceTool).filter(ComplianceTool.id == tool_id).first()
     
     @staticmethod
-    def get_tools_list(db: Session, query: ComplianceToolQuery) -> List[ComplianceTool]:
-        """获取合规工具列表"""
+    def build_tools_query(db: Session, query: ComplianceToolQuery) -> Query:
+        """构建合规工具列表查询（已应用过滤、排序和分页）"""
         db_query = db.query(ComplianceTool)
         
         # 应用过滤条件
@@ -53,6 +61,9 @@ class ComplianceToolService:
         if query.access_level:
             db_query = db_query.filter(ComplianceTool.access_level == query.access_level)
         
+        if query.tag:
+            db_query = db_query.filter(TagService.has_tag(TAG_ENTITY_TYPE, ComplianceTool.id, query.tag))
+        
         if query.keyword:
             keyword_filter = or_(
                 ComplianceTool.name.contains(query.keyword),
@@ -89,7 +100,12 @@ class ComplianceToolService:
             db_query = db_query.order_by(asc(getattr(ComplianceTool, query.sort_by)))
         
         # 分页
-        return db_query.offset(query.skip).limit(query.limit).all()
+        return db_query.offset(query.skip).limit(query.limit)
+    
+    @staticmethod
+    def get_tools_list(db: Session, query: ComplianceToolQuery) -> List[ComplianceTool]:
+        """获取合规工具列表"""
+        return ComplianceToolService.build_tools_query(db, query).all()
     
     @staticmethod
     def update_tool(
@@ -105,6 +121,7 @@ class ComplianceToolService:
         update_data = tool_update.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_tool, field, value)
+        TagService.sync_entity(db, TAG_ENTITY_TYPE, db_tool, update_data.keys())
         
         db_tool.updated_at = datetime.utcnow()
         db.commit()
@@ -118,6 +135,7 @@ class ComplianceToolService:
         if not db_tool:
             return False
         
+        TagService.remove_entity(db, TAG_ENTITY_TYPE, db_tool.id)
         db.delete(db_tool)
         db.commit()
         return True
@@ -204,7 +222,8 @@ class ComplianceToolService:
         )
     
     @staticmethod
-    def get_featured_tools(db: Session, limit: int = 10) -> List[ComplianceTool]:
+    @cached("compliance", List[ComplianceToolSchema])
+    def get_featured_tools(db: Session, limit: int = 10) -> List[ComplianceToolSchema]:
         """获取推荐合规工具"""
         return db.query(ComplianceTool).filter(
             ComplianceTool.is_featured == True,
@@ -212,7 +231,8 @@ class ComplianceToolService:
         ).order_by(desc(ComplianceTool.rating)).limit(limit).all()
     
     @staticmethod
-    def get_popular_tools(db: Session, limit: int = 10) -> List[ComplianceTool]:
+    @cached("compliance", List[ComplianceToolSchema])
+    def get_popular_tools(db: Session, limit: int = 10) -> List[ComplianceToolSchema]:
         """获取热门合规工具"""
         return db.query(ComplianceTool).filter(
             ComplianceTool.is_popular == True,
@@ -220,7 +240,8 @@ class ComplianceToolService:
         ).order_by(desc(ComplianceTool.usage_count)).limit(limit).all()
     
     @staticmethod
-    def get_free_tools(db: Session, limit: int = 20) -> List[ComplianceTool]:
+    @cached("compliance", List[ComplianceToolSchema])
+    def get_free_tools(db: Session, limit: int = 20) -> List[ComplianceToolSchema]:
         """获取免费合规工具"""
         return db.query(ComplianceTool).filter(
             ComplianceTool.access_level == AccessLevel.FREE,
@@ -4,58 +4,218 @@
 """
 import asyncio
 import aiohttp
+import enum
 import json
-from typing import List, Dict, Optional
-from datetime import datetime
+from typing import Callable, List, Dict, Optional, Tuple, Iterable
+from datetime import datetime, timezone
 import logging
+import hashlib
+import threading
+from sqlalchemy import bindparam, insert, update, tuple_
 from sqlalchemy.orm import Session
 
 from app.core.database import SessionLocal
 from app.models.supplier import Supplier, SupplierType, SupplierScale, CertificationLevel
 from app.schemas.supplier import SupplierCreate
+from app.services.tag_service import TagService, TAGGED_ENTITIES
+from app.utils.data_cleaner import CLEANED_COLUMNS
+from app.utils.entity_resolver import EntityResolver
+from app.utils.rate_limiter import RateLimiter
 
 logger = logging.getLogger(__name__)
 
+# 批量入库时每个批次的记录数
+DEFAULT_CHUNK_SIZE = 1000
+
+# 入库模式: insert 只新增，upsert 新增并更新内容发生变化的记录
+COLLECTION_MODES = ("insert", "upsert")
+
+# 数据源定义：update_frequency 决定定时增量采集的周期，rate_limit 为每分钟最多请求数
+DATA_SOURCES = {
+    "alibaba": {
+        "display_name": "阿里巴巴",
+        "type": "b2b_platform",
+        "status": "available",
+        "description": "全球最大的B2B平台，包含大量供应商信息",
+        "estimated_records": 50000,
+        "update_frequency": "daily",
+        "rate_limit": 30
+    },
+    "made_in_china": {
+        "display_name": "中国制造网",
+        "type": "b2b_platform",
+        "status": "available",
+        "description": "中国领先的B2B平台",
+        "estimated_records": 30000,
+        "update_frequency": "daily",
+        "rate_limit": 30
+    },
+    "enterprise_api": {
+        "display_name": "企业信息API",
+        "type": "api_service",
+        "status": "requires_key",
+        "description": "企查查、天眼查等企业信息API",
+        "estimated_records": 100000,
+        "update_frequency": "real_time",
+        "rate_limit": 60
+    },
+    "industry_database": {
+        "display_name": "行业数据库",
+        "type": "industry_data",
+        "status": "available",
+        "description": "半导体行业协会、展会等专业数据",
+        "estimated_records": 5000,
+        "update_frequency": "weekly",
+        "rate_limit": 10
+    }
+}
+
+# 可采集的数据源
+COLLECTION_SOURCES = tuple(DATA_SOURCES)
+
+# 各更新频率对应的定时采集间隔（秒），real_time 的数据源按较短周期轮询
+UPDATE_FREQUENCY_INTERVALS = {
+    "real_time": 15 * 60,
+    "daily": 24 * 3600,
+    "weekly": 7 * 24 * 3600
+}
+
+# 各数据源的请求限流器（同一进程内的所有采集共享）
+_source_rate_limiters: Dict[str, RateLimiter] = {}
+
+
+def get_source_rate_limiter(source: str) -> RateLimiter:
+    limiter = _source_rate_limiters.get(source)
+    if limiter is None:
+        limiter = _source_rate_limiters[source] = RateLimiter(DATA_SOURCES[source]["rate_limit"], per=60)
+    return limiter
+
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None) if value.tzinfo is None else value.astimezone(timezone.utc).replace(tzinfo=None)
+    if isinstance(value, str) and value:
+        try:
+            return _parse_timestamp(datetime.fromisoformat(value.replace("Z", "+00:00")))
+        except ValueError:
+            return None
+    return None
+
+# 建立标签索引的供应商字段
+SUPPLIER_TAG_FIELDS = TAGGED_ENTITIES["supplier"][1]
+
+# bulk_save_suppliers 返回的计数字段
+INGEST_COUNT_FIELDS = ("inserted", "updated", "unchanged", "skipped", "fuzzy_duplicates", "failed")
+
+# 参与内容哈希和增量更新的清洗字段（认证、推荐等人工维护的状态字段不会被采集覆盖）
+UPSERT_FIELDS = (
+    "company_name_en", "contact_person", "email", "phone", "website",
+    "province", "city", "address", "supplier_type", "scale", "main_products",
+    "product_categories", "established_year", "employee_count", "annual_revenue"
+)
+
+def _normalize_hash_value(value):
+    """统一哈希和比较时的字段取值（枚举取值、空值归一）"""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if value == "":
+        return None
+    return value
+
+def compute_content_hash(cleaned_data: Dict) -> str:
+    """计算清洗后供应商数据的内容哈希"""
+    payload = {field: _normalize_hash_value(cleaned_data.get(field)) for field in UPSERT_FIELDS}
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
 class DataCollectionService:
     """数据采集服务类"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        mode: str = "insert",
+        entity_resolution: bool = True,
+        progress=None,
+        cursors: Optional[Dict[str, Dict]] = None
+    ):
         self.session = None
         self.collected_count = 0
         self.failed_count = 0
+        self.chunk_size = chunk_size
+        self.mode = mode
+        # 模糊实体解析：拦截名称写法不同但实为同一企业的记录
+        self.entity_resolution = entity_resolution
+        self._resolver: Optional[EntityResolver] = None
+        self._resolver_lock = threading.Lock()
+        # 各数据源最近一次入库统计: {source: {"inserted", "updated", "unchanged", "skipped", "failed", "field_changes"}}
+        self.ingest_stats: Dict[str, Dict[str, int]] = {}
+        # 采集任务进度上报（JobProgress），为空时不上报
+        self.progress = progress
+        # 增量采集：各数据源上次采集的游标；入库无失败时新游标写入 next_cursors
+        self.cursors: Dict[str, Dict] = cursors or {}
+        self.next_cursors: Dict[str, Dict] = {}
+        self.run_started_at: Optional[datetime] = None
     
-    async def collect_from_multiple_sources(self) -> Dict[str, int]:
-        """从多个数据源采集供应商信息"""
+    async def collect_from_multiple_sources(self, sources: Optional[List[str]] = None) -> Dict:
+        """从多个数据源采集供应商信息，sources 为空时采集全部数据源"""
+        self.run_started_at = datetime.utcnow()
+        collectors = {
+            "alibaba": self.collect_from_alibaba,
+            "made_in_china": self.collect_from_made_in_china,
+            "enterprise_api": self.collect_from_enterprise_api,
+            "industry_database": self.collect_from_industry_database
+        }
+        source_names = [name for name in COLLECTION_SOURCES if sources is None or name in sources]
         results = {
             "alibaba": 0,
             "made_in_china": 0,
             "enterprise_api": 0,
             "industry_database": 0,
             "total_collected": 0,
+            "total_updated": 0,
+            "total_unchanged": 0,
+            "total_skipped": 0,
             "total_failed": 0
         }
         
         # 并发采集多个数据源
-        tasks = [
-            self.collect_from_alibaba(),
-            self.collect_from_made_in_china(),
-            self.collect_from_enterprise_api(),
-            self.collect_from_industry_database()
-        ]
+        tasks = [self._run_source(name, collectors[name]) for name in source_names]
         
         results_list = await asyncio.gather(*tasks, return_exceptions=True)
         
-        for i, result in enumerate(results_list):
+        for source_name, result in zip(source_names, results_list):
             if isinstance(result, Exception):
-                logger.error(f"数据源 {i} 采集失败: {result}")
+                logger.error(f"数据源 {source_name} 采集失败: {result}")
                 results["total_failed"] += 1
             else:
-                source_names = ["alibaba", "made_in_china", "enterprise_api", "industry_database"]
-                results[source_names[i]] = result
+                results[source_name] = result
                 results["total_collected"] += result
         
+        for stats in self.ingest_stats.values():
+            results["total_updated"] += stats["updated"]
+            results["total_unchanged"] += stats["unchanged"]
+            results["total_skipped"] += stats["skipped"] + stats["fuzzy_duplicates"]
+        results["ingest_stats"] = self.ingest_stats
+        
         return results
     
+    async def _run_source(self, source: str, collect: Callable) -> int:
+        """执行单个数据源的采集并上报开始/结束状态"""
+        if self.progress is None:
+            return await collect()
+        if self.progress.cancelled:
+            self.progress.finish_source(source)
+            return 0
+        self.progress.start_source(source)
+        try:
+            return await collect()
+        except Exception as e:
+            self.progress.finish_source(source, error=str(e))
+            raise
+        finally:
+            self.progress.finish_source(source)
+    
     async def collect_from_alibaba(self) -> int:
         """从阿里巴巴采集供应商数据"""
         # 注意：这里需要遵守阿里巴巴的robots.txt和使用条款
@@ -64,19 +224,16 @@ class DataCollectionService:
         collected = 0
         try:
             # 模拟API调用（实际需要替换为真实的API或爬虫逻辑）
-            suppliers_data = await self._fetch_alibaba_suppliers()
+            await self._throttle("alibaba")
+            suppliers_data = await self._fetch_alibaba_suppliers(since=self.cursor_since("alibaba"))
             
-            db = SessionLocal()
-            try:
-                for supplier_data in suppliers_data:
-                    if await self._save_supplier_if_not_exists(db, supplier_data):
-                        collected += 1
-                db.commit()
-            finally:
-                db.close()
-                
+            stats = await self._ingest_source("alibaba", suppliers_data)
+            collected = stats["inserted"]
+
         except Exception as e:
             logger.error(f"阿里巴巴数据采集失败: {e}")
+            if self.progress:
+                self.progress.finish_source("alibaba", error=str(e))
             
         return collected
     
@@ -84,19 +241,16 @@ class DataCollectionService:
         """从中国制造网采集供应商数据"""
         collected = 0
         try:
-            suppliers_data = await self._fetch_made_in_china_suppliers()
+            await self._throttle("made_in_china")
+            suppliers_data = await self._fetch_made_in_china_suppliers(since=self.cursor_since("made_in_china"))
             
-            db = SessionLocal()
-            try:
-                for supplier_data in suppliers_data:
-                    if await self._save_supplier_if_not_exists(db, supplier_data):
-                        collected += 1
-                db.commit()
-            finally:
-                db.close()
-                
+            stats = await self._ingest_source("made_in_china", suppliers_data)
+            collected = stats["inserted"]
+
         except Exception as e:
             logger.error(f"中国制造网数据采集失败: {e}")
+            if self.progress:
+                self.progress.finish_source("made_in_china", error=str(e))
             
         return collected
     
@@ -105,19 +259,16 @@ class DataCollectionService:
         collected = 0
         try:
             # 使用企查查、天眼查等API
-            suppliers_data = await self._fetch_enterprise_api_data()
+            await self._throttle("enterprise_api")
+            suppliers_data = await self._fetch_enterprise_api_data(since=self.cursor_since("enterprise_api"))
             
-            db = SessionLocal()
-            try:
-                for supplier_data in suppliers_data:
-                    if await self._save_supplier_if_not_exists(db, supplier_data):
-                        collected += 1
-                db.commit()
-            finally:
-                db.close()
-                
+            stats = await self._ingest_source("enterprise_api", suppliers_data)
+            collected = stats["inserted"]
+
         except Exception as e:
             logger.error(f"企业API数据采集失败: {e}")
+            if self.progress:
+                self.progress.finish_source("enterprise_api", error=str(e))
             
         return collected
     
@@ -126,25 +277,23 @@ class DataCollectionService:
         collected = 0
         try:
             # 从半导体行业协会、展会数据库等采集
-            suppliers_data = await self._fetch_industry_database()
+            await self._throttle("industry_database")
+            suppliers_data = await self._fetch_industry_database(since=self.cursor_since("industry_database"))
             
-            db = SessionLocal()
-            try:
-                for supplier_data in suppliers_data:
-                    if await self._save_supplier_if_not_exists(db, supplier_data):
-                        collected += 1
-                db.commit()
-            finally:
-                db.close()
-                
+            stats = await self._ingest_source("industry_database", suppliers_data)
+            collected = stats["inserted"]
+
         except Exception as e:
             logger.error(f"行业数据库采集失败: {e}")
+            if self.progress:
+                self.progress.finish_source("industry_database", error=str(e))
             
         return collected
     
-    async def _fetch_alibaba_suppliers(self) -> List[Dict]:
-        """获取阿里巴巴供应商数据"""
+    async def _fetch_alibaba_suppliers(self, since: Optional[datetime] = None) -> List[Dict]:
+        """获取阿里巴巴供应商数据，since 不为空时只获取此后更新的记录"""
         # 这里应该实现真实的API调用或合规的数据获取方式
+        # 增量采集时把 since 作为更新时间过滤参数传给接口；返回记录的 source_updated_at 用于推进游标
         # 示例数据结构
         return [
             {
@@ -164,21 +313,334 @@ class DataCollectionService:
             }
         ]
     
-    async def _fetch_made_in_china_suppliers(self) -> List[Dict]:
-        """获取中国制造网供应商数据"""
+    async def _fetch_made_in_china_suppliers(self, since: Optional[datetime] = None) -> List[Dict]:
+        """获取中国制造网供应商数据，since 不为空时只获取此后更新的记录"""
         # 实现中国制造网数据获取逻辑
         return []
     
-    async def _fetch_enterprise_api_data(self) -> List[Dict]:
-        """获取企业API数据"""
+    async def _fetch_enterprise_api_data(self, since: Optional[datetime] = None) -> List[Dict]:
+        """获取企业API数据，since 不为空时只获取此后变更的企业"""
         # 实现企查查、天眼查等API调用
         return []
     
-    async def _fetch_industry_database(self) -> List[Dict]:
-        """获取行业数据库数据"""
+    async def _fetch_industry_database(self, since: Optional[datetime] = None) -> List[Dict]:
+        """获取行业数据库数据，since 不为空时只获取此后更新的记录"""
         # 实现行业数据库数据获取
         return []
     
+    async def _throttle(self, source: str):
+        """按数据源的限流配置等待，每次向数据源发起请求前调用"""
+        if source in DATA_SOURCES:
+            await get_source_rate_limiter(source).acquire()
+    
+    def cursor_since(self, source: str) -> Optional[datetime]:
+        """数据源增量游标的时间点，无游标时返回None（全量采集）"""
+        return _parse_timestamp((self.cursors.get(source) or {}).get("updated_since"))
+    
+    def _apply_cursor(self, source: str, suppliers_data: List[Dict]) -> Tuple[List[Dict], Optional[Dict]]:
+        """
+        过滤掉游标之前已采集过的记录（数据源不支持按时间过滤时兜底），并计算新的游标：
+        记录带 source_updated_at 时取其最大值，否则取本次采集的开始时间
+        返回: (需要入库的记录, 新游标)；新游标须在这些记录全部入库成功后才能推进
+        """
+        since = self.cursor_since(source)
+        high_water = since
+        has_timestamps = False
+        changed = []
+        for supplier_data in suppliers_data:
+            updated_at = _parse_timestamp(supplier_data.get("source_updated_at"))
+            if updated_at is not None:
+                has_timestamps = True
+                if since is not None and updated_at <= since:
+                    continue
+                if high_water is None or updated_at > high_water:
+                    high_water = updated_at
+            changed.append(supplier_data)
+        
+        if not has_timestamps:
+            high_water = self.run_started_at or datetime.utcnow()
+        next_cursor = {"updated_since": high_water.isoformat()} if high_water is not None else None
+        if len(changed) < len(suppliers_data):
+            logger.info(f"数据源 {source} 跳过 {len(suppliers_data) - len(changed)} 条游标之前的记录")
+        return changed, next_cursor
+    
+    async def _ingest_source(self, source: str, suppliers_data: List[Dict]) -> Dict:
+        """在线程中批量入库某个数据源的记录，避免阻塞事件循环"""
+        suppliers_data, next_cursor = self._apply_cursor(source, suppliers_data)
+        on_chunk = None
+        if self.progress:
+            self.progress.add(source, fetched=len(suppliers_data))
+            self.progress.set_total(source, len(suppliers_data))
+            
+            def on_chunk(chunk_stats: Dict) -> bool:
+                self.progress.add(source, cleaned=chunk_stats["records"] - chunk_stats["failed"])
+                self.progress.record_ingest(source, chunk_stats)
+                return not self.progress.cancelled
+        
+        def run() -> Dict:
+            db = SessionLocal()
+            try:
+                return self.bulk_save_suppliers(db, suppliers_data, on_chunk=on_chunk)
+            finally:
+                db.close()
+        
+        stats = await asyncio.to_thread(run)
+        self.ingest_stats[source] = stats
+        # 有批次入库失败时不推进游标，否则失败批次中的记录在之后的增量采集中都会被跳过
+        if stats["failed"]:
+            logger.warning(f"数据源 {source} 有 {stats['failed']} 条记录入库失败，保留原增量游标")
+        elif next_cursor is not None:
+            self.next_cursors[source] = next_cursor
+        logger.info(
+            f"数据源 {source} 入库完成: 新增 {stats['inserted']} 条, 更新 {stats['updated']} 条, "
+            f"未变化 {stats['unchanged']} 条, 跳过 {stats['skipped']} 条, "
+            f"疑似重复 {stats['fuzzy_duplicates']} 条, 失败 {stats['failed']} 条"
+        )
+        return stats
+    
+    def bulk_save_suppliers(
+        self,
+        db: Session,
+        suppliers_data: Iterable[Dict],
+        chunk_size: Optional[int] = None,
+        mode: Optional[str] = None,
+        on_chunk: Optional[Callable[[Dict], bool]] = None,
+        cleaned: bool = False
+    ) -> Dict:
+        """
+        批量保存供应商数据（按 company_name + country 去重）
+        每个批次一次查询已存在的键、批次内去重、executemany插入并提交
+        mode="insert" 时跳过已存在的记录；mode="upsert" 时仅更新内容哈希发生变化的记录
+        开启实体解析时，与已有企业模糊匹配的新记录计入 fuzzy_duplicates 并跳过
+        on_chunk 在每个批次提交后以该批次的统计（含记录数 records）调用，返回False时停止处理后续批次
+        cleaned=True 表示数据已由 DataCleaner.clean_supplier_data 清洗，只转换为入库字段、不再重新清洗
+        返回: {"inserted", "updated", "unchanged", "skipped", "fuzzy_duplicates", "failed", "field_changes"}
+        """
+        chunk_size = chunk_size or self.chunk_size
+        mode = mode or self.mode
+        if mode not in COLLECTION_MODES:
+            raise ValueError(f"不支持的入库模式: {mode}")
+        
+        stats = {
+            "inserted": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "skipped": 0,
+            "fuzzy_duplicates": 0,
+            "failed": 0,
+            "field_changes": {}
+        }
+        
+        def save(chunk: List[Dict]) -> bool:
+            if on_chunk is None:
+                self._save_chunk(db, chunk, stats, mode, cleaned)
+                return True
+            before = {field: stats[field] for field in INGEST_COUNT_FIELDS}
+            self._save_chunk(db, chunk, stats, mode, cleaned)
+            chunk_stats = {field: stats[field] - before[field] for field in INGEST_COUNT_FIELDS}
+            chunk_stats["records"] = len(chunk)
+            return on_chunk(chunk_stats) is not False
+        
+        chunk: List[Dict] = []
+        for supplier_data in suppliers_data:
+            chunk.append(supplier_data)
+            if len(chunk) >= chunk_size:
+                if not save(chunk):
+                    logger.info("批量入库已取消")
+                    return stats
+                chunk = []
+        if chunk:
+            save(chunk)
+        
+        return stats
+    
+    def _save_chunk(self, db: Session, chunk: List[Dict], stats: Dict, mode: str, cleaned: bool = False):
+        """清洗、去重并写入一个批次"""
+        prepare = self._prepare_cleaned_supplier if cleaned else self._clean_supplier_data
+        rows: Dict[Tuple[str, str], Dict] = {}
+        for supplier_data in chunk:
+            try:
+                cleaned_data = prepare(supplier_data)
+            except Exception as e:
+                logger.error(f"清洗供应商数据失败: {e}")
+                stats["failed"] += 1
+                continue
+            
+            key = (cleaned_data["company_name"], cleaned_data["country"])
+            if not key[0] or not key[1]:
+                stats["failed"] += 1
+                continue
+            if key in rows:
+                # 批次内重复
+                stats["skipped"] += 1
+                continue
+            cleaned_data["content_hash"] = compute_content_hash(cleaned_data)
+            rows[key] = cleaned_data
+        
+        if not rows:
+            return
+        
+        try:
+            existing = self._existing_supplier_hashes(db, list(rows))
+            new_rows = [row for key, row in rows.items() if key not in existing]
+            fuzzy_duplicates = 0
+            if self.entity_resolution and new_rows:
+                unique_rows = self._filter_fuzzy_duplicates(db, new_rows)
+                fuzzy_duplicates = len(new_rows) - len(unique_rows)
+                new_rows = unique_rows
+            if new_rows:
+                db.execute(insert(Supplier), new_rows)
+                self._sync_new_supplier_tags(db, new_rows)
+            
+            updated = 0
+            field_changes: Dict[str, int] = {}
+            if mode == "upsert":
+                changed = {
+                    existing[key][0]: row for key, row in rows.items()
+                    if key in existing and existing[key][1] != row["content_hash"]
+                }
+                if changed:
+                    updated, field_changes = self._update_changed_suppliers(db, changed)
+                # 哈希不同但字段都未变化的记录（迁移前 content_hash 为空、哈希字段调整）只回填哈希，计为未变化
+                stats["unchanged"] += len(rows) - len(new_rows) - fuzzy_duplicates - updated
+            else:
+                stats["skipped"] += len(rows) - len(new_rows) - fuzzy_duplicates
+            
+            db.commit()
+            if self.entity_resolution:
+                self._index_committed_rows(new_rows)
+            stats["inserted"] += len(new_rows)
+            stats["fuzzy_duplicates"] += fuzzy_duplicates
+            stats["updated"] += updated
+            for field, count in field_changes.items():
+                stats["field_changes"][field] = stats["field_changes"].get(field, 0) + count
+        except Exception as e:
+            db.rollback()
+            logger.error(f"批量保存供应商数据失败: {e}")
+            stats["failed"] += len(rows)
+    
+    def _get_resolver(self, db: Session) -> EntityResolver:
+        """首次使用时用库中已有供应商构建实体解析索引"""
+        if self._resolver is None:
+            resolver = EntityResolver()
+            existing = db.query(
+                Supplier.id, Supplier.company_name, Supplier.company_name_en, Supplier.country,
+                Supplier.website, Supplier.email, Supplier.phone
+            ).filter(Supplier.is_active == True).yield_per(self.chunk_size)
+            for row in existing:
+                resolver.add(row.id, row._asdict())
+            self._resolver = resolver
+        return self._resolver
+    
+    def _filter_fuzzy_duplicates(self, db: Session, new_rows: List[Dict]) -> List[Dict]:
+        """
+        在线查重：剔除与已有企业或本批次中已保留的记录模糊匹配的记录
+        保留的记录在批次提交成功后才由 _index_committed_rows 加入索引
+        """
+        with self._resolver_lock:
+            resolver = self._get_resolver(db)
+            batch_resolver = EntityResolver(threshold=resolver.threshold)
+            unique_rows = []
+            for row in new_rows:
+                key = (row["company_name"], row["country"])
+                match = resolver.match(row, record_id=key) or batch_resolver.match(row, record_id=key)
+                if match:
+                    logger.info(f"疑似重复企业: {row['company_name']} ≈ 记录 {match[0]} (相似度 {match[1]:.2f})")
+                    continue
+                batch_resolver.add(key, row)
+                unique_rows.append(row)
+            return unique_rows
+    
+    def _index_committed_rows(self, rows: List[Dict]):
+        """将已提交入库的新记录加入实体解析索引（回滚的批次不会留在索引中）"""
+        if self._resolver is None or not rows:
+            return
+        with self._resolver_lock:
+            for row in rows:
+                self._resolver.add((row["company_name"], row["country"]), row)
+    
+    @staticmethod
+    def _existing_supplier_hashes(db: Session, keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Tuple[int, Optional[str]]]:
+        """一次查询返回已存在记录: {(company_name, country): (id, content_hash)}"""
+        found = db.query(
+            Supplier.company_name, Supplier.country, Supplier.id, Supplier.content_hash
+        ).filter(
+            tuple_(Supplier.company_name, Supplier.country).in_(keys)
+        ).all()
+        return {(name, country): (supplier_id, content_hash) for name, country, supplier_id, content_hash in found}
+    
+    @staticmethod
+    def _sync_new_supplier_tags(db: Session, new_rows: List[Dict]):
+        """为刚批量插入的记录写入标签索引（executemany不返回主键，按唯一键查回ID）"""
+        ids = DataCollectionService._existing_supplier_hashes(
+            db, [(row["company_name"], row["country"]) for row in new_rows]
+        )
+        TagService.sync_entities(db, "supplier", {
+            ids[(row["company_name"], row["country"])][0]: {field: row.get(field) for field in SUPPLIER_TAG_FIELDS}
+            for row in new_rows
+            if (row["company_name"], row["country"]) in ids
+        })
+    
+    @staticmethod
+    def _update_changed_suppliers(db: Session, changed: Dict[int, Dict]) -> Tuple[int, Dict[str, int]]:
+        """
+        对内容哈希变化的记录按主键批量UPDATE，仅写入实际变化的字段
+        字段都未变化的记录（库中哈希为空或按旧字段计算）只回填 content_hash，不计入更新数
+        返回: (实际有字段变化的记录数, {字段: 变化次数})
+        """
+        columns = [getattr(Supplier, field) for field in UPSERT_FIELDS]
+        current_rows = db.query(
+            Supplier.id, Supplier.is_active, Supplier.updated_at, *columns
+        ).filter(Supplier.id.in_(list(changed))).all()
+        
+        field_changes: Dict[str, int] = {}
+        params_by_fields: Dict[Tuple[str, ...], List[Dict]] = {}
+        hash_only: List[Dict] = []
+        now = datetime.utcnow()
+        for current in current_rows:
+            row = changed[current.id]
+            diff = [
+                field for field in UPSERT_FIELDS
+                if _normalize_hash_value(getattr(current, field)) != _normalize_hash_value(row.get(field))
+            ]
+            if not diff:
+                hash_only.append({
+                    "supplier_id": current.id, "new_hash": row["content_hash"], "kept_updated_at": current.updated_at
+                })
+                continue
+            for field in diff:
+                field_changes[field] = field_changes.get(field, 0) + 1
+            
+            # 相同字段组合的记录合并为一次executemany
+            params = {field: row.get(field) for field in diff}
+            params.update(id=current.id, content_hash=row["content_hash"], updated_at=now)
+            params_by_fields.setdefault(tuple(diff), []).append(params)
+        
+        for params in params_by_fields.values():
+            db.execute(update(Supplier), params)
+        if hash_only:
+            # 只回填哈希：显式写回原 updated_at（不触发 onupdate），
+            # 并直接在连接上执行，不经过会话的 do_orm_execute，数据未变不递增版本号
+            table = Supplier.__table__
+            db.connection().execute(
+                update(table)
+                .where(table.c.id == bindparam("supplier_id"))
+                .values(content_hash=bindparam("new_hash"), updated_at=bindparam("kept_updated_at")),
+                hash_only
+            )
+        
+        # 标签类字段有变化的有效记录同步更新标签索引（软删除的记录不保留标签关联）
+        active_ids = {current.id for current in current_rows if current.is_active}
+        tag_values = {}
+        for params in (params for group in params_by_fields.values() for params in group):
+            changed_tags = {field: params[field] for field in SUPPLIER_TAG_FIELDS if field in params}
+            if changed_tags and params["id"] in active_ids:
+                tag_values[params["id"]] = changed_tags
+        if tag_values:
+            TagService.sync_entities(db, "supplier", tag_values)
+        
+        return sum(len(params) for params in params_by_fields.values()), field_changes
+    
     async def _save_supplier_if_not_exists(self, db: Session, supplier_data: Dict) -> bool:
         """保存供应商数据（如果不存在）"""
         try:
@@ -193,10 +655,13 @@ class DataCollectionService:
             
             # 数据清洗和标准化
             cleaned_data = self._clean_supplier_data(supplier_data)
+            cleaned_data["content_hash"] = compute_content_hash(cleaned_data)
             
             # 创建供应商记录
             supplier = Supplier(**cleaned_data)
             db.add(supplier)
+            db.flush()
+            TagService.sync_entity(db, "supplier", supplier)
             
             return True
             
@@ -220,6 +685,7 @@ class DataCollectionService:
         cleaned["country"] = raw_data.get("country", "").strip()
         cleaned["province"] = raw_data.get("province", "").strip()
         cleaned["city"] = raw_data.get("city", "").strip()
+        cleaned["address"] = raw_data.get("address", "").strip()
         
         # 企业类型标准化
         supplier_type_map = {
@@ -237,7 +703,7 @@ class DataCollectionService:
         cleaned["supplier_type"] = supplier_type_map.get(raw_type, SupplierType.MANUFACTURER)
         
         # 企业规模判断
-        employee_count = raw_data.get("employee_count", 0)
+        employee_count = raw_data.get("employee_count") or 0
         if employee_count >= 1000:
             cleaned["scale"] = SupplierScale.LARGE
         elif employee_count >= 100:
@@ -254,6 +720,12 @@ class DataCollectionService:
         else:
             cleaned["main_products"] = str(main_products)
         
+        product_categories = raw_data.get("product_categories", [])
+        if isinstance(product_categories, list):
+            cleaned["product_categories"] = json.dumps(product_categories, ensure_ascii=False)
+        else:
+            cleaned["product_categories"] = str(product_categories)
+        
         # 其他字段
         cleaned["established_year"] = raw_data.get("established_year")
         cleaned["employee_count"] = raw_data.get("employee_count", 0)
@@ -264,11 +736,30 @@ class DataCollectionService:
         cleaned["is_featured"] = False
         
         return cleaned
+    
+    @staticmethod
+    def _prepare_cleaned_supplier(cleaned_data: Dict) -> Dict:
+        """把 DataCleaner 的清洗结果转换为入库字段（保留其规模判断和地址等字段，不再重新清洗）"""
+        row = {field: cleaned_data.get(field) for field in CLEANED_COLUMNS}
+        row["supplier_type"] = SupplierType(row["supplier_type"])
+        row["scale"] = SupplierScale(row["scale"])
+        
+        product_categories = cleaned_data.get("product_categories", [])
+        if isinstance(product_categories, list):
+            row["product_categories"] = json.dumps(product_categories, ensure_ascii=False)
+        else:
+            row["product_categories"] = str(product_categories)
+        
+        row["certification_level"] = CertificationLevel.UNVERIFIED
+        row["is_active"] = True
+        row["is_verified"] = False
+        row["is_featured"] = False
+        return row
 
 # 使用示例
-async def run_data_collection():
+async def run_data_collection(mode: str = "insert"):
     """运行数据采集任务"""
-    collector = DataCollectionService()
+    collector = DataCollectionService(mode=mode)
     results = await collector.collect_from_multiple_sources()
     
     print("数据采集完成:")
@@ -277,7 +768,11 @@ async def run_data_collection():
     print(f"企业API: {results['enterprise_api']} 条")
     print(f"行业数据库: {results['industry_database']} 条")
     print(f"总计采集: {results['total_collected']} 条")
-    print(f"失败: {results['total_failed']} 条")
+    print(f"更新: {results['total_updated']} 条")
+    print(f"未变化: {results['total_unchanged']} 条")
+    print(f"重复跳过: {results['total_skipped']} 条")
+    print(f"失败数据源: {results['total_failed']} 个")
 
 if __name__ == "__main__":
-    asyncio.run(run_data_collection())
+    import sys
+    asyncio.run(run_data_collection("upsert" if "--upsert" in sys.argv else "insert"))
@@ -0,0 +1,162 @@
+"""
+业务域数据版本号
+会话提交时，若本次事务写入了某个业务域的数据（ORM对象增删改，或 insert/update/delete 批量语句），
+随同提交把该域的版本号加一；读接口据此生成ETag，版本未变时直接返回304而不必执行查询。
+
+- 只有浏览次数变化的更新（详情页计数）不会使版本号变化，对应的ETag为弱校验器
+- 版本号在最外层事务提交前于同一连接上更新，与业务数据一起提交（写事务在提交前短暂持有版本行的锁）
+- 其他模块可通过 DataVersionService.add_commit_listener 订阅域数据变更（如缓存失效）
+"""
+from typing import Callable, Dict, Iterable, List, Set
+import logging
+
+from sqlalchemy import event, inspect, select, update, func, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.data_version import DataVersion
+from app.models.supplier import Supplier
+from app.models.policy import Policy
+from app.models.market_intelligence import MarketIntelligence, IntelligenceComment, IntelligenceView
+from app.models.compliance_tool import ComplianceTool, ToolUsageLog, ToolReview, ComplianceRegulation
+from app.models.community import (
+    CommunityPost, CommunityComment, CommunityLike, CommunityCommentLike,
+    CommunityFavorite, CommunityCategory, CommunityReport, CommunityExpert
+)
+from app.models.marketplace import (
+    MarketplaceListing, MarketplaceInquiry, MarketplaceFavorite, MarketplaceCategory, MarketplaceReport
+)
+
+logger = logging.getLogger(__name__)
+
+# 业务域 -> 影响该域公开读接口的模型
+DOMAIN_MODELS = {
+    "supplier": (Supplier,),
+    "policy": (Policy,),
+    "market": (MarketIntelligence, IntelligenceComment, IntelligenceView),
+    "compliance": (ComplianceTool, ToolUsageLog, ToolReview, ComplianceRegulation),
+    "community": (
+        CommunityPost, CommunityComment, CommunityLike, CommunityCommentLike,
+        CommunityFavorite, CommunityCategory, CommunityReport, CommunityExpert
+    ),
+    "marketplace": (
+        MarketplaceListing, MarketplaceInquiry, MarketplaceFavorite, MarketplaceCategory, MarketplaceReport
+    ),
+}
+
+MODEL_DOMAINS = {model: domain for domain, models in DOMAIN_MODELS.items() for model in models}
+
+# 只有这些字段变化时不视为数据变更
+IGNORED_ATTRIBUTES = frozenset({"view_count", "updated_at"})
+
+_PENDING_DOMAINS = "data_version_domains"
+
+# 提交后以变更的业务域集合调用的回调（缓存失效等）
+_commit_listeners: List[Callable[[Set[str]], None]] = []
+
+
+def _has_significant_changes(obj) -> bool:
+    state = inspect(obj)
+    return any(
+        attr.history.has_changes()
+        for attr in state.attrs
+        if attr.key not in IGNORED_ATTRIBUTES
+    )
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _collect_flushed_domains(session: Session, flush_context):
+    # after_flush 时 new/dirty/deleted 和属性历史仍是flush前的状态
+    domains: Set[str] = session.info.setdefault(_PENDING_DOMAINS, set())
+    for obj in list(session.new) + list(session.deleted):
+        domain = MODEL_DOMAINS.get(type(obj))
+        if domain:
+            domains.add(domain)
+    for obj in session.dirty:
+        domain = MODEL_DOMAINS.get(type(obj))
+        if domain and domain not in domains and _has_significant_changes(obj):
+            domains.add(domain)
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _collect_statement_domains(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    domain = MODEL_DOMAINS.get(mapper.class_) if mapper is not None else None
+    if domain:
+        orm_execute_state.session.info.setdefault(_PENDING_DOMAINS, set()).add(domain)
+
+
+@event.listens_for(SessionLocal, "before_commit")
+def _bump_pending_domains(session: Session):
+    # 保存点（begin_nested）提交时不处理，只在最外层事务提交前执行
+    if session.in_nested_transaction():
+        return
+    # 先flush，使本次提交的全部写入都已收集
+    session.flush()
+    domains = session.info.get(_PENDING_DOMAINS)
+    if domains:
+        # 在业务事务的连接上更新版本号，与数据同时提交；失败时整个提交失败，避免版本号漏更新
+        DataVersionService.bump(session.connection(), domains)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _notify_committed_domains(session: Session):
+    if session.in_nested_transaction():
+        return
+    domains = session.info.pop(_PENDING_DOMAINS, None)
+    if not domains:
+        return
+    for listener in _commit_listeners:
+        try:
+            listener(domains)
+        except Exception as e:
+            logger.error(f"数据变更回调执行失败 {sorted(domains)}: {e}")
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_pending_domains(session: Session):
+    session.info.pop(_PENDING_DOMAINS, None)
+
+
+class DataVersionService:
+    """数据版本号服务类"""
+
+    @staticmethod
+    def add_commit_listener(listener: Callable[[Set[str]], None]):
+        """注册业务域数据变更回调，在写入该域的事务提交后以域名集合调用"""
+        if listener not in _commit_listeners:
+            _commit_listeners.append(listener)
+
+    @staticmethod
+    def get_versions(db: Session, domains: Iterable[str]) -> Dict[str, int]:
+        """返回各域当前版本号（尚无写入记录的域为0）"""
+        domains = list(domains)
+        versions = {domain: 0 for domain in domains}
+        for domain, version in db.execute(
+            select(DataVersion.domain, DataVersion.version).where(DataVersion.domain.in_(domains))
+        ):
+            versions[domain] = version
+        return versions
+
+    @staticmethod
+    def bump(conn: Connection, domains: Iterable[str]):
+        """在给定连接的当前事务中把各域版本号加一，版本行不存在时创建"""
+        table = DataVersion.__table__
+        for domain in sorted(set(domains)):
+            increment = (
+                update(table)
+                .where(table.c.domain == domain)
+                .values(version=table.c.version + 1, updated_at=func.now())
+            )
+            if conn.execute(increment).rowcount:
+                continue
+            try:
+                with conn.begin_nested():
+                    conn.execute(insert(table).values(domain=domain, version=1))
+            except IntegrityError:
+                # 并发创建，改为累加
+                conn.execute(increment)
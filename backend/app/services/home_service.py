@@ -0,0 +1,127 @@
+"""
+首页聚合快照
+把首页需要的推荐供应商、最新/高影响政策、热门情报、推荐工具、热门帖子、最新交易信息和各板块统计
+预先组装成一份JSON，存入缓存后端，首页接口直接返回缓存中的字节。
+
+- 任一业务域数据提交后（DataVersionService 提交回调）安排一次后台重建，
+  HOME_SNAPSHOT_DEBOUNCE 秒内的多次变更合并为一次重建
+- 快照最长保留 HOME_SNAPSHOT_MAX_AGE 秒，过期后由下一个请求重建（兜底其他进程的写入和随时间变化的统计）
+"""
+from typing import Optional, Set
+from datetime import datetime
+import logging
+import threading
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import get_cache_backend
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.schemas.home import HomeSnapshot
+from app.services.data_version_service import DataVersionService, DOMAIN_MODELS
+from app.services.supplier_service import SupplierService
+from app.services.policy_service import PolicyService
+from app.services.market_intelligence_service import MarketIntelligenceService
+from app.services.compliance_tool_service import ComplianceToolService
+from app.services.community_service import CommunityService
+from app.services.marketplace_service import MarketplaceService
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_KEY = "home:snapshot"
+
+# 首页展示的业务域
+HOME_DOMAINS = frozenset(DOMAIN_MODELS)
+
+# 各板块条数
+FEATURED_SUPPLIERS_LIMIT = 8
+RECENT_POLICIES_LIMIT = 5
+HIGH_IMPACT_POLICIES_LIMIT = 5
+TRENDING_INTELLIGENCE_LIMIT = 6
+FEATURED_TOOLS_LIMIT = 6
+HOT_POSTS_LIMIT = 8
+LATEST_LISTINGS_LIMIT = 8
+
+_rebuild_lock = threading.Lock()
+_rebuild_timer: Optional[threading.Timer] = None
+
+
+class HomeService:
+    """首页快照服务类"""
+
+    @staticmethod
+    def build_snapshot(db: Session) -> HomeSnapshot:
+        """查询各板块数据组装快照"""
+        return HomeSnapshot.model_validate(
+            {
+                "featured_suppliers": SupplierService.get_featured_suppliers(db, FEATURED_SUPPLIERS_LIMIT),
+                "recent_policies": PolicyService.get_recent_policies(db, RECENT_POLICIES_LIMIT),
+                "high_impact_policies": PolicyService.get_high_impact_policies(db, HIGH_IMPACT_POLICIES_LIMIT),
+                "trending_intelligence": MarketIntelligenceService.get_trending_intelligence(
+                    db, TRENDING_INTELLIGENCE_LIMIT
+                ),
+                "featured_tools": ComplianceToolService.get_featured_tools(db, FEATURED_TOOLS_LIMIT),
+                "hot_posts": CommunityService.get_hot_posts(db, HOT_POSTS_LIMIT),
+                "latest_listings": MarketplaceService.get_latest_listings(db, LATEST_LISTINGS_LIMIT),
+                "stats": {
+                    "suppliers": SupplierService.get_supplier_stats(db),
+                    "policies": PolicyService.get_policy_stats(db),
+                    "market": MarketIntelligenceService.get_intelligence_stats(db),
+                    "compliance": ComplianceToolService.get_tool_stats(db),
+                    "community": CommunityService.get_community_stats(db),
+                    "marketplace": MarketplaceService.get_marketplace_stats(db),
+                },
+                "generated_at": datetime.utcnow(),
+            },
+            from_attributes=True,
+        )
+
+    @staticmethod
+    def rebuild() -> bytes:
+        """用独立会话重建快照并写入缓存，返回快照JSON"""
+        db = SessionLocal()
+        try:
+            payload = HomeService.build_snapshot(db).model_dump_json().encode("utf-8")
+        finally:
+            db.close()
+        try:
+            get_cache_backend().set(SNAPSHOT_KEY, payload, settings.HOME_SNAPSHOT_MAX_AGE)
+        except Exception as e:
+            logger.error(f"写入首页快照失败: {e}")
+        return payload
+
+    @staticmethod
+    def get_snapshot() -> Optional[bytes]:
+        """读取缓存中的快照JSON，不存在或已过期时返回 None"""
+        try:
+            return get_cache_backend().get(SNAPSHOT_KEY)
+        except Exception as e:
+            logger.error(f"读取首页快照失败: {e}")
+            return None
+
+    @staticmethod
+    def schedule_rebuild(domains: Set[str]):
+        """数据变更后安排一次后台重建；已有待执行的重建时合并到该次重建"""
+        global _rebuild_timer
+        if not set(domains) & HOME_DOMAINS:
+            return
+        with _rebuild_lock:
+            if _rebuild_timer is not None:
+                return
+            _rebuild_timer = threading.Timer(settings.HOME_SNAPSHOT_DEBOUNCE, _run_scheduled_rebuild)
+            _rebuild_timer.daemon = True
+            _rebuild_timer.start()
+
+
+def _run_scheduled_rebuild():
+    global _rebuild_timer
+    # 先清除定时器，重建期间发生的变更会安排下一次重建
+    with _rebuild_lock:
+        _rebuild_timer = None
+    try:
+        HomeService.rebuild()
+    except Exception as e:
+        logger.error(f"重建首页快照失败: {e}")
+
+
+DataVersionService.add_commit_listener(HomeService.schedule_rebuild)
@@ -1,4 +1,4 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, Query
 from sqlalchemy import desc, asc, func, and_, or_
 from typing import List, Optional, Dict, Any
 from datetime import datetime
@@ -11,6 +11,11 @@ from app.schemas.market_intelligence import (
     MarketIntelligenceCreate, MarketIntelligenceUpdate, MarketIntelligenceQuery,
     MarketIntelligenceStats, IntelligenceCommentCreate, IntelligenceViewCreate
 )
+from app.services.tag_service import TagService
+from app.schemas.market_intelligence import MarketIntelligence as MarketIntelligenceSchema
+from app.core.cache import cached
+
+TAG_ENTITY_TYPE = "market_intelligence"
 
 class MarketIntelligenceService:
     
@@ -26,18 +31,21 @@ class MarketIntelligenceService:
             created_by=created_by
         )
         db.add(db_intelligence)
+        db.flush()
+        TagService.sync_entity(db, TAG_ENTITY_TYPE, db_intelligence)
         db.commit()
         db.refresh(db_intelligence)
         return db_intelligence
     
     @staticmethod
-    def get_intelligence_by_id(db: Session, intelligence_id: int) -> Optional[MarketIntelligence]:
+    @cached("market", MarketIntelligenceSchema)
+    def get_intelligence_by_id(db: Session, intelligence_id: int) -> Optional[MarketIntelligenceSchema]:
         """根据ID获取市场情报"""
         return db.query(MarketIntelligence).filter(MarketIntelligence.id == intelligence_id).first()
     
     @staticmethod
-    def get_intelligence_list(db: Session, query: MarketIntelligenceQuery) -> List[MarketIntelligence]:
-        """获取市场情报列表"""
+    def build_intelligence_query(db: Session, query: MarketIntelligenceQuery) -> Query:
+        """构建市场情报列表查询（已应用过滤、排序和分页）"""
         db_query = db.query(MarketIntelligence)
         
         # 应用过滤条件
@@ -53,6 +61,9 @@ class MarketIntelligenceService:
         if query.region:
             db_query = db_query.filter(MarketIntelligence.region == query.region)
         
+        if query.tag:
+            db_query = db_query.filter(TagService.has_tag(TAG_ENTITY_TYPE, MarketIntelligence.id, query.tag))
+        
         if query.keyword:
             keyword_filter = or_(
                 MarketIntelligence.title.contains(query.keyword),
@@ -89,7 +100,12 @@ class MarketIntelligenceService:
             db_query = db_query.order_by(asc(getattr(MarketIntelligence, query.sort_by)))
         
         # 分页
-        return db_query.offset(query.skip).limit(query.limit).all()
+        return db_query.offset(query.skip).limit(query.limit)
+    
+    @staticmethod
+    def get_intelligence_list(db: Session, query: MarketIntelligenceQuery) -> List[MarketIntelligence]:
+        """获取市场情报列表"""
+        return MarketIntelligenceService.build_intelligence_query(db, query).all()
     
     @staticmethod
     def update_intelligence(
@@ -107,6 +123,7 @@ class MarketIntelligenceService:
         update_data = intelligence_update.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_intelligence, field, value)
+        TagService.sync_entity(db, TAG_ENTITY_TYPE, db_intelligence, update_data.keys())
         
         db_intelligence.updated_at = datetime.utcnow()
         db.commit()
@@ -122,6 +139,7 @@ class MarketIntelligenceService:
         if not db_intelligence:
             return False
         
+        TagService.remove_entity(db, TAG_ENTITY_TYPE, db_intelligence.id)
         db.delete(db_intelligence)
         db.commit()
         return True
@@ -208,7 +226,8 @@ class MarketIntelligenceService:
         )
     
     @staticmethod
-    def get_featured_intelligence(db: Session, limit: int = 10) -> List[MarketIntelligence]:
+    @cached("market", List[MarketIntelligenceSchema])
+    def get_featured_intelligence(db: Session, limit: int = 10) -> List[MarketIntelligenceSchema]:
         """获取精选市场情报"""
         return db.query(MarketIntelligence).filter(
             MarketIntelligence.is_featured == True,
@@ -224,12 +243,18 @@ class MarketIntelligenceService:
         ).order_by(desc(MarketIntelligence.view_count)).limit(limit).all()
     
     @staticmethod
-    def get_latest_intelligence(db: Session, limit: int = 10) -> List[MarketIntelligence]:
+    @cached("market", List[MarketIntelligenceSchema])
+    def get_latest_intelligence(db: Session, limit: int = 10) -> List[MarketIntelligenceSchema]:
         """获取最新市场情报"""
         return db.query(MarketIntelligence).filter(
             MarketIntelligence.status == IntelligenceStatus.PUBLISHED
         ).order_by(desc(MarketIntelligence.published_at)).limit(limit).all()
     
+    @staticmethod
+    def get_popular_tags(db: Session, limit: int = 20) -> List[Dict[str, Any]]:
+        """获取热门标签及对应的情报数"""
+        return TagService.get_popular_tags(db, TAG_ENTITY_TYPE, "tags", limit)
+    
     @staticmethod
     def search_intelligence(db: Session, search_term: str, limit: int = 20) -> List[MarketIntelligence]:
         """搜索市场情报"""
@@ -1,4 +1,4 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, Query
 from sqlalchemy import desc, asc, func, and_, or_
 from typing import List, Optional, Dict, Any
 from datetime import datetime
@@ -13,6 +13,11 @@ from app.schemas.marketplace import (
     MarketplaceStats, MarketplaceInquiryCreate, MarketplaceFavoriteCreate,
     MarketplaceCategoryCreate, MarketplaceReportCreate
 )
+from app.services.tag_service import TagService
+from app.schemas.marketplace import MarketplaceListing as MarketplaceListingSchema
+from app.core.cache import cached
+
+TAG_ENTITY_TYPE = "marketplace_listing"
 
 class MarketplaceService:
     
@@ -28,18 +33,21 @@ class MarketplaceService:
             created_by=created_by
         )
         db.add(db_listing)
+        db.flush()
+        TagService.sync_entity(db, TAG_ENTITY_TYPE, db_listing, active=db_listing.status != ListingStatus.DELETED)
         db.commit()
         db.refresh(db_listing)
         return db_listing
     
     @staticmethod
-    def get_listing_by_id(db: Session, listing_id: int) -> Optional[MarketplaceListing]:
+    @cached("marketplace", MarketplaceListingSchema)
+    def get_listing_by_id(db: Session, listing_id: int) -> Optional[MarketplaceListingSchema]:
         """根据ID获取交易信息"""
         return db.query(MarketplaceListing).filter(MarketplaceListing.id == listing_id).first()
     
     @staticmethod
-    def get_listings_list(db: Session, query: MarketplaceListingQuery) -> List[MarketplaceListing]:
-        """获取交易信息列表"""
+    def build_listings_query(db: Session, query: MarketplaceListingQuery) -> Query:
+        """构建交易信息列表查询（已应用过滤、排序和分页）"""
         db_query = db.query(MarketplaceListing)
         
         # 应用过滤条件
@@ -67,6 +75,9 @@ class MarketplaceService:
         if query.country:
             db_query = db_query.filter(MarketplaceListing.country.contains(query.country))
         
+        if query.tag:
+            db_query = db_query.filter(TagService.has_tag(TAG_ENTITY_TYPE, MarketplaceListing.id, query.tag))
+        
         if query.keyword:
             keyword_filter = or_(
                 MarketplaceListing.title.contains(query.keyword),
@@ -98,7 +109,12 @@ class MarketplaceService:
             db_query = db_query.order_by(asc(getattr(MarketplaceListing, query.sort_by)))
         
         # 分页
-        return db_query.offset(query.skip).limit(query.limit).all()
+        return db_query.offset(query.skip).limit(query.limit)
+    
+    @staticmethod
+    def get_listings_list(db: Session, query: MarketplaceListingQuery) -> List[MarketplaceListing]:
+        """获取交易信息列表"""
+        return MarketplaceService.build_listings_query(db, query).all()
     
     @staticmethod
     def update_listing(
@@ -121,6 +137,11 @@ class MarketplaceService:
         update_data = listing_update.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_listing, field, value)
+        TagService.sync_entity(
+            db, TAG_ENTITY_TYPE, db_listing,
+            None if "status" in update_data else update_data.keys(),
+            active=db_listing.status != ListingStatus.DELETED
+        )
         
         db_listing.updated_at = datetime.utcnow()
         db.commit()
@@ -142,6 +163,7 @@ class MarketplaceService:
         
         # 软删除
         db_listing.status = ListingStatus.DELETED
+        TagService.remove_entity(db, TAG_ENTITY_TYPE, db_listing.id)
         db.commit()
         return True
     
@@ -240,7 +262,8 @@ class MarketplaceService:
         )
     
     @staticmethod
-    def get_featured_listings(db: Session, limit: int = 10) -> List[MarketplaceListing]:
+    @cached("marketplace", List[MarketplaceListingSchema])
+    def get_featured_listings(db: Session, limit: int = 10) -> List[MarketplaceListingSchema]:
         """获取推荐交易信息"""
         return db.query(MarketplaceListing).filter(
             MarketplaceListing.is_featured == True,
@@ -248,7 +271,8 @@ class MarketplaceService:
         ).order_by(desc(MarketplaceListing.created_at)).limit(limit).all()
     
     @staticmethod
-    def get_urgent_listings(db: Session, limit: int = 10) -> List[MarketplaceListing]:
+    @cached("marketplace", List[MarketplaceListingSchema])
+    def get_urgent_listings(db: Session, limit: int = 10) -> List[MarketplaceListingSchema]:
         """获取紧急交易信息"""
         return db.query(MarketplaceListing).filter(
             MarketplaceListing.is_urgent == True,
@@ -256,7 +280,8 @@ class MarketplaceService:
         ).order_by(desc(MarketplaceListing.created_at)).limit(limit).all()
     
     @staticmethod
-    def get_latest_listings(db: Session, limit: int = 20) -> List[MarketplaceListing]:
+    @cached("marketplace", List[MarketplaceListingSchema])
+    def get_latest_listings(db: Session, limit: int = 20) -> List[MarketplaceListingSchema]:
         """获取最新交易信息"""
         return db.query(MarketplaceListing).filter(
             MarketplaceListing.status == ListingStatus.ACTIVE
@@ -1,10 +1,12 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, Query
 from sqlalchemy import desc, asc, func, and_, or_
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 
 from app.models.policy import Policy, PolicyUrgency, PolicyStatus, PolicyCategory
 from app.schemas.policy import PolicyCreate, PolicyUpdate, PolicyQuery, PolicyStats
+from app.schemas.policy import Policy as PolicySchema
+from app.core.cache import cached
 
 class PolicyService:
     
@@ -21,13 +23,14 @@ class PolicyService:
         return db_policy
     
     @staticmethod
-    def get_policy_by_id(db: Session, policy_id: int) -> Optional[Policy]:
+    @cached("policy", PolicySchema)
+    def get_policy_by_id(db: Session, policy_id: int) -> Optional[PolicySchema]:
         """根据ID获取政策"""
         return db.query(Policy).filter(Policy.id == policy_id, Policy.is_active == True).first()
     
     @staticmethod
-    def get_policies(db: Session, query: PolicyQuery) -> List[Policy]:
-        """获取政策列表"""
+    def build_policies_query(db: Session, query: PolicyQuery) -> Query:
+        """构建政策列表查询（已应用过滤、排序和分页）"""
         db_query = db.query(Policy).filter(Policy.is_active == True)
         
         # 应用过滤条件
@@ -58,7 +61,12 @@ class PolicyService:
             db_query = db_query.order_by(asc(getattr(Policy, query.sort_by)))
         
         # 分页
-        return db_query.offset(query.skip).limit(query.limit).all()
+        return db_query.offset(query.skip).limit(query.limit)
+    
+    @staticmethod
+    def get_policies(db: Session, query: PolicyQuery) -> List[Policy]:
+        """获取政策列表"""
+        return PolicyService.build_policies_query(db, query).all()
     
     @staticmethod
     def update_policy(db: Session, policy_id: int, policy_update: PolicyUpdate) -> Optional[Policy]:
@@ -140,13 +148,15 @@ class PolicyService:
         )
     
     @staticmethod
-    def get_recent_policies(db: Session, limit: int = 10) -> List[Policy]:
+    @cached("policy", List[PolicySchema])
+    def get_recent_policies(db: Session, limit: int = 10) -> List[PolicySchema]:
         """获取最近的政策"""
         return db.query(Policy).filter(Policy.is_active == True)\
             .order_by(desc(Policy.created_at)).limit(limit).all()
     
     @staticmethod
-    def get_high_impact_policies(db: Session, limit: int = 10) -> List[Policy]:
+    @cached("policy", List[PolicySchema])
+    def get_high_impact_policies(db: Session, limit: int = 10) -> List[PolicySchema]:
         """获取高影响政策"""
         return db.query(Policy).filter(
             Policy.is_active == True,
@@ -1,10 +1,15 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, Query
 from sqlalchemy import desc, asc, func, and_, or_
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
 from app.models.supplier import Supplier, SupplierType, SupplierScale, CertificationLevel
 from app.schemas.supplier import SupplierCreate, SupplierUpdate, SupplierQuery, SupplierStats
+from app.services.tag_service import TagService
+from app.schemas.supplier import Supplier as SupplierSchema
+from app.core.cache import cached
+
+TAG_ENTITY_TYPE = "supplier"
 
 class SupplierService:
     
@@ -16,18 +21,21 @@ class SupplierService:
             created_by=created_by
         )
         db.add(db_supplier)
+        db.flush()
+        TagService.sync_entity(db, TAG_ENTITY_TYPE, db_supplier, active=db_supplier.is_active)
         db.commit()
         db.refresh(db_supplier)
         return db_supplier
     
     @staticmethod
-    def get_supplier_by_id(db: Session, supplier_id: int) -> Optional[Supplier]:
+    @cached("supplier", SupplierSchema)
+    def get_supplier_by_id(db: Session, supplier_id: int) -> Optional[SupplierSchema]:
         """根据ID获取供应商"""
         return db.query(Supplier).filter(Supplier.id == supplier_id, Supplier.is_active == True).first()
     
     @staticmethod
-    def get_suppliers(db: Session, query: SupplierQuery) -> List[Supplier]:
-        """获取供应商列表"""
+    def build_suppliers_query(db: Session, query: SupplierQuery) -> Query:
+        """构建供应商列表查询（已应用过滤、排序和分页）"""
         db_query = db.query(Supplier).filter(Supplier.is_active == True)
         
         # 应用过滤条件
@@ -44,13 +52,18 @@ class SupplierService:
             db_query = db_query.filter(Supplier.certification_level == query.certification_level)
         
         if query.product_category:
-            db_query = db_query.filter(Supplier.product_categories.contains(query.product_category))
+            db_query = db_query.filter(
+                TagService.has_tag(TAG_ENTITY_TYPE, Supplier.id, query.product_category, "product_categories")
+            )
+        
+        if query.tag:
+            db_query = db_query.filter(TagService.has_tag(TAG_ENTITY_TYPE, Supplier.id, query.tag))
         
         if query.keyword:
             keyword_filter = or_(
                 Supplier.company_name.contains(query.keyword),
                 Supplier.company_name_en.contains(query.keyword),
-                Supplier.main_products.contains(query.keyword),
+                TagService.has_tag_containing(TAG_ENTITY_TYPE, Supplier.id, query.keyword, "main_products"),
                 Supplier.keywords.contains(query.keyword)
             )
             db_query = db_query.filter(keyword_filter)
@@ -71,7 +84,12 @@ class SupplierService:
             db_query = db_query.order_by(asc(getattr(Supplier, query.sort_by)))
         
         # 分页
-        return db_query.offset(query.skip).limit(query.limit).all()
+        return db_query.offset(query.skip).limit(query.limit)
+    
+    @staticmethod
+    def get_suppliers(db: Session, query: SupplierQuery) -> List[Supplier]:
+        """获取供应商列表"""
+        return SupplierService.build_suppliers_query(db, query).all()
     
     @staticmethod
     def update_supplier(db: Session, supplier_id: int, supplier_update: SupplierUpdate) -> Optional[Supplier]:
@@ -83,6 +101,11 @@ class SupplierService:
         update_data = supplier_update.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_supplier, field, value)
+        TagService.sync_entity(
+            db, TAG_ENTITY_TYPE, db_supplier,
+            None if "is_active" in update_data else update_data.keys(),
+            active=db_supplier.is_active
+        )
         
         db_supplier.updated_at = datetime.utcnow()
         db.commit()
@@ -98,6 +121,7 @@ class SupplierService:
         
         db_supplier.is_active = False
         db_supplier.updated_at = datetime.utcnow()
+        TagService.remove_entity(db, TAG_ENTITY_TYPE, db_supplier.id)
         db.commit()
         return True
     
@@ -178,7 +202,8 @@ class SupplierService:
         )
     
     @staticmethod
-    def get_featured_suppliers(db: Session, limit: int = 10) -> List[Supplier]:
+    @cached("supplier", List[SupplierSchema])
+    def get_featured_suppliers(db: Session, limit: int = 10) -> List[SupplierSchema]:
         """获取推荐供应商"""
         return db.query(Supplier).filter(
             Supplier.is_active == True,
@@ -186,7 +211,8 @@ class SupplierService:
         ).order_by(desc(Supplier.overall_rating)).limit(limit).all()
     
     @staticmethod
-    def get_top_rated_suppliers(db: Session, limit: int = 10) -> List[Supplier]:
+    @cached("supplier", List[SupplierSchema])
+    def get_top_rated_suppliers(db: Session, limit: int = 10) -> List[SupplierSchema]:
         """获取高评分供应商"""
         return db.query(Supplier).filter(
             Supplier.is_active == True,
@@ -194,14 +220,19 @@ class SupplierService:
             Supplier.review_count >= 5
         ).order_by(desc(Supplier.overall_rating)).limit(limit).all()
     
+    @staticmethod
+    def get_popular_tags(db: Session, field: str = "product_categories", limit: int = 20) -> List[Dict[str, Any]]:
+        """获取热门标签/产品类别/主营产品及对应的供应商数"""
+        return TagService.get_popular_tags(db, TAG_ENTITY_TYPE, field, limit)
+    
     @staticmethod
     def search_suppliers(db: Session, search_term: str, limit: int = 20) -> List[Supplier]:
         """搜索供应商"""
         search_filter = or_(
             Supplier.company_name.contains(search_term),
             Supplier.company_name_en.contains(search_term),
-            Supplier.main_products.contains(search_term),
-            Supplier.product_categories.contains(search_term),
+            TagService.has_tag_containing(TAG_ENTITY_TYPE, Supplier.id, search_term, "main_products"),
+            TagService.has_tag_containing(TAG_ENTITY_TYPE, Supplier.id, search_term, "product_categories"),
             Supplier.keywords.contains(search_term)
         )
         
@@ -0,0 +1,465 @@
+"""
+标签索引
+供应商的产品类别/主营产品/标签以及情报、帖子、商品、合规工具的标签原本以JSON字符串存放在Text列中，
+按标签筛选只能做子串扫描且会误匹配（如"芯片"命中"功率芯片"）。
+这里把这些值归一化到 tags 字典表，并通过 entity_tags 关联表建立索引：
+- 创建/更新时由各业务服务调用 TagService.sync_entity 同步写入（与业务数据同一事务）
+- 已有数据通过 app/scripts/backfill_tags.py 回填
+- 筛选参数用 TagService.has_tag 生成基于索引的精确匹配条件；
+  关键词搜索用 TagService.has_tag_containing 按标签名子串匹配（只扫描标签字典表）
+- 写入/删除关联时同步增减 tag_counts 中的计数，热门标签直接按计数索引读取前N条；
+  只有公开可见的实体（已发布的情报/帖子、在售的商品等）计入计数，状态变化时随同步一起增减
+"""
+import json
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, delete, false, func, insert, select, true, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.tag import Tag, EntityTag, TagCount
+from app.models.supplier import Supplier
+from app.models.market_intelligence import MarketIntelligence, IntelligenceStatus
+from app.models.community import CommunityPost, PostStatus
+from app.models.marketplace import MarketplaceListing, ListingStatus
+from app.models.compliance_tool import ComplianceTool
+
+# 实体类型 -> (模型, 建立标签索引的字段, 有效记录条件, 公开可见条件)
+# 软删除的记录不保留标签关联；有效记录条件为 None 的实体类型是物理删除
+# 只有满足公开可见条件的记录计入标签计数（与各列表接口默认展示的状态一致），为 None 时全部计入
+TAGGED_ENTITIES: Dict[str, Tuple] = {
+    "supplier": (Supplier, ("product_categories", "main_products", "tags"), Supplier.is_active == True, None),
+    "market_intelligence": (
+        MarketIntelligence, ("tags",), None,
+        MarketIntelligence.status.in_([IntelligenceStatus.PUBLISHED, IntelligenceStatus.FEATURED])
+    ),
+    "community_post": (
+        CommunityPost, ("tags",), CommunityPost.status != PostStatus.DELETED,
+        CommunityPost.status == PostStatus.PUBLISHED
+    ),
+    "marketplace_listing": (
+        MarketplaceListing, ("tags",), MarketplaceListing.status != ListingStatus.DELETED,
+        MarketplaceListing.status == ListingStatus.ACTIVE
+    ),
+    "compliance_tool": (ComplianceTool, ("tags",), None, None),
+}
+
+# 超过该长度的值不是标签（通常是误填的整段描述），不建立索引
+MAX_TAG_LENGTH = 200
+
+# 单条 IN 查询的参数个数上限
+QUERY_CHUNK_SIZE = 500
+
+_SEPARATORS = re.compile(r"[,，;；、|\n]")
+
+
+def normalize_tag(name: str) -> str:
+    """去除首尾空白、合并连续空白并转为小写"""
+    return " ".join(str(name).split()).lower()
+
+
+def parse_tags(value) -> List[str]:
+    """
+    解析标签字段：JSON数组（库中的标准格式），或以逗号/分号/顿号分隔的字符串
+    返回去重后的标签（按归一化名称去重，保留首次出现的写法）
+    """
+    if value is None:
+        return []
+    items = value
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return []
+        try:
+            items = json.loads(text)
+        except ValueError:
+            items = _SEPARATORS.split(text)
+        if isinstance(items, str):
+            items = _SEPARATORS.split(items)
+    if not isinstance(items, (list, tuple, set)):
+        items = [items]
+
+    tags = []
+    seen = set()
+    for item in items:
+        if item is None or isinstance(item, (dict, list)):
+            continue
+        name = " ".join(str(item).split())
+        normalized = normalize_tag(name)
+        if not normalized or len(normalized) > MAX_TAG_LENGTH or normalized in seen:
+            continue
+        seen.add(normalized)
+        tags.append(name)
+    return tags
+
+
+def _chunks(items: Sequence, size: int = QUERY_CHUNK_SIZE) -> Iterable[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class TagService:
+    """标签索引服务类（不提交事务，由调用方与业务数据一起提交）"""
+
+    @staticmethod
+    def ensure_tags(db: Session, names: Iterable[str]) -> Dict[str, int]:
+        """确保标签存在于字典表中，返回 {归一化名称: 标签ID}"""
+        display_names: Dict[str, str] = {}
+        for name in names:
+            display_names.setdefault(normalize_tag(name), name)
+        display_names.pop("", None)
+        if not display_names:
+            return {}
+
+        tag_ids = TagService._lookup_tag_ids(db, list(display_names))
+        missing = [normalized for normalized in display_names if normalized not in tag_ids]
+        if not missing:
+            return tag_ids
+
+        rows = [{"name": display_names[normalized], "normalized_name": normalized} for normalized in missing]
+        try:
+            with db.begin_nested():
+                db.execute(insert(Tag), rows)
+        except IntegrityError:
+            # 其他事务并发创建了部分标签，逐个插入尚不存在的标签
+            for row in rows:
+                if TagService._lookup_tag_ids(db, [row["normalized_name"]]):
+                    continue
+                try:
+                    with db.begin_nested():
+                        db.execute(insert(Tag), [row])
+                except IntegrityError:
+                    pass
+        tag_ids.update(TagService._lookup_tag_ids(db, missing))
+        return tag_ids
+
+    @staticmethod
+    def _lookup_tag_ids(db: Session, normalized_names: List[str]) -> Dict[str, int]:
+        tag_ids = {}
+        for chunk in _chunks(normalized_names):
+            for tag_id, normalized in db.execute(
+                select(Tag.id, Tag.normalized_name).where(Tag.normalized_name.in_(chunk))
+            ):
+                tag_ids[normalized] = tag_id
+        return tag_ids
+
+    @staticmethod
+    def sync_entity(
+        db: Session,
+        entity_type: str,
+        entity,
+        fields: Optional[Iterable[str]] = None,
+        active: bool = True
+    ):
+        """
+        按实体当前的字段值同步其标签索引；fields 为 None 时同步该实体类型的全部标签字段
+        active=False（已软删除）时移除实体的全部关联
+        无论 fields 是否包含标签字段，都按实体当前状态更新其关联是否计入标签计数
+        新建的实体需先 flush 以获得ID
+        """
+        if not active:
+            TagService.remove_entity(db, entity_type, entity.id)
+            return
+        tagged_fields = TAGGED_ENTITIES[entity_type][1]
+        fields = tagged_fields if fields is None else [field for field in fields if field in tagged_fields]
+        # 先flush，使可见性查询读到本次修改后的状态
+        db.flush()
+        TagService.sync_entities(db, entity_type, {
+            entity.id: {field: getattr(entity, field) for field in fields}
+        })
+
+    @staticmethod
+    def sync_entities(
+        db: Session,
+        entity_type: str,
+        values: Dict[int, Dict[str, Optional[str]]],
+        visible: Optional[Dict[int, bool]] = None
+    ) -> int:
+        """
+        批量同步标签索引: values 为 {实体ID: {字段: 字段值}}，只处理出现的字段
+        只插入新增、删除移除的关联并相应增减标签计数，返回变化的关联数
+        visible 为 {实体ID: 是否公开可见}，为 None 时按库中当前状态查询；
+        实体可见性变化时，其全部字段的已有关联随之计入或移出标签计数
+        """
+        tagged_fields = TAGGED_ENTITIES[entity_type][1]
+        desired: Dict[Tuple[int, str], List[str]] = {}
+        for entity_id, field_values in values.items():
+            for field, value in field_values.items():
+                if field in tagged_fields:
+                    desired[(entity_id, field)] = parse_tags(value)
+        entity_ids = list(values)
+        if not entity_ids:
+            return 0
+        if visible is None:
+            visible = TagService._visible_entities(db, entity_type, entity_ids)
+
+        tag_ids = TagService.ensure_tags(db, (name for names in desired.values() for name in names))
+        desired_ids = {
+            key: {tag_ids[normalize_tag(name)] for name in names}
+            for key, names in desired.items()
+        }
+
+        # 读取这些实体现有的全部关联: {(实体ID, 字段): {标签ID: (关联ID, 是否计入计数)}}
+        existing: Dict[Tuple[int, str], Dict[int, Tuple[int, bool]]] = {}
+        for chunk in _chunks(entity_ids):
+            for link_id, entity_id, field, tag_id, link_visible in db.execute(
+                select(EntityTag.id, EntityTag.entity_id, EntityTag.field, EntityTag.tag_id, EntityTag.visible).where(
+                    EntityTag.entity_type == entity_type,
+                    EntityTag.entity_id.in_(chunk)
+                )
+            ):
+                existing.setdefault((entity_id, field), {})[tag_id] = (link_id, link_visible)
+
+        new_links = []
+        stale_links = []
+        shown_links = []
+        hidden_links = []
+        deltas: Counter = Counter()
+        for key, wanted in desired_ids.items():
+            current = existing.get(key, {})
+            entity_id, field = key
+            for tag_id in wanted - current.keys():
+                new_links.append({
+                    "entity_type": entity_type, "entity_id": entity_id, "field": field,
+                    "tag_id": tag_id, "visible": visible[entity_id]
+                })
+                if visible[entity_id]:
+                    deltas[(field, tag_id)] += 1
+            for tag_id, (link_id, link_visible) in current.items():
+                if tag_id not in wanted:
+                    stale_links.append(link_id)
+                    if link_visible:
+                        deltas[(field, tag_id)] -= 1
+        for key, current in existing.items():
+            entity_id, field = key
+            wanted = desired_ids.get(key)
+            for tag_id, (link_id, link_visible) in current.items():
+                if wanted is not None and tag_id not in wanted or link_visible == visible[entity_id]:
+                    continue
+                (shown_links if visible[entity_id] else hidden_links).append(link_id)
+                deltas[(field, tag_id)] += 1 if visible[entity_id] else -1
+
+        for chunk in _chunks(stale_links):
+            db.execute(delete(EntityTag).where(EntityTag.id.in_(chunk)))
+        for link_ids, link_visible in ((shown_links, True), (hidden_links, False)):
+            for chunk in _chunks(link_ids):
+                db.execute(update(EntityTag).where(EntityTag.id.in_(chunk)).values(visible=link_visible))
+        if new_links:
+            db.execute(insert(EntityTag), new_links)
+        TagService._apply_count_deltas(db, entity_type, deltas)
+        return len(new_links) + len(stale_links)
+
+    @staticmethod
+    def _visible_entities(db: Session, entity_type: str, entity_ids: List[int]) -> Dict[int, bool]:
+        """按公开可见条件查询各实体当前是否可见"""
+        model, _, _, visible_condition = TAGGED_ENTITIES[entity_type]
+        if visible_condition is None:
+            return {entity_id: True for entity_id in entity_ids}
+        visible = {entity_id: False for entity_id in entity_ids}
+        for chunk in _chunks(entity_ids):
+            for (entity_id,) in db.execute(select(model.id).where(model.id.in_(chunk), visible_condition)):
+                visible[entity_id] = True
+        return visible
+
+    @staticmethod
+    def remove_entity(db: Session, entity_type: str, entity_id: int):
+        """删除（或软删除）实体时移除其全部标签关联"""
+        links = db.execute(select(EntityTag.id, EntityTag.field, EntityTag.tag_id, EntityTag.visible).where(
+            EntityTag.entity_type == entity_type,
+            EntityTag.entity_id == entity_id
+        )).all()
+        if not links:
+            return
+        db.execute(delete(EntityTag).where(EntityTag.id.in_([link_id for link_id, _, _, _ in links])))
+        TagService._apply_count_deltas(db, entity_type, Counter({
+            (field, tag_id): -1 for _, field, tag_id, link_visible in links if link_visible
+        }))
+
+    @staticmethod
+    def _apply_count_deltas(db: Session, entity_type: str, deltas: Counter):
+        """按 {(字段, 标签ID): 增量} 原子地增减计数，计数行不存在时创建"""
+        deltas = {key: delta for key, delta in deltas.items() if delta}
+        if not deltas:
+            return
+
+        counter_ids = {}
+        fields = list({field for field, _ in deltas})
+        tag_ids = list({tag_id for _, tag_id in deltas})
+        for chunk in _chunks(tag_ids):
+            for counter_id, field, tag_id in db.execute(
+                select(TagCount.id, TagCount.field, TagCount.tag_id).where(
+                    TagCount.entity_type == entity_type,
+                    TagCount.field.in_(fields),
+                    TagCount.tag_id.in_(chunk)
+                )
+            ):
+                counter_ids[(field, tag_id)] = counter_id
+
+        # 已有计数行：count = count + 增量，并发写入时不会丢失更新
+        increments = [
+            {"counter_id": counter_ids[key], "delta": delta}
+            for key, delta in deltas.items() if key in counter_ids
+        ]
+        if increments:
+            db.execute(
+                update(TagCount.__table__)
+                .where(TagCount.__table__.c.id == bindparam("counter_id"))
+                .values(count=TagCount.__table__.c.count + bindparam("delta")),
+                increments
+            )
+
+        # 计数行不存在时只可能是新增关联（负增量说明计数已偏离，留给重建命令修正）
+        new_counters = [
+            {"entity_type": entity_type, "field": field, "tag_id": tag_id, "count": delta}
+            for (field, tag_id), delta in deltas.items()
+            if (field, tag_id) not in counter_ids and delta > 0
+        ]
+        if not new_counters:
+            return
+        try:
+            with db.begin_nested():
+                db.execute(insert(TagCount), new_counters)
+        except IntegrityError:
+            # 其他事务并发创建了计数行，逐个改为累加
+            for row in new_counters:
+                with db.begin_nested():
+                    result = db.execute(
+                        update(TagCount)
+                        .where(
+                            TagCount.entity_type == entity_type,
+                            TagCount.field == row["field"],
+                            TagCount.tag_id == row["tag_id"]
+                        )
+                        .values(count=TagCount.count + row["count"])
+                    )
+                    if result.rowcount == 0:
+                        db.execute(insert(TagCount), [row])
+
+    @staticmethod
+    def get_popular_tags(db: Session, entity_type: str, field: str = "tags", limit: int = 20) -> List[Dict]:
+        """按计数倒序返回前 limit 个标签: [{"name", "count"}]，只读取计数索引的前N条"""
+        rows = db.execute(
+            select(Tag.name, TagCount.count)
+            .join(Tag, Tag.id == TagCount.tag_id)
+            .where(
+                TagCount.entity_type == entity_type,
+                TagCount.field == field,
+                TagCount.count > 0
+            )
+            .order_by(TagCount.count.desc())
+            .limit(limit)
+        )
+        return [{"name": name, "count": count} for name, count in rows]
+
+    @staticmethod
+    def rebuild_counts(db: Session, entity_types: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """按计入计数的标签关联全量重建计数，返回 {实体类型: 计数行数}"""
+        results = {}
+        for entity_type in entity_types or TAGGED_ENTITIES:
+            db.execute(delete(TagCount).where(TagCount.entity_type == entity_type))
+            db.execute(insert(TagCount).from_select(
+                ["entity_type", "field", "tag_id", "count"],
+                select(EntityTag.entity_type, EntityTag.field, EntityTag.tag_id, func.count())
+                .where(EntityTag.entity_type == entity_type, EntityTag.visible == True)
+                .group_by(EntityTag.entity_type, EntityTag.field, EntityTag.tag_id)
+            ))
+            db.commit()
+            results[entity_type] = db.query(TagCount).filter(TagCount.entity_type == entity_type).count()
+        return results
+
+    @staticmethod
+    def has_tag(entity_type: str, id_column, name: str, field: str = "tags"):
+        """
+        生成"实体在 field 字段上带有标签 name"的过滤条件（归一化后精确匹配）
+        用法: db_query.filter(TagService.has_tag("supplier", Supplier.id, "MCU", "product_categories"))
+        """
+        normalized = normalize_tag(name)
+        if not normalized:
+            return false()
+        return id_column.in_(
+            select(EntityTag.entity_id)
+            .join(Tag, Tag.id == EntityTag.tag_id)
+            .where(
+                Tag.normalized_name == normalized,
+                EntityTag.entity_type == entity_type,
+                EntityTag.field == field
+            )
+        )
+
+    @staticmethod
+    def has_tag_containing(entity_type: str, id_column, keyword: str, field: str = "tags"):
+        """
+        生成"实体在 field 字段上有名称包含 keyword 的标签"的过滤条件（关键词搜索用，子串匹配、不区分大小写）
+        子串匹配只扫描标签字典表，再按 entity_tags 索引取实体
+        """
+        normalized = normalize_tag(keyword)
+        if not normalized:
+            return false()
+        return id_column.in_(
+            select(EntityTag.entity_id)
+            .join(Tag, Tag.id == EntityTag.tag_id)
+            .where(
+                Tag.normalized_name.contains(normalized, autoescape=True),
+                EntityTag.entity_type == entity_type,
+                EntityTag.field == field
+            )
+        )
+
+    @staticmethod
+    def get_entity_tags(db: Session, entity_type: str, entity_id: int) -> Dict[str, List[str]]:
+        """返回实体已索引的标签: {字段: [标签名]}"""
+        rows = db.execute(
+            select(EntityTag.field, Tag.name)
+            .join(Tag, Tag.id == EntityTag.tag_id)
+            .where(EntityTag.entity_type == entity_type, EntityTag.entity_id == entity_id)
+            .order_by(EntityTag.id)
+        )
+        tags: Dict[str, List[str]] = {}
+        for field, name in rows:
+            tags.setdefault(field, []).append(name)
+        return tags
+
+    @staticmethod
+    def backfill(db: Session, entity_types: Optional[Iterable[str]] = None, batch_size: int = 500) -> Dict[str, int]:
+        """
+        按主键分批为已有数据重建标签索引（可重复执行，只写入差异），每批提交一次；
+        已软删除的记录移除关联，并按公开可见条件标记关联是否计入计数，最后重建该实体类型的标签计数
+        返回 {实体类型: 处理的记录数}
+        """
+        results = {}
+        for entity_type in entity_types or TAGGED_ENTITIES:
+            model, fields, active_condition, visible_condition = TAGGED_ENTITIES[entity_type]
+            columns = [getattr(model, field) for field in fields]
+            active_column = (active_condition if active_condition is not None else true()).label("active")
+            visible_column = (visible_condition if visible_condition is not None else true()).label("visible")
+            processed = 0
+            last_id = 0
+            while True:
+                rows = db.execute(
+                    select(model.id, active_column, visible_column, *columns)
+                    .where(model.id > last_id)
+                    .order_by(model.id)
+                    .limit(batch_size)
+                ).all()
+                if not rows:
+                    break
+                TagService.sync_entities(
+                    db, entity_type,
+                    {row[0]: dict(zip(fields, row[3:] if row[1] else [None] * len(fields))) for row in rows},
+                    visible={row[0]: bool(row[2]) for row in rows}
+                )
+                db.commit()
+                processed += len(rows)
+                last_id = rows[-1][0]
+
+            # 清理已被物理删除的实体遗留的关联
+            db.execute(delete(EntityTag).where(
+                EntityTag.entity_type == entity_type,
+                EntityTag.entity_id.not_in(select(model.id))
+            ))
+            db.commit()
+            TagService.rebuild_counts(db, [entity_type])
+            results[entity_type] = processed
+        return results
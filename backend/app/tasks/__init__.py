@@ -0,0 +1,17 @@
+"""
+后台任务
+任务持久化在数据库中，由独立的worker进程执行（python app/scripts/task_worker.py）
+"""
+from .queue import TaskQueue, SQLTaskQueue, Task, get_task_queue
+from .registry import TaskDefinition, task, get_task, registered_tasks
+
+# worker启动时导入的任务模块（导入即完成注册）
+TASK_MODULES = [
+    "app.tasks.collection",
+]
+
+__all__ = [
+    "TaskQueue", "SQLTaskQueue", "Task", "get_task_queue",
+    "TaskDefinition", "task", "get_task", "registered_tasks",
+    "TASK_MODULES"
+]
@@ -0,0 +1,27 @@
+"""
+数据采集后台任务
+"""
+from typing import Dict, List, Optional
+
+from app.services.collection_job_service import run_collection_job
+from app.tasks.registry import task
+
+
+# 采集任务有自己的进度和心跳记录，worker异常退出后由采集任务服务标记失败，不自动重跑
+@task("collection.run_job", max_attempts=1, max_concurrency=1)
+async def run_collection_job_task(
+    job_id: int,
+    mode: str,
+    sources: List[str],
+    incremental: bool = False
+) -> Optional[Dict]:
+    """执行一次采集任务（采集任务记录由 CollectionJobService.create_job 创建）"""
+    results = await run_collection_job(job_id, mode, sources, incremental=incremental)
+    if results is None:
+        return None
+    return {
+        "total_collected": results["total_collected"],
+        "total_updated": results["total_updated"],
+        "total_skipped": results["total_skipped"],
+        "total_failed": results["total_failed"]
+    }
@@ -0,0 +1,352 @@
+"""
+持久化任务队列
+任务保存在业务数据库中（SQLite/PostgreSQL），不依赖Redis：
+Web进程只调用 enqueue() 写入任务；独立的worker进程用 claim() 领取任务，执行期间定期 extend() 续期，
+超过可见性超时仍未续期的任务视为worker异常退出，由 recover_expired() 重新入队；
+失败的任务按指数退避重试，重试次数用尽后转入死信表
+"""
+import json
+import random
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import logging
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.task_queue import QueuedTask, DeadLetterTask, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE = "default"
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_VISIBILITY_TIMEOUT = 300
+RETRY_BACKOFF_BASE = 10.0
+RETRY_BACKOFF_MAX = 3600.0
+
+# fail() 的处理结果
+OUTCOME_RETRY = "retry"
+OUTCOME_DEAD = "dead"
+
+
+def retry_delay(attempts: int, base: float = RETRY_BACKOFF_BASE, max_delay: float = RETRY_BACKOFF_MAX) -> float:
+    """第 attempts 次失败后的重试间隔：base * 2^(attempts-1)，加±20%抖动，不超过 max_delay"""
+    delay = min(base * 2 ** max(attempts - 1, 0), max_delay)
+    return min(delay * random.uniform(0.8, 1.2), max_delay)
+
+
+class Task:
+    """worker领取到的任务"""
+
+    __slots__ = ('id', 'name', 'queue', 'payload', 'attempts', 'max_attempts')
+
+    def __init__(self, id: int, name: str, queue: str, payload: Dict, attempts: int, max_attempts: int):
+        self.id = id
+        self.name = name
+        self.queue = queue
+        self.payload = payload
+        self.attempts = attempts
+        self.max_attempts = max_attempts
+
+
+class TaskQueue(ABC):
+    """任务队列接口"""
+
+    @abstractmethod
+    def enqueue(
+        self,
+        name: str,
+        payload: Optional[Dict] = None,
+        queue: str = DEFAULT_QUEUE,
+        priority: int = 0,
+        delay: float = 0,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    ) -> int:
+        """写入任务，返回任务ID"""
+
+    @abstractmethod
+    def claim(
+        self,
+        worker_id: str,
+        queues: Iterable[str],
+        limit: int = 1,
+        visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT,
+        exclude_names: Iterable[str] = ()
+    ) -> List[Task]:
+        """领取到期的任务，领取后 visibility_timeout 秒内对其他worker不可见"""
+
+    @abstractmethod
+    def extend(self, task_id: int, worker_id: str, visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT) -> bool:
+        """续期，任务已不属于该worker时返回False"""
+
+    @abstractmethod
+    def complete(self, task_id: int, worker_id: str, result: Any = None) -> bool:
+        """标记成功"""
+
+    @abstractmethod
+    def fail(self, task_id: int, worker_id: str, error: str, retry: bool = True) -> Optional[str]:
+        """标记失败：未达最大次数时延后重试，否则转入死信表；返回 OUTCOME_RETRY/OUTCOME_DEAD"""
+
+    @abstractmethod
+    def release(self, task_id: int, worker_id: str) -> bool:
+        """worker退出时交还未执行完的任务，不计入失败次数"""
+
+    @abstractmethod
+    def recover_expired(self) -> int:
+        """处理可见性超时的任务，返回处理数量"""
+
+    @abstractmethod
+    def stats(self) -> Dict:
+        """各队列各状态的任务数量及死信数量"""
+
+
+class SQLTaskQueue(TaskQueue):
+    """
+    基于SQLAlchemy的任务队列
+    领取时用带状态条件的UPDATE保证同一任务只会被一个worker领取
+    （PostgreSQL上额外使用 FOR UPDATE SKIP LOCKED 减少竞争）
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        backoff_base: float = RETRY_BACKOFF_BASE,
+        backoff_max: float = RETRY_BACKOFF_MAX
+    ):
+        self.session_factory = session_factory
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    @contextmanager
+    def _session(self):
+        db = self.session_factory()
+        try:
+            yield db
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def enqueue(
+        self,
+        name: str,
+        payload: Optional[Dict] = None,
+        queue: str = DEFAULT_QUEUE,
+        priority: int = 0,
+        delay: float = 0,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    ) -> int:
+        with self._session() as db:
+            task = QueuedTask(
+                name=name,
+                queue=queue,
+                payload=json.dumps(payload or {}, ensure_ascii=False),
+                status=TaskStatus.QUEUED,
+                priority=priority,
+                max_attempts=max_attempts,
+                run_at=datetime.utcnow() + timedelta(seconds=delay)
+            )
+            db.add(task)
+            db.commit()
+            logger.info(f"任务已入队: {name} #{task.id} (队列 {queue})")
+            return task.id
+
+    def claim(
+        self,
+        worker_id: str,
+        queues: Iterable[str],
+        limit: int = 1,
+        visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT,
+        exclude_names: Iterable[str] = ()
+    ) -> List[Task]:
+        exclude_names = list(exclude_names)
+        with self._session() as db:
+            now = datetime.utcnow()
+            query = db.query(QueuedTask.id).filter(
+                QueuedTask.queue.in_(list(queues)),
+                QueuedTask.status == TaskStatus.QUEUED,
+                QueuedTask.run_at <= now
+            )
+            if exclude_names:
+                query = query.filter(QueuedTask.name.notin_(exclude_names))
+            candidate_ids = [
+                task_id for task_id, in query.order_by(
+                    QueuedTask.priority.desc(), QueuedTask.run_at, QueuedTask.id
+                ).limit(limit).with_for_update(skip_locked=True)
+            ]
+
+            claimed_ids = []
+            for task_id in candidate_ids:
+                result = db.execute(
+                    update(QueuedTask)
+                    .where(QueuedTask.id == task_id, QueuedTask.status == TaskStatus.QUEUED)
+                    .values(
+                        status=TaskStatus.RUNNING,
+                        locked_by=worker_id,
+                        locked_until=now + timedelta(seconds=visibility_timeout),
+                        attempts=QueuedTask.attempts + 1,
+                        started_at=now
+                    )
+                )
+                if result.rowcount == 1:
+                    claimed_ids.append(task_id)
+            db.commit()
+
+            if not claimed_ids:
+                return []
+            rows = db.query(QueuedTask).filter(QueuedTask.id.in_(claimed_ids)).order_by(
+                QueuedTask.priority.desc(), QueuedTask.run_at, QueuedTask.id
+            ).all()
+            return [
+                Task(row.id, row.name, row.queue, json.loads(row.payload), row.attempts, row.max_attempts)
+                for row in rows
+            ]
+
+    def _owned(self, db: Session, task_id: int, worker_id: str) -> Optional[QueuedTask]:
+        return db.query(QueuedTask).filter(
+            QueuedTask.id == task_id,
+            QueuedTask.status == TaskStatus.RUNNING,
+            QueuedTask.locked_by == worker_id
+        ).first()
+
+    def extend(self, task_id: int, worker_id: str, visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT) -> bool:
+        with self._session() as db:
+            result = db.execute(
+                update(QueuedTask)
+                .where(
+                    QueuedTask.id == task_id,
+                    QueuedTask.status == TaskStatus.RUNNING,
+                    QueuedTask.locked_by == worker_id
+                )
+                .values(locked_until=datetime.utcnow() + timedelta(seconds=visibility_timeout))
+            )
+            db.commit()
+            return result.rowcount == 1
+
+    def complete(self, task_id: int, worker_id: str, result: Any = None) -> bool:
+        with self._session() as db:
+            task = self._owned(db, task_id, worker_id)
+            if not task:
+                logger.warning(f"任务 #{task_id} 已不属于 {worker_id}，忽略执行结果")
+                return False
+            task.status = TaskStatus.SUCCEEDED
+            task.result = json.dumps(result, ensure_ascii=False, default=str) if result is not None else None
+            task.finished_at = datetime.utcnow()
+            task.locked_by = None
+            task.locked_until = None
+            db.commit()
+            return True
+
+    def fail(self, task_id: int, worker_id: str, error: str, retry: bool = True) -> Optional[str]:
+        with self._session() as db:
+            task = self._owned(db, task_id, worker_id)
+            if not task:
+                logger.warning(f"任务 #{task_id} 已不属于 {worker_id}，忽略失败结果")
+                return None
+            outcome = self._handle_failure(db, task, error, retry)
+            db.commit()
+            return outcome
+
+    def _handle_failure(self, db: Session, task: QueuedTask, error: str, retry: bool = True) -> str:
+        if retry and task.attempts < task.max_attempts:
+            delay = retry_delay(task.attempts, self.backoff_base, self.backoff_max)
+            task.status = TaskStatus.QUEUED
+            task.run_at = datetime.utcnow() + timedelta(seconds=delay)
+            task.locked_by = None
+            task.locked_until = None
+            task.last_error = error
+            logger.warning(
+                f"任务 {task.name} #{task.id} 第 {task.attempts} 次执行失败: {error}，{delay:.0f} 秒后重试"
+            )
+            return OUTCOME_RETRY
+
+        db.add(DeadLetterTask(
+            task_id=task.id,
+            name=task.name,
+            queue=task.queue,
+            payload=task.payload,
+            attempts=task.attempts,
+            error=error,
+            created_at=task.created_at
+        ))
+        db.delete(task)
+        logger.error(f"任务 {task.name} #{task.id} 执行 {task.attempts} 次后仍失败，转入死信表: {error}")
+        return OUTCOME_DEAD
+
+    def release(self, task_id: int, worker_id: str) -> bool:
+        with self._session() as db:
+            task = self._owned(db, task_id, worker_id)
+            if not task:
+                return False
+            task.status = TaskStatus.QUEUED
+            task.attempts = max(task.attempts - 1, 0)
+            task.run_at = datetime.utcnow()
+            task.locked_by = None
+            task.locked_until = None
+            db.commit()
+            return True
+
+    def recover_expired(self) -> int:
+        with self._session() as db:
+            expired = db.query(QueuedTask).filter(
+                QueuedTask.status == TaskStatus.RUNNING,
+                QueuedTask.locked_until < datetime.utcnow()
+            ).with_for_update(skip_locked=True).all()
+            for task in expired:
+                self._handle_failure(db, task, f"可见性超时，worker {task.locked_by} 可能已退出")
+            db.commit()
+            return len(expired)
+
+    def retry_dead_letter(self, dead_letter_id: int) -> Optional[int]:
+        """把死信任务重新入队（重试次数清零），返回新任务ID"""
+        with self._session() as db:
+            dead = db.query(DeadLetterTask).filter(DeadLetterTask.id == dead_letter_id).first()
+            if not dead:
+                return None
+            task = QueuedTask(
+                name=dead.name,
+                queue=dead.queue,
+                payload=dead.payload,
+                status=TaskStatus.QUEUED,
+                max_attempts=max(dead.attempts, 1),
+                run_at=datetime.utcnow()
+            )
+            db.add(task)
+            db.delete(dead)
+            db.commit()
+            return task.id
+
+    def purge_succeeded(self, older_than: timedelta = timedelta(days=7)) -> int:
+        """删除早于指定时间的成功任务记录"""
+        with self._session() as db:
+            deleted = db.query(QueuedTask).filter(
+                QueuedTask.status == TaskStatus.SUCCEEDED,
+                QueuedTask.finished_at < datetime.utcnow() - older_than
+            ).delete(synchronize_session=False)
+            db.commit()
+            return deleted
+
+    def stats(self) -> Dict:
+        with self._session() as db:
+            queues: Dict[str, Dict[str, int]] = {}
+            for queue, status, count in db.query(
+                QueuedTask.queue, QueuedTask.status, func.count(QueuedTask.id)
+            ).group_by(QueuedTask.queue, QueuedTask.status):
+                queues.setdefault(queue, {s.value: 0 for s in TaskStatus})[status.value] = count
+            dead_letters = db.query(func.count(DeadLetterTask.id)).scalar()
+            return {"queues": queues, "dead_letters": dead_letters}
+
+
+_default_queue: Optional[TaskQueue] = None
+
+
+def get_task_queue() -> TaskQueue:
+    """进程内共享的默认任务队列"""
+    global _default_queue
+    if _default_queue is None:
+        _default_queue = SQLTaskQueue()
+    return _default_queue
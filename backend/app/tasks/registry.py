@@ -0,0 +1,79 @@
+"""
+任务注册
+用 @task 声明后台任务，Web进程通过 enqueue() 入队，worker进程按名称查找并执行
+"""
+import asyncio
+from typing import Any, Callable, Dict, Optional
+
+from app.tasks.queue import DEFAULT_MAX_ATTEMPTS, DEFAULT_QUEUE, TaskQueue, get_task_queue
+
+_registry: Dict[str, "TaskDefinition"] = {}
+
+
+class TaskDefinition:
+    """
+    后台任务定义
+    max_concurrency 限制单个worker进程内同时执行的数量，timeout 为单次执行的超时秒数
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable,
+        queue: str = DEFAULT_QUEUE,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
+        self.name = name
+        self.func = func
+        self.queue = queue
+        self.max_attempts = max_attempts
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.is_async = asyncio.iscoroutinefunction(func)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self.func(*args, **kwargs)
+
+    def enqueue(
+        self,
+        priority: int = 0,
+        delay: float = 0,
+        task_queue: Optional[TaskQueue] = None,
+        **payload: Any
+    ) -> int:
+        """入队，payload 需可JSON序列化，返回任务ID"""
+        return (task_queue or get_task_queue()).enqueue(
+            self.name,
+            payload,
+            queue=self.queue,
+            priority=priority,
+            delay=delay,
+            max_attempts=self.max_attempts
+        )
+
+
+def task(
+    name: str,
+    queue: str = DEFAULT_QUEUE,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    max_concurrency: Optional[int] = None,
+    timeout: Optional[float] = None
+) -> Callable[[Callable], TaskDefinition]:
+    """注册后台任务，任务函数可以是协程函数或普通函数（在线程中执行）"""
+    def decorator(func: Callable) -> TaskDefinition:
+        if name in _registry:
+            raise ValueError(f"任务名称重复: {name}")
+        definition = TaskDefinition(name, func, queue, max_attempts, max_concurrency, timeout)
+        _registry[name] = definition
+        return definition
+    return decorator
+
+
+def get_task(name: str) -> Optional[TaskDefinition]:
+    return _registry.get(name)
+
+
+def registered_tasks() -> Dict[str, TaskDefinition]:
+    return dict(_registry)
@@ -0,0 +1,182 @@
+"""
+后台任务worker
+独立于Web进程运行，从持久化队列领取任务执行：
+- concurrency 限制同时执行的任务数，任务定义的 max_concurrency 限制同类任务数
+- 执行期间按可见性超时的1/3续期，续期失败说明任务已被重新分配
+- 失败按指数退避重试，重试次数用尽转入死信表
+- stop() 后停止领取，等待执行中的任务结束；超过 shutdown_timeout 仍未结束的任务被取消并交还队列
+命令行入口见 app/scripts/task_worker.py
+"""
+import os
+import asyncio
+import socket
+import time
+from collections import Counter
+from typing import Dict, Iterable, Optional
+import logging
+
+from app.core.config import settings
+from app.tasks.queue import DEFAULT_QUEUE, Task, TaskQueue, get_task_queue
+from app.tasks.registry import get_task, registered_tasks
+
+logger = logging.getLogger(__name__)
+
+# 检查可见性超时任务的间隔（秒）
+RECOVER_INTERVAL = 30.0
+
+
+class Worker:
+    """任务worker"""
+
+    def __init__(
+        self,
+        task_queue: Optional[TaskQueue] = None,
+        queues: Iterable[str] = (DEFAULT_QUEUE,),
+        concurrency: int = settings.TASK_WORKER_CONCURRENCY,
+        visibility_timeout: float = settings.TASK_VISIBILITY_TIMEOUT,
+        poll_interval: float = settings.TASK_POLL_INTERVAL,
+        shutdown_timeout: float = 30.0,
+        worker_id: Optional[str] = None
+    ):
+        self.task_queue = task_queue or get_task_queue()
+        self.queues = list(queues)
+        self.concurrency = concurrency
+        self.visibility_timeout = visibility_timeout
+        self.poll_interval = poll_interval
+        self.shutdown_timeout = shutdown_timeout
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.processed = 0
+        self.failed = 0
+        self._running: Dict[int, asyncio.Task] = {}
+        self._running_names: Counter = Counter()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+
+    def stop(self):
+        """停止领取新任务"""
+        if not self._stopping:
+            logger.info(f"worker {self.worker_id} 正在停止，等待 {len(self._running)} 个执行中的任务")
+        self._stopping = True
+        if self._wakeup:
+            self._wakeup.set()
+
+    def _saturated_names(self):
+        """已达到并发上限的任务名称"""
+        return [
+            name for name, definition in registered_tasks().items()
+            if definition.max_concurrency and self._running_names[name] >= definition.max_concurrency
+        ]
+
+    async def run(self):
+        self._wakeup = asyncio.Event()
+        logger.info(
+            f"worker {self.worker_id} 启动: 队列 {self.queues}, 并发 {self.concurrency}, "
+            f"已注册任务 {sorted(registered_tasks())}"
+        )
+        last_recover = 0.0
+
+        while not self._stopping:
+            if time.monotonic() - last_recover >= RECOVER_INTERVAL:
+                last_recover = time.monotonic()
+                try:
+                    recovered = await asyncio.to_thread(self.task_queue.recover_expired)
+                    if recovered:
+                        logger.warning(f"处理了 {recovered} 个可见性超时的任务")
+                except Exception as e:
+                    logger.error(f"检查超时任务失败: {e}")
+
+            claimed = 0
+            # 逐个领取，使同类任务的并发上限在同一轮内也能生效
+            while not self._stopping and len(self._running) < self.concurrency:
+                try:
+                    tasks = await asyncio.to_thread(
+                        self.task_queue.claim,
+                        self.worker_id,
+                        self.queues,
+                        1,
+                        self.visibility_timeout,
+                        self._saturated_names()
+                    )
+                except Exception as e:
+                    logger.error(f"领取任务失败: {e}")
+                    break
+                if not tasks:
+                    break
+                for task in tasks:
+                    self._start(task)
+                    claimed += 1
+
+            if not claimed:
+                self._wakeup.clear()
+                try:
+                    # 有任务结束或收到停止信号时提前醒来
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+        await self._shutdown()
+
+    def _start(self, task: Task):
+        self._running_names[task.name] += 1
+        self._running[task.id] = asyncio.create_task(self._execute(task))
+
+    async def _shutdown(self):
+        if not self._running:
+            return
+        done, pending = await asyncio.wait(list(self._running.values()), timeout=self.shutdown_timeout)
+        for running in pending:
+            running.cancel()
+        if pending:
+            logger.warning(f"{len(pending)} 个任务未在 {self.shutdown_timeout} 秒内结束，已取消并交还队列")
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _heartbeat(self, task: Task):
+        interval = max(self.visibility_timeout / 3, 1.0)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                owned = await asyncio.to_thread(
+                    self.task_queue.extend, task.id, self.worker_id, self.visibility_timeout
+                )
+            except Exception as e:
+                logger.error(f"任务 #{task.id} 续期失败: {e}")
+                continue
+            if not owned:
+                logger.warning(f"任务 {task.name} #{task.id} 已超时被重新分配")
+                return
+
+    async def _execute(self, task: Task):
+        definition = get_task(task.name)
+        heartbeat = asyncio.create_task(self._heartbeat(task))
+        started = time.perf_counter()
+        try:
+            if definition is None:
+                raise LookupError(f"未注册的任务: {task.name}")
+            if definition.is_async:
+                call = definition.func(**task.payload)
+            else:
+                call = asyncio.to_thread(definition.func, **task.payload)
+            if definition.timeout:
+                result = await asyncio.wait_for(call, definition.timeout)
+            else:
+                result = await call
+        except asyncio.CancelledError:
+            # worker停止时被取消，交还队列由其他worker执行
+            await asyncio.to_thread(self.task_queue.release, task.id, self.worker_id)
+            raise
+        except Exception as e:
+            self.failed += 1
+            error = f"{type(e).__name__}: {e}"
+            await asyncio.to_thread(
+                self.task_queue.fail, task.id, self.worker_id, error, definition is not None
+            )
+        else:
+            self.processed += 1
+            await asyncio.to_thread(self.task_queue.complete, task.id, self.worker_id, result)
+            logger.info(f"任务 {task.name} #{task.id} 完成，耗时 {time.perf_counter() - started:.2f} 秒")
+        finally:
+            heartbeat.cancel()
+            self._running.pop(task.id, None)
+            self._running_names[task.name] -= 1
+            if self._wakeup:
+                self._wakeup.set()
@@ -4,18 +4,109 @@
 """
 import re
 import json
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Optional, Tuple
 import logging
 from urllib.parse import urlparse
+import numpy as np
+import pandas as pd
 import phonenumbers
 from email_validator import validate_email, EmailNotValidError
 
+from app.utils.email_domain_cache import EmailDomainCache
+from app.utils.keyword_matcher import KeywordMatcher
+
 logger = logging.getLogger(__name__)
 
+# 邮箱校验模式: syntax 仅语法检查（不联网）；deliverability 额外按域名检查可投递性（带缓存）
+EMAIL_VALIDATION_MODES = ("syntax", "deliverability")
+
+# clean_supplier_data 输出字段顺序（clean_batch 的结果列与之一致）
+CLEANED_COLUMNS = [
+    'company_name', 'company_name_en', 'contact_person', 'email', 'phone', 'website',
+    'country', 'province', 'city', 'address', 'supplier_type', 'scale',
+    'established_year', 'employee_count', 'annual_revenue', 'main_products'
+]
+
+# 标准化后的国家名称 -> phonenumbers 默认地区代码（用于解析不带国际区号的号码）
+COUNTRY_REGION_CODES = {
+    '中国': 'CN',
+    '日本': 'JP',
+    '韩国': 'KR',
+    '台湾省': 'TW',
+    '新加坡': 'SG',
+    '马来西亚': 'MY',
+    '泰国': 'TH',
+    '越南': 'VN',
+    '印尼': 'ID',
+    '菲律宾': 'PH',
+    '美国': 'US',
+    '德国': 'DE',
+    '荷兰': 'NL',
+    '英国': 'GB'
+}
+
+DEFAULT_PHONE_CACHE_SIZE = 50000
+
+# 半导体相关关键词 -> 权重；单个权重达到阈值的词即可判定相关，弱相关词需多个叠加
+# 英文/数字关键词按词边界匹配，中文关键词按子串匹配
+SEMICONDUCTOR_KEYWORDS = {
+    # 行业通用
+    'semiconductor': 1.0, 'semi': 0.5, 'chip': 0.8, 'ic': 0.6, 'ics': 0.6,
+    'integrated circuit': 1.0, 'wafer': 0.9, 'foundry': 0.8, 'fab': 0.6, 'fabless': 0.9,
+    '半导体': 1.0, '芯片': 0.9, '集成电路': 1.0, '晶圆': 0.9, '晶元': 0.8, '晶片': 0.8,
+    '微电子': 0.9, '电子': 0.5, '代工': 0.3,
+    # 器件类别
+    'led': 0.6, 'sensor': 0.6, 'mcu': 0.8, 'mosfet': 0.9, 'igbt': 0.9, 'diode': 0.6,
+    'transistor': 0.7, 'fpga': 0.9, 'asic': 0.9, 'soc': 0.7, 'dram': 0.9, 'nand': 0.8,
+    'flash memory': 0.7, 'mems': 0.8, 'power device': 0.7, 'optoelectronic': 0.7,
+    'rf front-end': 0.7, 'analog ic': 0.9,
+    '传感器': 0.6, '二极管': 0.6, '三极管': 0.6, '晶体管': 0.7, '功率器件': 0.7,
+    '存储器': 0.7, '处理器': 0.6, '单片机': 0.8, '光电': 0.5, '分立器件': 0.8,
+    '电子元器件': 0.7, '元器件': 0.5, '电路板': 0.5, '射频': 0.5,
+    # 材料、工艺与制程
+    'silicon': 0.6, 'sic': 0.6, 'gan': 0.6, 'gaas': 0.8, 'epitaxy': 0.8, 'photoresist': 0.9,
+    'lithography': 0.8, 'etching': 0.4, 'cmp': 0.4, 'sputtering': 0.4, 'packaging': 0.3,
+    'osat': 0.9, 'wire bonding': 0.6, 'flip chip': 0.8, 'bga': 0.6, 'qfn': 0.7,
+    '28nm': 0.9, '14nm': 0.9, '7nm': 0.9, '5nm': 0.9, '3nm': 0.9,
+    '硅片': 0.8, '碳化硅': 0.7, '氮化镓': 0.7, '砷化镓': 0.8, '外延': 0.6, '光刻': 0.8,
+    '光刻胶': 0.9, '刻蚀': 0.7, '封装测试': 0.8, '封测': 0.8, '键合': 0.5, '溅射': 0.4,
+    '靶材': 0.6, '电子特气': 0.7, '湿电子化学品': 0.7,
+    # 设备与电子制造
+    'pcb': 0.5, 'pcba': 0.5, 'smt': 0.4, 'probe card': 0.8, 'wafer prober': 0.9,
+    'deposition': 0.4, 'cvd': 0.5, 'pvd': 0.5, 'ald': 0.5, 'ion implant': 0.8,
+    'electronic': 0.3, 'electronics': 0.3, 'module': 0.2, 'component': 0.2,
+    '光刻机': 0.9, '刻蚀机': 0.9, '探针台': 0.8, '分选机': 0.6, '贴片': 0.3, '模组': 0.2
+}
+DEFAULT_RELEVANCE_THRESHOLD = 0.5
+
 class DataCleaner:
     """数据清洗器"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        email_validation: str = "syntax",
+        domain_cache: Optional[EmailDomainCache] = None,
+        phone_cache_size: int = DEFAULT_PHONE_CACHE_SIZE,
+        relevance_threshold: float = DEFAULT_RELEVANCE_THRESHOLD
+    ):
+        if email_validation not in EMAIL_VALIDATION_MODES:
+            raise ValueError(f"不支持的邮箱校验模式: {email_validation}")
+        self.email_validation = email_validation
+        # 可投递性检查每个域名只查询一次，结果持久化缓存
+        self.domain_cache = domain_cache
+        if email_validation == "deliverability" and domain_cache is None:
+            self.domain_cache = EmailDomainCache()
+        
+        # 电话号码标准化结果缓存（LRU），键为 (原始号码, 默认地区)
+        self.phone_cache_size = phone_cache_size
+        self.phone_cache_hits = 0
+        self.phone_cache_misses = 0
+        self._phone_cache: OrderedDict = OrderedDict()
+        # 采集管道在线程中并发清洗时保护缓存
+        self._phone_cache_lock = threading.Lock()
+        
         # 国家名称标准化映射
         self.country_mapping = {
             'china': '中国',
@@ -51,11 +142,10 @@ class DataCleaner:
             '经销商': 'distributor'
         }
         
-        # 半导体相关关键词
-        self.semiconductor_keywords = [
-            'semiconductor', 'chip', 'ic', 'wafer', 'pcb', 'led', 'sensor',
-            '半导体', '芯片', '集成电路', '晶圆', '传感器', '电子', '电路板'
-        ]
+        # 半导体相关关键词及权重，多个命中按 1 - Π(1 - w) 合并
+        self.semiconductor_keywords = dict(SEMICONDUCTOR_KEYWORDS)
+        self.relevance_threshold = relevance_threshold
+        self._relevance_matcher = KeywordMatcher(self.semiconductor_keywords)
     
     def clean_supplier_data(self, raw_data: Dict) -> Tuple[Dict, List[str]]:
         """
@@ -83,8 +173,11 @@ class DataCleaner:
         cleaned_data['email'] = email
         warnings.extend(email_warnings)
         
-        # 清洗电话
-        phone, phone_warnings = self._clean_phone(raw_data.get('phone', ''))
+        # 清洗电话（按国家推断默认地区，国家警告仍按原顺序追加）
+        country, country_warnings = self._clean_country(raw_data.get('country', ''))
+        phone, phone_warnings = self._clean_phone(
+            raw_data.get('phone', ''), COUNTRY_REGION_CODES.get(country)
+        )
         cleaned_data['phone'] = phone
         warnings.extend(phone_warnings)
         
@@ -94,7 +187,6 @@ class DataCleaner:
         warnings.extend(website_warnings)
         
         # 清洗地址信息
-        country, country_warnings = self._clean_country(raw_data.get('country', ''))
         cleaned_data['country'] = country
         warnings.extend(country_warnings)
         
@@ -131,6 +223,188 @@ class DataCleaner:
         
         return cleaned_data, warnings
     
+    def clean_batch(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        批量清洗供应商数据（按列向量化）
+        规则与 clean_supplier_data 一致，缺失值（NaN/None）视同字段不存在
+        返回: 清洗后的DataFrame（列同 CLEANED_COLUMNS，外加每行的 warnings 列表列），索引与输入一致
+        """
+        index = df.index
+        
+        def column(name: str) -> pd.Series:
+            if name not in df:
+                return pd.Series([None] * len(df), index=index, dtype=object)
+            return df[name].astype(object).where(df[name].notna(), None)
+        
+        result = pd.DataFrame(index=index)
+        warning_parts: List[pd.Series] = []
+        
+        # 公司名称
+        names = self._batch_text(column('company_name'))
+        name_empty = names == ''
+        warning_parts.append(self._batch_warning(name_empty, "公司名称为空"))
+        warning_parts.append(self._batch_warning(~name_empty & (names.str.len() < 3), "公司名称过短"))
+        warning_parts.append(self._batch_warning(names.str.len() > 200, "公司名称过长"))
+        result['company_name'] = names.str.slice(0, 200)
+        
+        result['company_name_en'] = self._batch_text(column('company_name_en'))
+        result['contact_person'] = self._batch_text(column('contact_person'))
+        
+        # 国家：类别映射（电话解析需要按国家推断默认地区，先行计算）
+        raw_country = column('country')
+        country_text = raw_country.fillna('').astype(str)
+        country_key = country_text.str.strip().str.lower()
+        mapped_country = country_key.astype('category').map(self.country_mapping).astype(object)
+        country_missing = country_key == ''
+        country_unknown = ~country_missing & mapped_country.isna()
+        country = mapped_country.where(~country_unknown, country_text.str.strip()).fillna('')
+        
+        # 邮箱、电话和网站逐个校验开销大，只对去重后的取值调用一次
+        self.prefetch_email_domains(column('email').dropna().unique())
+        regions = country.map(COUNTRY_REGION_CODES)
+        phone_cleaner = lambda value: self._clean_phone(value[0], value[1])
+        phone_keys = pd.Series(
+            list(zip(column('phone').fillna(''), regions.where(regions.notna(), None))),
+            index=index, dtype=object
+        )
+        for field, values_in, cleaner in (('email', column('email'), self._clean_email),
+                                          ('phone', phone_keys, phone_cleaner),
+                                          ('website', column('website'), self._clean_website)):
+            values, warnings = self._batch_apply_unique(values_in, cleaner)
+            result[field] = values
+            warning_parts.append(warnings)
+        
+        result['country'] = country
+        warning_parts.append(self._batch_warning(country_missing, "国家信息缺失"))
+        warning_parts.append(('未识别的国家名称: ' + country_text).where(country_unknown, None))
+        
+        result['province'] = self._batch_text(column('province'))
+        result['city'] = self._batch_text(column('city'))
+        result['address'] = self._batch_text(column('address'))
+        
+        # 供应商类型：类别映射
+        type_text = column('supplier_type').fillna('').astype(str)
+        type_key = type_text.str.strip().str.lower()
+        mapped_type = type_key.astype('category').map(self.supplier_type_mapping).astype(object)
+        type_missing = type_key == ''
+        type_unknown = ~type_missing & mapped_type.isna()
+        result['supplier_type'] = mapped_type.fillna('manufacturer')
+        warning_parts.append(self._batch_warning(type_missing, "供应商类型缺失，默认设为制造商"))
+        warning_parts.append(
+            ('未识别的供应商类型: ' + type_text + '，默认设为制造商').where(type_unknown, None)
+        )
+        
+        # 数值字段
+        employee_count, employee_parsed = self._batch_numeric(column('employee_count'))
+        annual_revenue, revenue_parsed = self._batch_numeric(column('annual_revenue'))
+        raw_year = column('established_year')
+        year, year_parsed = self._batch_numeric(raw_year.where(raw_year.astype(bool), None))
+        
+        # 整数转换：非有限值（nan/inf）与标量路径一样视为无效
+        employee_int = np.trunc(employee_count.where(employee_parsed & np.isfinite(employee_count)))
+        year_int = np.trunc(year.where(year_parsed & np.isfinite(year)))
+        
+        # 企业规模：先按员工数，再按年营收分档
+        has_employees = employee_int.notna() & (employee_int != 0)
+        has_revenue = ~has_employees & revenue_parsed & (annual_revenue != 0)
+        scale = pd.Series('medium', index=index, dtype=object)
+        scale[has_employees] = self._batch_bucket(employee_int[has_employees], (1000, 100, 50))
+        scale[has_revenue] = self._batch_bucket(annual_revenue[has_revenue], (10000, 1000, 100))
+        result['scale'] = scale
+        warning_parts.append(self._batch_warning(~has_employees & ~has_revenue, "无法确定企业规模，默认设为中型企业"))
+        
+        result['established_year'] = self._batch_to_int(year_int.where((year_int >= 1900) & (year_int <= 2024)))
+        result['employee_count'] = self._batch_to_int(employee_int)
+        result['annual_revenue'] = annual_revenue.astype(object).where(revenue_parsed, None)
+        
+        # 产品信息结构不定（列表/JSON/逗号分隔），逐行处理
+        products = column('main_products').map(lambda value: self._clean_products([] if value is None else value))
+        result['main_products'] = products.map(lambda item: item[0])
+        warning_parts.append(products.map(lambda item: item[1]))
+        
+        # 半导体相关性
+        combined = result['company_name'] + ' ' + result['company_name_en'] + ' ' + result['main_products'] + ' '
+        relevance = self._relevance_matcher.score_batch(combined.tolist())
+        not_relevant = pd.Series(
+            [score < self.relevance_threshold for score, _ in relevance], index=index
+        )
+        warning_parts.append(self._batch_warning(not_relevant, "未检测到半导体相关关键词"))
+        warning_parts.append(self._batch_warning(not_relevant, "企业可能与半导体行业不相关"))
+        
+        result['warnings'] = self._batch_collect_warnings(warning_parts, len(df))
+        logger.info(f"电话号码缓存: {self.phone_cache_stats()}")
+        return result
+    
+    def _batch_text(self, series: pd.Series) -> pd.Series:
+        """向量化的 _clean_text"""
+        text = series.fillna('').astype(str)
+        return text.str.strip().str.replace(r'\s+', ' ', regex=True)
+    
+    @staticmethod
+    def _batch_warning(mask: pd.Series, message: str) -> pd.Series:
+        return pd.Series(np.where(mask, message, None), index=mask.index, dtype=object)
+    
+    @staticmethod
+    def _batch_apply_unique(series: pd.Series, cleaner) -> Tuple[pd.Series, pd.Series]:
+        """对去重后的取值调用标量清洗函数，再按行展开"""
+        codes, uniques = pd.factorize(series.fillna(''), sort=False)
+        cleaned = [cleaner(value) for value in uniques]
+        values = np.array([item[0] for item in cleaned] + [''], dtype=object)
+        warnings = np.empty(len(cleaned) + 1, dtype=object)
+        warnings[:] = [item[1] for item in cleaned] + [[]]
+        return (
+            pd.Series(values[codes], index=series.index, dtype=object),
+            pd.Series(warnings[codes], index=series.index, dtype=object)
+        )
+    
+    def _batch_numeric(self, series: pd.Series) -> Tuple[pd.Series, pd.Series]:
+        """
+        float(str(value)) 转换：每个不同的取值只解析一次再按行展开
+        （pd.to_numeric 的十进制解析不保证正确舍入，个别取值与 float() 相差1ULP，因此不用）
+        返回: (浮点数列, 是否解析成功的布尔列)
+        """
+        present = series.notna()
+        codes, uniques = pd.factorize(series.astype(str).where(present, None), sort=False)
+        parsed_uniques = [self._clean_float(value) for value in uniques]
+        values = np.array(
+            [np.nan if value is None else value for value in parsed_uniques] + [np.nan], dtype=float
+        )
+        ok = np.array([value is not None for value in parsed_uniques] + [False], dtype=bool)
+        return (
+            pd.Series(values[codes], index=series.index, dtype=float),
+            pd.Series(ok[codes], index=series.index, dtype=bool)
+        )
+    
+    @staticmethod
+    def _batch_bucket(values: pd.Series, thresholds: Tuple[int, int, int]) -> np.ndarray:
+        large, medium, small = thresholds
+        return np.select(
+            [values >= large, values >= medium, values >= small],
+            ['large', 'medium', 'small'],
+            default='startup'
+        )
+    
+    @staticmethod
+    def _batch_to_int(values: pd.Series) -> pd.Series:
+        return pd.Series(
+            [int(value) if value == value else None for value in values],
+            index=values.index, dtype=object
+        )
+    
+    @staticmethod
+    def _batch_collect_warnings(parts: List[pd.Series], length: int) -> List[List[str]]:
+        """按 clean_supplier_data 的顺序合并每行的警告"""
+        rows: List[List[str]] = [[] for _ in range(length)]
+        for part in parts:
+            for i, value in enumerate(part.tolist()):
+                if value is None:
+                    continue
+                if isinstance(value, list):
+                    rows[i].extend(value)
+                else:
+                    rows[i].append(value)
+        return rows
+    
     def _clean_company_name(self, name: str) -> Tuple[str, List[str]]:
         """清洗公司名称"""
         warnings = []
@@ -161,15 +435,61 @@ class DataCleaner:
         email = email.strip().lower()
         
         try:
-            # 验证邮箱格式
-            valid = validate_email(email)
-            return valid.email, warnings
+            # 验证邮箱格式（不做DNS查询）
+            valid = validate_email(email, check_deliverability=False)
         except EmailNotValidError as e:
             warnings.append(f"邮箱格式无效: {str(e)}")
             return "", warnings
+        
+        if self.email_validation == "deliverability":
+            deliverable, reason = self.domain_cache.lookup(valid.ascii_domain)
+            if not deliverable:
+                warnings.append(f"邮箱域名无法投递: {reason}")
+                return "", warnings
+        
+        return valid.email, warnings
+    
+    def prefetch_email_domains(self, emails) -> None:
+        """批量导入前并发解析所有邮箱域名（仅可投递性检查模式下生效）"""
+        if self.email_validation != "deliverability":
+            return
+        
+        domains = set()
+        for email in emails:
+            if isinstance(email, str) and '@' in email:
+                domains.add(email.strip().lower().rsplit('@', 1)[1])
+        self.domain_cache.prefetch(domains)
+    
+    def _clean_phone(self, phone: str, region: Optional[str] = None) -> Tuple[str, List[str]]:
+        """清洗电话号码（带LRU缓存）；region 为不带国际区号时使用的默认地区代码"""
+        key = (phone, region)
+        with self._phone_cache_lock:
+            cached = self._phone_cache.get(key)
+            if cached is not None:
+                self.phone_cache_hits += 1
+                self._phone_cache.move_to_end(key)
+                return cached[0], list(cached[1])
+            self.phone_cache_misses += 1
+        
+        result = self._parse_phone(phone, region)
+        with self._phone_cache_lock:
+            self._phone_cache[key] = result
+            if len(self._phone_cache) > self.phone_cache_size:
+                self._phone_cache.popitem(last=False)
+        return result[0], list(result[1])
     
-    def _clean_phone(self, phone: str) -> Tuple[str, List[str]]:
-        """清洗电话号码"""
+    def phone_cache_stats(self) -> Dict:
+        """电话号码缓存命中统计"""
+        total = self.phone_cache_hits + self.phone_cache_misses
+        return {
+            "size": len(self._phone_cache),
+            "hits": self.phone_cache_hits,
+            "misses": self.phone_cache_misses,
+            "hit_ratio": round(self.phone_cache_hits / total, 4) if total else 0.0
+        }
+    
+    def _parse_phone(self, phone: str, region: Optional[str]) -> Tuple[str, List[str]]:
+        """解析并格式化电话号码"""
         warnings = []
         
         if not phone or not phone.strip():
@@ -180,7 +500,7 @@ class DataCleaner:
         
         try:
             # 尝试解析电话号码
-            parsed = phonenumbers.parse(cleaned_phone, None)
+            parsed = phonenumbers.parse(cleaned_phone, region)
             if phonenumbers.is_valid_number(parsed):
                 formatted = phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.INTERNATIONAL)
                 return formatted, warnings
@@ -313,24 +633,41 @@ class DataCleaner:
         
         return json.dumps(cleaned_products, ensure_ascii=False), warnings
     
-    def _validate_semiconductor_relevance(self, data: Dict) -> Tuple[bool, List[str]]:
-        """验证是否与半导体行业相关"""
-        warnings = []
-        
-        # 检查字段
-        text_to_check = [
+    def semiconductor_relevance(self, data: Dict) -> Tuple[float, List[str]]:
+        """
+        计算企业与半导体行业的相关度
+        返回: (相关度得分0~1, 命中的关键词列表)
+        """
+        return self._relevance_matcher.score(self._relevance_text(
             data.get('company_name', ''),
             data.get('company_name_en', ''),
             data.get('main_products', ''),
             data.get('company_description', '')
-        ]
-        
-        combined_text = ' '.join(text_to_check).lower()
+        ))
+    
+    def semiconductor_relevance_batch(self, records: List[Dict]) -> List[Tuple[float, List[str]]]:
+        """批量计算相关度"""
+        return self._relevance_matcher.score_batch(
+            self._relevance_text(
+                record.get('company_name', ''),
+                record.get('company_name_en', ''),
+                record.get('main_products', ''),
+                record.get('company_description', '')
+            )
+            for record in records
+        )
+    
+    @staticmethod
+    def _relevance_text(*parts) -> str:
+        return ' '.join(part or '' for part in parts)
+    
+    def _validate_semiconductor_relevance(self, data: Dict) -> Tuple[bool, List[str]]:
+        """验证是否与半导体行业相关"""
+        warnings = []
         
-        # 检查是否包含半导体相关关键词
-        for keyword in self.semiconductor_keywords:
-            if keyword.lower() in combined_text:
-                return True, warnings
+        score, _ = self.semiconductor_relevance(data)
+        if score >= self.relevance_threshold:
+            return True, warnings
         
         warnings.append("未检测到半导体相关关键词")
         return False, warnings
@@ -0,0 +1,144 @@
+"""
+邮箱域名可投递性缓存
+每个域名只做一次DNS(MX/A)查询，结果按TTL持久化到SQLite，
+批量导入前可并发解析所有未缓存的域名
+"""
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+import logging
+
+from email_validator import EmailUndeliverableError
+from email_validator.deliverability import validate_email_deliverability
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DOMAIN_CACHE_PATH = os.path.join(settings.LOCAL_DATA_DIR, "email_domain_cache.db")
+DEFAULT_DOMAIN_CACHE_TTL = 7 * 24 * 3600  # 7天
+DEFAULT_NEGATIVE_CACHE_TTL = 3600  # 不可投递结果只缓存1小时，避免临时DNS故障被长期记住
+DEFAULT_UNKNOWN_CACHE_TTL = 600  # 可投递性未知（DNS超时、查询异常）的结果只在内存中保留10分钟，不持久化
+DEFAULT_DNS_TIMEOUT = 5
+
+
+class EmailDomainCache:
+    """
+    域名可投递性缓存
+    lookup() 返回 (是否可投递, 原因)；可投递性未知（如DNS超时、无网络）时按可投递处理，
+    该结果只在内存中保留 unknown_ttl 秒（同一次导入中不再重复查询超时的域名），不写入持久化缓存
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = DEFAULT_DOMAIN_CACHE_PATH,
+        ttl: int = DEFAULT_DOMAIN_CACHE_TTL,
+        negative_ttl: int = DEFAULT_NEGATIVE_CACHE_TTL,
+        unknown_ttl: int = DEFAULT_UNKNOWN_CACHE_TTL,
+        timeout: int = DEFAULT_DNS_TIMEOUT,
+        max_workers: int = 16
+    ):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.unknown_ttl = unknown_ttl
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.lookups = 0
+        self.hits = 0
+        # {域名: (是否可投递, 原因, 过期时间)}
+        self._memory: Dict[str, Tuple[bool, str, float]] = {}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS email_domains ("
+                "domain TEXT PRIMARY KEY, deliverable INTEGER NOT NULL, "
+                "reason TEXT, checked_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def close(self):
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+    def _get_cached(self, domain: str) -> Optional[Tuple[bool, str]]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(domain)
+            if entry is None and self._conn:
+                row = self._conn.execute(
+                    "SELECT deliverable, reason, checked_at FROM email_domains WHERE domain = ?",
+                    (domain,)
+                ).fetchone()
+                if row:
+                    deliverable = bool(row[0])
+                    entry = (deliverable, row[1] or "", row[2] + (self.ttl if deliverable else self.negative_ttl))
+                    self._memory[domain] = entry
+        if entry and now < entry[2]:
+            return entry[0], entry[1]
+        return None
+
+    def _store(self, domain: str, deliverable: bool, reason: str):
+        checked_at = time.time()
+        with self._lock:
+            self._memory[domain] = (
+                deliverable, reason, checked_at + (self.ttl if deliverable else self.negative_ttl)
+            )
+            if self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO email_domains (domain, deliverable, reason, checked_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (domain, int(deliverable), reason, checked_at)
+                )
+                self._conn.commit()
+
+    def _resolve(self, domain: str) -> Tuple[bool, str]:
+        """实际执行DNS查询"""
+        with self._lock:
+            self.lookups += 1
+        try:
+            info = validate_email_deliverability(domain, domain, timeout=self.timeout)
+        except EmailUndeliverableError as e:
+            self._store(domain, False, str(e))
+            return False, str(e)
+        except Exception as e:
+            logger.warning(f"域名 {domain} 可投递性检查失败: {e}")
+            self._remember_unknown(domain)
+            return True, ""
+
+        if info.get("unknown-deliverability"):
+            self._remember_unknown(domain)
+            return True, ""
+        self._store(domain, True, "")
+        return True, ""
+
+    def _remember_unknown(self, domain: str):
+        """可投递性未知时按可投递处理，只在内存中短期保留，避免同一次导入反复等待DNS超时"""
+        with self._lock:
+            self._memory[domain] = (True, "", time.time() + self.unknown_ttl)
+
+    def lookup(self, domain: str) -> Tuple[bool, str]:
+        """查询单个域名（优先命中缓存）"""
+        domain = domain.lower()
+        cached = self._get_cached(domain)
+        if cached is not None:
+            with self._lock:
+                self.hits += 1
+            return cached
+        return self._resolve(domain)
+
+    def prefetch(self, domains: Iterable[str]):
+        """并发解析所有未缓存的域名"""
+        pending = {d.lower() for d in domains if d}
+        pending = [d for d in pending if self._get_cached(d) is None]
+        if not pending:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as executor:
+            list(executor.map(self._resolve, pending))
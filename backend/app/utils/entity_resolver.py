@@ -0,0 +1,334 @@
+"""
+供应商实体解析工具
+对公司名称做法律后缀、标点和地名归一化，结合分块键与名称分片的MinHash/LSH
+在亚二次复杂度内召回候选，再按网站域名、邮箱域名和电话综合打分，
+既可用于批量去重，也可用于入库时的在线查重
+"""
+import re
+import hashlib
+import unicodedata
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 法律形式后缀（按长度降序匹配）
+LEGAL_SUFFIXES_ZH = [
+    '股份有限公司', '有限责任公司', '集团有限公司', '有限公司', '股份公司',
+    '集团公司', '分公司', '总公司', '公司', '集团', '厂'
+]
+LEGAL_SUFFIXES_EN = [
+    'co ltd', 'company limited', 'co limited', 'corporation', 'incorporated',
+    'limited', 'company', 'corp', 'inc', 'ltd', 'llc', 'plc', 'gmbh',
+    'ag', 'bv', 'sa', 'kk', 'pte', 'sdn bhd', 'bhd', 'co', 'group', 'holdings'
+]
+
+# 常见地名，用于去除名称中的地域前缀或括号地名
+PLACE_NAMES = [
+    '北京', '上海', '天津', '重庆', '深圳', '广州', '东莞', '佛山', '珠海', '中山', '惠州',
+    '苏州', '无锡', '常州', '南京', '杭州', '宁波', '绍兴', '合肥', '武汉', '长沙', '成都',
+    '西安', '厦门', '福州', '青岛', '济南', '大连', '沈阳', '郑州', '香港', '台湾', '新竹',
+    '台北', '广东', '江苏', '浙江', '福建', '山东', '湖北', '湖南', '四川', '安徽', '河南',
+    '辽宁', '陕西', '中国'
+]
+
+# 行业通用词：去掉地域前缀后名称只剩这些词时不足以区分企业，保留地域前缀
+# （如 "中国电子科技集团有限公司" 与 "电子科技有限公司" 不能都归一为 "电子科技"）
+GENERIC_NAME_TERMS = [
+    '半导体', '微电子', '集成电路', '电子', '科技', '技术', '芯片', '电路', '光电', '电气', '电器',
+    '信息', '通信', '网络', '智能', '精密', '材料', '新材料', '器件', '设备', '系统', '控制',
+    '装备', '实业', '工业', '制造', '贸易', '国际', '发展', '投资', '控股', '集团', '能源', '工程', '新能源'
+]
+
+# 去掉地域前缀后，名称中除通用词外至少应保留的字数
+MIN_DISTINCTIVE_CHARS = 2
+
+# 公共邮箱域名不能作为同一企业的证据
+FREE_EMAIL_DOMAINS = {
+    'gmail.com', 'outlook.com', 'hotmail.com', 'yahoo.com', 'qq.com', '163.com', '126.com',
+    'sina.com', 'sohu.com', 'foxmail.com', 'aliyun.com', 'icloud.com', '139.com', 'yeah.net'
+}
+
+_PLACE_PATTERN = '|'.join(sorted(PLACE_NAMES, key=len, reverse=True))
+_PLACE_PREFIX_RE = re.compile(rf'^(?:{_PLACE_PATTERN})(?:省|市|区)?')
+_PLACE_PAREN_RE = re.compile(rf'[(（]\s*(?:{_PLACE_PATTERN})(?:省|市|区)?\s*[)）]')
+_GENERIC_TERMS_RE = re.compile('|'.join(sorted(GENERIC_NAME_TERMS, key=len, reverse=True)))
+_PUNCT_RE = re.compile(r'[^\w]+', re.UNICODE)
+_CJK_RE = re.compile(r'[一-鿿]')
+_EN_SUFFIX_RE = re.compile(
+    r'(?:\s+(?:' + '|'.join(re.escape(s) for s in sorted(LEGAL_SUFFIXES_EN, key=len, reverse=True)) + r'))+\s*$'
+)
+
+_MERSENNE_PRIME = (1 << 31) - 1
+
+
+def normalize_company_name(name: str) -> str:
+    """归一化公司名称：全半角、大小写、标点、法律后缀和地名"""
+    if not name:
+        return ""
+
+    text = unicodedata.normalize('NFKC', name).lower().strip()
+
+    # 去除括号中的地名，如 "XX电子(深圳)有限公司"
+    text = _PLACE_PAREN_RE.sub('', text)
+
+    if _CJK_RE.search(text):
+        text = _PUNCT_RE.sub('', text)
+        for suffix in LEGAL_SUFFIXES_ZH:
+            if text.endswith(suffix) and len(text) > len(suffix):
+                text = text[:-len(suffix)]
+                break
+        # 去除地域前缀，如 "深圳市XX电子"；剩余部分只有通用词时地域是名称的一部分，不去除
+        stripped = _PLACE_PREFIX_RE.sub('', text)
+        if stripped != text and len(_GENERIC_TERMS_RE.sub('', stripped)) >= MIN_DISTINCTIVE_CHARS:
+            text = stripped
+        return text
+
+    text = _PUNCT_RE.sub(' ', text).strip()
+    text = _EN_SUFFIX_RE.sub('', ' ' + text).strip()
+    return re.sub(r'\s+', ' ', text)
+
+
+def extract_domain(value: str) -> str:
+    """从网址或邮箱中提取注册域名（去掉www前缀）"""
+    if not value:
+        return ""
+
+    value = value.strip().lower()
+    if '@' in value and '://' not in value:
+        domain = value.rsplit('@', 1)[1]
+    else:
+        if '://' not in value:
+            value = 'http://' + value
+        domain = urlparse(value).netloc.split(':')[0]
+
+    if domain.startswith('www.'):
+        domain = domain[4:]
+    return domain
+
+
+def normalize_phone(phone: str) -> str:
+    """电话号码只保留末尾8位数字，规避国家码和区号书写差异"""
+    digits = re.sub(r'\D', '', phone or '')
+    return digits[-8:] if len(digits) >= 7 else ""
+
+
+def name_shingles(normalized: str) -> Set[str]:
+    """中文按2字分片，其余按3字符分片"""
+    if not normalized:
+        return set()
+
+    n = 2 if _CJK_RE.search(normalized) else 3
+    compact = normalized.replace(' ', '_')
+    if len(compact) <= n:
+        return {compact}
+    return {compact[i:i + n] for i in range(len(compact) - n + 1)}
+
+
+def _stable_hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=4).digest(), 'big')
+
+
+class MinHasher:
+    """基于通用哈希族 (a*x + b) mod p 的MinHash签名（numpy向量化）"""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self.a = rng.randint(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingles: Iterable[str]) -> Tuple[int, ...]:
+        hashes = np.fromiter((_stable_hash(s) for s in shingles), dtype=np.uint64)
+        if not hashes.size:
+            return tuple([_MERSENNE_PRIME] * self.num_perm)
+        # a < 2^31, h < 2^32，乘积不会溢出uint64
+        permuted = (np.outer(self.a, hashes) + self.b[:, None]) % _MERSENNE_PRIME
+        return tuple(permuted.min(axis=1).tolist())
+
+
+class EntityRecord:
+    """参与实体解析的供应商特征"""
+
+    __slots__ = ('record_id', 'name', 'name_en', 'name_shingles', 'name_en_shingles',
+                 'country', 'website_domain', 'email_domain', 'phone')
+
+    def __init__(self, record_id: Hashable, data: Dict):
+        self.record_id = record_id
+        self.name = normalize_company_name(data.get('company_name', ''))
+        self.name_en = normalize_company_name(data.get('company_name_en', ''))
+        self.name_shingles = name_shingles(self.name)
+        self.name_en_shingles = name_shingles(self.name_en)
+        self.country = (data.get('country') or '').strip().lower()
+        self.website_domain = extract_domain(data.get('website', ''))
+        email_domain = extract_domain(data.get('email', ''))
+        self.email_domain = '' if email_domain in FREE_EMAIL_DOMAINS else email_domain
+        self.phone = normalize_phone(data.get('phone', ''))
+
+    @property
+    def shingles(self) -> Set[str]:
+        return self.name_shingles | self.name_en_shingles
+
+    def blocking_keys(self) -> List[str]:
+        """精确分块键：任一相同即成为候选"""
+        keys = []
+        if self.name:
+            keys.append(f'name:{self.name}')
+        if self.name_en:
+            keys.append(f'name:{self.name_en}')
+        if self.website_domain:
+            keys.append(f'web:{self.website_domain}')
+        if self.email_domain:
+            keys.append(f'mail:{self.email_domain}')
+        if self.phone:
+            keys.append(f'phone:{self.phone}')
+        return keys
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class EntityResolver:
+    """
+    供应商实体解析器
+    用法:
+        resolver = EntityResolver()
+        resolver.add(1, {...})
+        resolver.match({...})          # 在线查重，返回 (record_id, score) 或 None
+        resolver.find_duplicates(rows) # 批量去重，返回重复簇
+    """
+
+    def __init__(self, threshold: float = 0.75, num_perm: int = 128, bands: int = 16):
+        if num_perm % bands:
+            raise ValueError("num_perm 必须能被 bands 整除")
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.records: Dict[Hashable, EntityRecord] = {}
+        self._lsh_buckets: Dict[Tuple[int, Tuple[int, ...]], List[Hashable]] = {}
+        self._blocks: Dict[str, List[Hashable]] = {}
+        self._record_bands: Dict[Hashable, List[Tuple[int, Tuple[int, ...]]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _band_keys(self, record: EntityRecord) -> List[Tuple[int, Tuple[int, ...]]]:
+        if not record.shingles:
+            return []
+        signature = self.hasher.signature(record.shingles)
+        r = self.rows_per_band
+        return [(band, signature[band * r:(band + 1) * r]) for band in range(self.bands)]
+
+    def add(self, record_id: Hashable, data: Dict) -> EntityRecord:
+        """将记录加入索引"""
+        record = EntityRecord(record_id, data)
+        self.records[record_id] = record
+        self._record_bands[record_id] = self._band_keys(record)
+        for band_key in self._record_bands[record_id]:
+            self._lsh_buckets.setdefault(band_key, []).append(record_id)
+        for block_key in record.blocking_keys():
+            self._blocks.setdefault(block_key, []).append(record_id)
+        return record
+
+    def candidates(self, record: EntityRecord) -> Set[Hashable]:
+        """通过LSH分桶和精确分块键召回候选"""
+        found: Set[Hashable] = set()
+        band_keys = self._record_bands.get(record.record_id) if record.record_id in self.records else None
+        for band_key in band_keys if band_keys is not None else self._band_keys(record):
+            found.update(self._lsh_buckets.get(band_key, ()))
+        for block_key in record.blocking_keys():
+            found.update(self._blocks.get(block_key, ()))
+        found.discard(record.record_id)
+        return found
+
+    def score(self, a: EntityRecord, b: EntityRecord) -> float:
+        """综合相似度评分 0-1"""
+        if a.name and a.name in (b.name, b.name_en) or a.name_en and a.name_en in (b.name, b.name_en):
+            name_score = 1.0
+        else:
+            name_score = max(
+                _jaccard(a.name_shingles, b.name_shingles),
+                _jaccard(a.name_en_shingles, b.name_en_shingles)
+            )
+
+        # 联系方式一致是强证据，但单凭联系方式不足以判定为同一企业
+        evidence = 0.0
+        if a.website_domain and a.website_domain == b.website_domain:
+            evidence += 0.35
+        if a.email_domain and a.email_domain == b.email_domain:
+            evidence += 0.25
+        if a.phone and a.phone == b.phone:
+            evidence += 0.25
+
+        score = name_score + min(evidence, 0.5)
+        if a.country and b.country and a.country != b.country:
+            score -= 0.3
+        return max(0.0, min(score, 1.0))
+
+    def match(self, data: Dict, record_id: Hashable = None) -> Optional[Tuple[Hashable, float]]:
+        """在线查重：返回得分最高且超过阈值的已有记录"""
+        record = EntityRecord(record_id, data)
+        best: Optional[Tuple[Hashable, float]] = None
+        for candidate_id in self.candidates(record):
+            candidate_score = self.score(record, self.records[candidate_id])
+            if candidate_score >= self.threshold and (best is None or candidate_score > best[1]):
+                best = (candidate_id, candidate_score)
+        return best
+
+    def find_duplicates(self, rows: Iterable[Tuple[Hashable, Dict]]) -> List[List[Hashable]]:
+        """批量去重：索引所有记录并返回包含两条及以上记录的重复簇"""
+        for record_id, data in rows:
+            self.add(record_id, data)
+
+        parent: Dict[Hashable, Hashable] = {}
+
+        def find(x):
+            parent.setdefault(x, x)
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for record_id, record in self.records.items():
+            for candidate_id in self.candidates(record):
+                if self.score(record, self.records[candidate_id]) >= self.threshold:
+                    root_a, root_b = find(record_id), find(candidate_id)
+                    if root_a != root_b:
+                        parent[root_b] = root_a
+
+        clusters: Dict[Hashable, List[Hashable]] = {}
+        for record_id in self.records:
+            clusters.setdefault(find(record_id), []).append(record_id)
+        return [members for members in clusters.values() if len(members) > 1]
+
+
+def deduplicate_records(records: List[Dict], threshold: float = 0.75) -> List[Dict]:
+    """
+    对内存中的供应商字典列表去重
+    每个重复簇保留第一条记录，并用簇内其他记录补全其缺失字段
+    """
+    resolver = EntityResolver(threshold=threshold)
+    clusters = resolver.find_duplicates(enumerate(records))
+
+    merged_into: Dict[int, int] = {}
+    for members in clusters:
+        members.sort()
+        for duplicate in members[1:]:
+            merged_into[duplicate] = members[0]
+
+    unique: Dict[int, Dict] = {}
+    for index, record in enumerate(records):
+        if index not in merged_into:
+            unique[index] = dict(record)
+    for duplicate, canonical in merged_into.items():
+        for field, value in records[duplicate].items():
+            if value and not unique[canonical].get(field):
+                unique[canonical][field] = value
+
+    return [unique[index] for index in sorted(unique)]
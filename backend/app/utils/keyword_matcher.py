@@ -0,0 +1,124 @@
+"""
+多模式关键词匹配
+基于Aho-Corasick自动机，一次扫描文本即可找出词表中所有命中的关键词，
+复杂度与文本长度和命中数线性相关、与词表大小无关；
+英文/数字关键词要求词边界（避免 'ic' 命中 'electronic'），中文关键词按子串匹配
+"""
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _is_word_char(char: str) -> bool:
+    """ASCII字母数字视为单词字符；中文等非ASCII字符天然构成边界"""
+    return char.isascii() and char.isalnum()
+
+
+class KeywordMatcher:
+    """
+    加权关键词匹配器
+    weights: 关键词 -> 权重(0~1)，匹配不区分大小写
+    score() 以 1 - Π(1 - w) 合并命中词的权重，多个弱相关词叠加后也能达到阈值
+    """
+
+    def __init__(self, weights: Dict[str, float]):
+        self.weights: Dict[str, float] = {}
+        for term, weight in weights.items():
+            term = term.strip().lower()
+            if term:
+                self.weights[term] = max(self.weights.get(term, 0.0), float(weight))
+
+        self.terms: List[str] = list(self.weights)
+        # 关键词首尾是否为单词字符，决定匹配时是否需要检查对应一侧的边界
+        self._boundaries: List[Tuple[bool, bool]] = [
+            (_is_word_char(term[0]), _is_word_char(term[-1])) for term in self.terms
+        ]
+        self._build()
+
+    def _build(self):
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+
+        for index, term in enumerate(self.terms):
+            state = 0
+            for char in term:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(index)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(char, 0)
+                outputs[next_state] = outputs[next_state] + outputs[fail[next_state]]
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+
+    def find_all(self, text: str) -> List[Tuple[str, int, int]]:
+        """返回所有满足边界条件的命中 (关键词, 起始位置, 结束位置)"""
+        if not text:
+            return []
+        text = text.lower()
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        length = len(text)
+        matches = []
+        state = 0
+
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not outputs[state]:
+                continue
+            for index in outputs[state]:
+                term = self.terms[index]
+                start = position - len(term) + 1
+                check_start, check_end = self._boundaries[index]
+                if check_start and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if check_end and position + 1 < length and _is_word_char(text[position + 1]):
+                    continue
+                matches.append((term, start, position + 1))
+
+        return matches
+
+    def score(self, text: str) -> Tuple[float, List[str]]:
+        """返回 (相关度得分, 命中的关键词列表（按首次出现顺序去重）)"""
+        matched: List[str] = []
+        seen = set()
+        for term, _, _ in self.find_all(text):
+            if term not in seen:
+                seen.add(term)
+                matched.append(term)
+
+        remaining = 1.0
+        for term in matched:
+            remaining *= 1.0 - self.weights[term]
+        return round(1.0 - remaining, 4), matched
+
+    def score_batch(self, texts: Iterable[str]) -> List[Tuple[float, List[str]]]:
+        """批量打分，重复文本只计算一次"""
+        cache: Dict[str, Tuple[float, List[str]]] = {}
+        results = []
+        for text in texts:
+            text = text or ""
+            if text not in cache:
+                cache[text] = self.score(text)
+            score, matched = cache[text]
+            results.append((score, list(matched)))
+        return results
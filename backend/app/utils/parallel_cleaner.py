@@ -0,0 +1,112 @@
+"""
+多进程数据清洗
+将输入记录按块分发到进程池，每个工作进程复用一个DataCleaner实例，
+按输入顺序流式返回清洗结果并汇总警告信息
+"""
+import os
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import logging
+
+from app.utils.data_cleaner import DataCleaner
+
+logger = logging.getLogger(__name__)
+
+# 工作进程内的清洗器实例，由进程池initializer创建
+_worker_cleaner: Optional[DataCleaner] = None
+
+
+def _init_worker(cleaner_kwargs: Dict):
+    global _worker_cleaner
+    _worker_cleaner = DataCleaner(**cleaner_kwargs)
+
+
+def _clean_chunk(records: List[Dict]) -> List[Tuple[Dict, List[str]]]:
+    return [_worker_cleaner.clean_supplier_data(record) for record in records]
+
+
+def _chunked(records: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class ParallelCleaner:
+    """
+    并行清洗执行器
+    用法:
+        with ParallelCleaner(workers=4) as executor:
+            for cleaned_data, warnings in executor.clean(records):
+                ...
+        executor.warning_counts  # 各类警告出现次数
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        chunk_size: int = 500,
+        max_pending_chunks: Optional[int] = None,
+        **cleaner_kwargs
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        # 限制在途批次数量，输入再大内存占用也有上限
+        self.max_pending_chunks = max_pending_chunks or self.workers * 2
+        self.cleaner_kwargs = cleaner_kwargs
+        self.processed = 0
+        self.records_with_warnings = 0
+        self.warning_counts: Counter = Counter()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self):
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.cleaner_kwargs,)
+        )
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if self._executor:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def clean(self, records: Iterable[Dict]) -> Iterator[Tuple[Dict, List[str]]]:
+        """按输入顺序流式返回 (清洗后的数据, 警告信息列表)"""
+        if self._executor is None:
+            raise RuntimeError("请在 with ParallelCleaner(...) 上下文中调用 clean()")
+
+        pending = deque()
+        chunks = _chunked(records, self.chunk_size)
+
+        for chunk in chunks:
+            pending.append(self._executor.submit(_clean_chunk, chunk))
+            if len(pending) >= self.max_pending_chunks:
+                yield from self._collect(pending.popleft().result())
+
+        while pending:
+            yield from self._collect(pending.popleft().result())
+
+    def _collect(self, results: List[Tuple[Dict, List[str]]]) -> Iterator[Tuple[Dict, List[str]]]:
+        for cleaned_data, warnings in results:
+            self.processed += 1
+            if warnings:
+                self.records_with_warnings += 1
+                self.warning_counts.update(warnings)
+            yield cleaned_data, warnings
+
+    def warning_summary(self, top: int = 10) -> Dict:
+        """警告汇总"""
+        return {
+            "processed": self.processed,
+            "records_with_warnings": self.records_with_warnings,
+            "top_warnings": self.warning_counts.most_common(top)
+        }
@@ -0,0 +1,194 @@
+"""
+流式处理管道
+各阶段为异步生成器函数（每个输入产出0到多个输出），阶段之间用有界队列连接：
+下游处理不过来时上游在 put() 处等待（反压），内存占用只取决于队列长度和批大小，与数据总量无关。
+每个阶段可单独配置并发数和批量大小，并统计吞吐量
+"""
+import asyncio
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class StageMetrics:
+    """单个阶段的运行统计"""
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.received = 0
+        self.emitted = 0
+        self.errors = 0
+        self.active = 0
+        self.busy_seconds = 0.0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict:
+        elapsed = 0.0
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        return {
+            "workers": self.workers,
+            "received": self.received,
+            "emitted": self.emitted,
+            "errors": self.errors,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "elapsed_seconds": round(elapsed, 3),
+            "throughput": round(self.received / elapsed, 2) if elapsed else 0.0
+        }
+
+
+class Stage:
+    """
+    管道阶段
+    func: 异步生成器函数，batch_size 为空时接收单个输入，否则接收一个列表（最多 batch_size 个，
+    或等待 batch_timeout 秒后不足一批也提交）
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Any], AsyncIterator[Any]],
+        workers: int = 1,
+        queue_size: int = 100,
+        batch_size: Optional[int] = None,
+        batch_timeout: float = 1.0
+    ):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+
+
+class Pipeline:
+    """
+    用法:
+        pipeline = Pipeline(source(), [Stage("fetch", fetch, workers=10), Stage("write", write, batch_size=500)])
+        metrics = await pipeline.run()
+    最后一个阶段的输出被丢弃；阶段内的异常只计入 errors，不中断管道
+    """
+
+    def __init__(self, source: AsyncIterator[Any], stages: List[Stage]):
+        if not stages:
+            raise ValueError("管道至少需要一个阶段")
+        self.source = source
+        self.stages = stages
+        self.metrics: Dict[str, StageMetrics] = {stage.name: StageMetrics(stage.name, stage.workers) for stage in stages}
+        self._queues: List[asyncio.Queue] = []
+        self._cancelled = False
+
+    def is_idle(self, stage_count: Optional[int] = None) -> bool:
+        """前 stage_count 个阶段的队列为空且没有正在处理的输入"""
+        stage_count = len(self.stages) if stage_count is None else stage_count
+        return all(
+            self._queues[i].empty() and self.metrics[self.stages[i].name].active == 0
+            for i in range(stage_count)
+        )
+
+    def cancel(self):
+        """停止从数据源读取，已在管道中的数据会处理完"""
+        self._cancelled = True
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return {name: metrics.to_dict() for name, metrics in self.metrics.items()}
+
+    async def run(self) -> Dict[str, Dict]:
+        self._queues = [asyncio.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        finished_workers = [0] * len(self.stages)
+
+        async def feed():
+            try:
+                async for item in self.source:
+                    if self._cancelled:
+                        break
+                    await self._queues[0].put(item)
+            finally:
+                for _ in range(self.stages[0].workers):
+                    await self._queues[0].put(_DONE)
+
+        async def worker(index: int):
+            stage = self.stages[index]
+            metrics = self.metrics[stage.name]
+            if metrics.started_at is None:
+                metrics.started_at = time.monotonic()
+            try:
+                if stage.batch_size:
+                    await self._run_batched(index)
+                else:
+                    while True:
+                        item = await self._queues[index].get()
+                        if item is _DONE:
+                            break
+                        metrics.received += 1
+                        await self._process(index, item)
+            finally:
+                finished_workers[index] += 1
+                if finished_workers[index] == stage.workers:
+                    metrics.finished_at = time.monotonic()
+                    if index + 1 < len(self.stages):
+                        for _ in range(self.stages[index + 1].workers):
+                            await self._queues[index + 1].put(_DONE)
+
+        tasks = [asyncio.create_task(feed())]
+        for index, stage in enumerate(self.stages):
+            tasks.extend(asyncio.create_task(worker(index)) for _ in range(stage.workers))
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        return self.snapshot()
+
+    async def _run_batched(self, index: int):
+        stage = self.stages[index]
+        metrics = self.metrics[stage.name]
+        queue = self._queues[index]
+        batch: List[Any] = []
+        done = False
+
+        while not done:
+            try:
+                timeout = stage.batch_timeout if batch else None
+                item = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                item = None
+            else:
+                if item is _DONE:
+                    done = True
+                else:
+                    metrics.received += 1
+                    batch.append(item)
+                    if len(batch) < stage.batch_size:
+                        continue
+
+            if batch:
+                current, batch = batch, []
+                await self._process(index, current)
+
+    async def _process(self, index: int, item: Any):
+        stage = self.stages[index]
+        metrics = self.metrics[stage.name]
+        output = self._queues[index + 1] if index + 1 < len(self.stages) else None
+
+        metrics.active += 1
+        started = time.perf_counter()
+        try:
+            async for result in stage.func(item):
+                metrics.emitted += 1
+                if output is not None:
+                    await output.put(result)
+        except Exception as e:
+            metrics.errors += 1
+            logger.error(f"管道阶段 {stage.name} 处理失败: {e}")
+        finally:
+            metrics.busy_seconds += time.perf_counter() - started
+            metrics.active -= 1
@@ -0,0 +1,42 @@
+"""
+异步令牌桶限流
+按 rate/per 匀速补充令牌，允许最多 burst 个请求的突发；令牌不足时 acquire() 等待
+"""
+import asyncio
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """
+    用法:
+        limiter = RateLimiter(30, per=60)   # 每分钟30次
+        await limiter.acquire()
+    """
+
+    def __init__(self, rate: float, per: float = 60.0, burst: Optional[int] = None):
+        if rate <= 0 or per <= 0:
+            raise ValueError("rate 和 per 必须大于0")
+        self.rate = rate
+        self.per = per
+        self.burst = burst or max(int(rate), 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.waited_seconds = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate / self.per)
+        self._updated = now
+
+    async def acquire(self, tokens: int = 1):
+        # 加锁保证等待中的请求按到达顺序获得令牌
+        async with self._lock:
+            self._refill()
+            if self._tokens < tokens:
+                wait = (tokens - self._tokens) * self.per / self.rate
+                self.waited_seconds += wait
+                await asyncio.sleep(wait)
+                self._refill()
+            self._tokens -= tokens
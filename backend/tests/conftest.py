@@ -0,0 +1,25 @@
+"""
+测试公共配置
+数据库相关测试使用临时SQLite文件，DATABASE_URL 必须在导入 app.core.database 之前设置
+"""
+import os
+import tempfile
+
+_db_dir = tempfile.mkdtemp(prefix="semix-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    """每个测试使用全新的表结构，结束后清空"""
+    from app.core.database import Base, SessionLocal, create_tables, engine
+
+    create_tables()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
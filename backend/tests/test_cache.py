@@ -0,0 +1,58 @@
+"""
+缓存单飞测试
+"""
+import asyncio
+
+import pytest
+
+from app.core.cache import _inflight, single_flight
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_one_computation():
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "value"
+
+    results = await asyncio.gather(*(single_flight("test", "shared", compute) for _ in range(5)))
+
+    assert results == ["value"] * 5
+    assert len(calls) == 1
+    assert "shared" not in _inflight
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_followers():
+    started = asyncio.Event()
+
+    async def compute():
+        started.set()
+        await asyncio.sleep(0.05)
+        return "value"
+
+    leader = asyncio.create_task(single_flight("test", "leader", compute))
+    await started.wait()
+    follower = asyncio.create_task(single_flight("test", "leader", compute))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "value"
+    assert leader.cancelled()
+    assert "leader" not in _inflight
+
+
+@pytest.mark.asyncio
+async def test_single_flight_propagates_errors_to_all_callers():
+    async def compute():
+        await asyncio.sleep(0.01)
+        raise ValueError("查询失败")
+
+    results = await asyncio.gather(
+        *(single_flight("test", "failing", compute) for _ in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert "failing" not in _inflight
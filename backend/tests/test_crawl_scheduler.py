@@ -0,0 +1,257 @@
+"""
+CrawlScheduler 测试
+用 aiohttp.web 启动本地测试服务器，验证同主机并发上限、请求间隔、重试/退避、错误路径和robots规则
+"""
+import asyncio
+import socket
+import time
+from contextlib import asynccontextmanager
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.crawlers.crawl_scheduler import CrawlScheduler
+from app.crawlers.robots import RobotsCache
+
+
+class Recorder:
+    """记录测试服务器收到的请求时间与同时处理中的请求数"""
+
+    def __init__(self):
+        self.times = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def enter(self):
+        self.times.append(time.monotonic())
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def leave(self):
+        self.in_flight -= 1
+
+
+@asynccontextmanager
+async def serve(routes):
+    app = web.Application()
+    for path, handler in routes.items():
+        app.router.add_get(path, handler)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        yield server
+    finally:
+        await server.close()
+
+
+def slow_handler(recorder: Recorder, duration: float = 0.05):
+    async def handler(request):
+        await recorder.enter()
+        try:
+            await asyncio.sleep(duration)
+            return web.Response(text="ok")
+        finally:
+            recorder.leave()
+    return handler
+
+
+def host_stats(scheduler: CrawlScheduler) -> dict:
+    """只请求了一个主机时返回该主机的统计"""
+    (stats,) = scheduler.stats().values()
+    return stats
+
+
+def unused_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.mark.asyncio
+async def test_limits_concurrency_per_host():
+    recorder = Recorder()
+    async with serve({"/page": slow_handler(recorder)}) as server, aiohttp.ClientSession() as session:
+        scheduler = CrawlScheduler(session, delay_range=(0, 0), max_per_host=2)
+        results = await asyncio.gather(*(scheduler.fetch(str(server.make_url(f"/page?i={i}"))) for i in range(6)))
+
+    assert all(result.ok for result in results)
+    assert recorder.max_in_flight == 2
+    assert host_stats(scheduler)["requests"] == 6
+
+
+@pytest.mark.asyncio
+async def test_different_hosts_run_in_parallel():
+    recorder = Recorder()
+    handler = slow_handler(recorder, 0.1)
+    async with serve({"/page": handler}) as first, serve({"/page": handler}) as second, \
+            aiohttp.ClientSession() as session:
+        scheduler = CrawlScheduler(session, delay_range=(0, 0), max_per_host=1)
+        await asyncio.gather(
+            scheduler.fetch(str(first.make_url("/page"))),
+            scheduler.fetch(str(second.make_url("/page")))
+        )
+
+    assert recorder.max_in_flight == 2
+    assert len(scheduler.hosts) == 2
+
+
+@pytest.mark.asyncio
+async def test_spaces_requests_to_same_host_by_delay():
+    recorder = Recorder()
+    async with serve({"/page": slow_handler(recorder, 0)}) as server, aiohttp.ClientSession() as session:
+        scheduler = CrawlScheduler(session, max_per_host=3)
+        scheduler.set_host_delay(f"127.0.0.1:{server.port}", 0.1)
+        await asyncio.gather(*(scheduler.fetch(str(server.make_url(f"/page?i={i}"))) for i in range(3)))
+
+    gaps = [later - earlier for earlier, later in zip(recorder.times, recorder.times[1:])]
+    assert len(gaps) == 2
+    assert all(gap >= 0.09 for gap in gaps)
+
+
+@pytest.mark.asyncio
+async def test_retries_retryable_status_then_succeeds():
+    attempts = []
+
+    async def flaky(request):
+        attempts.append(time.monotonic())
+        if len(attempts) <= 2:
+            return web.Response(status=503)
+        return web.Response(text="ok")
+
+    async with serve({"/flaky": flaky}) as server, aiohttp.ClientSession() as session:
+        scheduler = CrawlScheduler(session, delay_range=(0, 0), max_retries=3, backoff_base=0.01)
+        result = await scheduler.fetch(str(server.make_url("/flaky")))
+
+    assert result.ok and result.text() == "ok"
+    stats = host_stats(scheduler)
+    assert stats == {"requests": 3, "retries": 2, "failures": 0, "blocked": 0}
+
+
+@pytest.mark.asyncio
+async def test_honours_retry_after():
+    attempts = []
+
+    async def limited(request):
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            return web.Response(status=429, headers={"Retry-After": "0.2"})
+        return web.Response(text="ok")
+
+    async with serve({"/limited": limited}) as server, aiohttp.ClientSession() as session:
+        scheduler = CrawlScheduler(session, delay_range=(0, 0), backoff_base=0.01)
+        result = await scheduler.fetch(str(server.make_url("/limited")))
+
+    assert result.ok
+    assert attempts[1] - attempts[0] >= 0.19
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_retries():
+    async def broken(request):
+        return web.Response(status=500)
+
+    async with serve({"/broken": broken}) as server, aiohttp.ClientSession() as session:
+        scheduler = CrawlScheduler(session, delay_range=(0, 0), max_retries=2, backoff_base=0.01)
+        result = await scheduler.fetch(str(server.make_url("/broken")))
+
+    assert result is None
+    stats = host_stats(scheduler)
+    assert stats == {"requests": 3, "retries": 2, "failures": 1, "blocked": 0}
+
+
+@pytest.mark.asyncio
+async def test_returns_non_retryable_status_without_retrying():
+    async def missing(request):
+        return web.Response(status=404)
+
+    async with serve({"/missing": missing}) as server, aiohttp.ClientSession() as session:
+        scheduler = CrawlScheduler(session, delay_range=(0, 0), backoff_base=0.01)
+        result = await scheduler.fetch(str(server.make_url("/missing")))
+
+    assert result.status == 404 and not result.ok
+    assert host_stats(scheduler)["requests"] == 1
+
+
+@pytest.mark.asyncio
+async def test_connection_error_is_retried_then_fails():
+    url = f"http://127.0.0.1:{unused_port()}/page"
+    async with aiohttp.ClientSession() as session:
+        scheduler = CrawlScheduler(session, delay_range=(0, 0), max_retries=1, backoff_base=0.01)
+        result = await scheduler.fetch(url)
+
+    assert result is None
+    stats = host_stats(scheduler)
+    assert stats["requests"] == 2 and stats["failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_timeout_is_retried_then_fails():
+    async def hanging(request):
+        await asyncio.sleep(1)
+        return web.Response(text="late")
+
+    timeout = aiohttp.ClientTimeout(total=0.1)
+    async with serve({"/hang": hanging}) as server, aiohttp.ClientSession(timeout=timeout) as session:
+        scheduler = CrawlScheduler(session, delay_range=(0, 0), max_retries=1, backoff_base=0.01)
+        result = await scheduler.fetch(str(server.make_url("/hang")))
+
+    assert result is None
+    stats = host_stats(scheduler)
+    assert stats["requests"] == 2 and stats["retries"] == 1 and stats["failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_robots_disallow_and_crawl_delay():
+    recorder = Recorder()
+
+    async def robots(request):
+        return web.Response(text="User-agent: *\nDisallow: /private\nCrawl-delay: 0.1\n")
+
+    routes = {"/robots.txt": robots, "/page": slow_handler(recorder, 0), "/private": slow_handler(recorder, 0)}
+    async with serve(routes) as server, aiohttp.ClientSession() as session:
+        scheduler = CrawlScheduler(session, delay_range=(0, 0), robots=RobotsCache(session))
+        blocked = await scheduler.fetch(str(server.make_url("/private")))
+        results = await asyncio.gather(*(scheduler.fetch(str(server.make_url(f"/page?i={i}"))) for i in range(2)))
+
+    assert blocked is None
+    assert all(result.ok for result in results)
+    assert len(recorder.times) == 2
+    assert recorder.times[1] - recorder.times[0] >= 0.09
+    assert host_stats(scheduler)["blocked"] == 1
+
+
+@pytest.mark.asyncio
+async def test_crawl_merges_results_in_input_order_and_skips_failures():
+    async def page(request):
+        return web.Response(text=request.query["i"])
+
+    async with serve({"/page": page}) as server, aiohttp.ClientSession() as session:
+        scheduler = CrawlScheduler(session, delay_range=(0, 0))
+
+        async def handler(url):
+            result = await scheduler.fetch(url)
+            if result.text() == "1":
+                raise ValueError("解析失败")
+            return [{"value": result.text()}]
+
+        items = await scheduler.crawl([str(server.make_url(f"/page?i={i}")) for i in range(3)], handler)
+
+    assert items == [{"value": "0"}, {"value": "2"}]
+
+
+@pytest.mark.asyncio
+async def test_robots_group_matches_configured_user_agent():
+    async def robots(request):
+        return web.Response(text="User-agent: *\nDisallow:\n\nUser-agent: SEMIX-BOT\nDisallow: /page\n")
+
+    async def page(request):
+        return web.Response(text="ok")
+
+    async with serve({"/robots.txt": robots, "/page": page}) as server, aiohttp.ClientSession() as session:
+        scheduler = CrawlScheduler(session, delay_range=(0, 0), robots=RobotsCache(session, "SemiX-Bot/1.0"))
+        result = await scheduler.fetch(str(server.make_url("/page")))
+
+    assert result is None
+    assert host_stats(scheduler)["blocked"] == 1
@@ -0,0 +1,51 @@
+"""
+DataCollectionService 批量 upsert 测试
+"""
+from datetime import datetime
+
+from app.models.supplier import Supplier
+from app.services.data_collection_service import DataCollectionService
+from app.services.data_version_service import DataVersionService
+
+ROWS = [
+    {"company_name": f"公司{i}", "country": "中国", "main_products": ["芯片"], "product_categories": ["IC"]}
+    for i in range(3)
+]
+OLD_UPDATED_AT = datetime(2020, 1, 1)
+
+
+def _updated_at(db):
+    db.expire_all()
+    return {supplier.id: supplier.updated_at for supplier in db.query(Supplier)}
+
+
+def test_identical_upsert_keeps_updated_at_and_version(db):
+    service = DataCollectionService(mode="upsert", entity_resolution=False)
+    service.bulk_save_suppliers(db, ROWS)
+    db.query(Supplier).update({Supplier.updated_at: OLD_UPDATED_AT}, synchronize_session=False)
+    db.commit()
+    version = DataVersionService.get_versions(db, ["supplier"])
+
+    stats = service.bulk_save_suppliers(db, ROWS)
+
+    assert stats["unchanged"] == len(ROWS)
+    assert set(_updated_at(db).values()) == {OLD_UPDATED_AT}
+    assert DataVersionService.get_versions(db, ["supplier"]) == version
+
+
+def test_hash_backfill_keeps_updated_at_and_version(db):
+    service = DataCollectionService(mode="upsert", entity_resolution=False)
+    service.bulk_save_suppliers(db, ROWS)
+    # 模拟引入 content_hash 之前写入的旧数据
+    db.query(Supplier).update(
+        {Supplier.content_hash: None, Supplier.updated_at: OLD_UPDATED_AT}, synchronize_session=False
+    )
+    db.commit()
+    version = DataVersionService.get_versions(db, ["supplier"])
+
+    stats = service.bulk_save_suppliers(db, ROWS)
+
+    assert stats["unchanged"] == len(ROWS)
+    assert set(_updated_at(db).values()) == {OLD_UPDATED_AT}
+    assert DataVersionService.get_versions(db, ["supplier"]) == version
+    assert all(supplier.content_hash for supplier in db.query(Supplier))
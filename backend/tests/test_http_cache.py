@@ -0,0 +1,37 @@
+"""
+conditional_get 条件请求测试
+"""
+from unittest import mock
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.database import get_db
+from app.core.http_cache import UNVERSIONED_SORT_WINDOW, conditional_get
+
+
+@pytest.fixture
+def client(db):
+    app = FastAPI()
+
+    @app.get("/posts")
+    @conditional_get("community")
+    def list_posts(sort_by: str = "created_at", db=Depends(get_db)):
+        return []
+
+    return TestClient(app)
+
+
+def revalidate_later(client: TestClient, sort_by: str) -> int:
+    etag = client.get("/posts", params={"sort_by": sort_by}).headers["etag"]
+    with mock.patch("time.time", return_value=10 ** 10 + UNVERSIONED_SORT_WINDOW):
+        return client.get("/posts", params={"sort_by": sort_by}, headers={"If-None-Match": etag}).status_code
+
+
+def test_unchanged_list_returns_304(client):
+    assert revalidate_later(client, "created_at") == 304
+
+
+def test_view_count_sort_expires_with_time_window(client):
+    assert revalidate_later(client, "view_count") == 200
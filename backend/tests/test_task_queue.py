@@ -0,0 +1,106 @@
+"""
+持久化任务队列与worker测试（SQLite）
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.models.task_queue import DeadLetterTask, QueuedTask, TaskStatus
+from app.tasks.queue import OUTCOME_DEAD, OUTCOME_RETRY, SQLTaskQueue
+from app.tasks.registry import task
+from app.tasks.worker import Worker
+
+
+@pytest.fixture
+def task_queue(db):
+    return SQLTaskQueue(backoff_base=0)
+
+
+def queued_task(db, task_id: int) -> QueuedTask:
+    db.expire_all()
+    return db.query(QueuedTask).filter(QueuedTask.id == task_id).one()
+
+
+def test_task_is_claimed_only_once(task_queue):
+    task_queue.enqueue("noop")
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda i: task_queue.claim(f"worker-{i}", ["default"]), range(4)))
+
+    assert sum(len(claimed) for claimed in results) == 1
+    assert task_queue.claim("worker-late", ["default"]) == []
+
+
+def test_expired_lease_is_requeued(db, task_queue):
+    task_id = task_queue.enqueue("noop", max_attempts=3)
+    (claimed,) = task_queue.claim("worker-1", ["default"], visibility_timeout=-1)
+
+    assert task_queue.recover_expired() == 1
+
+    row = queued_task(db, task_id)
+    assert row.status == TaskStatus.QUEUED and row.locked_by is None
+    assert row.attempts == 1
+    # 原worker的迟到结果被忽略
+    assert task_queue.complete(claimed.id, "worker-1") is False
+
+
+def test_expired_lease_on_last_attempt_is_dead_lettered(db, task_queue):
+    task_id = task_queue.enqueue("noop", max_attempts=1)
+    task_queue.claim("worker-1", ["default"], visibility_timeout=-1)
+
+    assert task_queue.recover_expired() == 1
+
+    assert db.query(QueuedTask).filter(QueuedTask.id == task_id).count() == 0
+    dead = db.query(DeadLetterTask).one()
+    assert dead.task_id == task_id and dead.attempts == 1
+
+
+def test_failures_retry_until_attempts_are_exhausted(db, task_queue):
+    task_id = task_queue.enqueue("flaky", {"n": 1}, max_attempts=2)
+
+    task_queue.claim("worker-1", ["default"])
+    assert task_queue.fail(task_id, "worker-1", "ValueError: 1") == OUTCOME_RETRY
+    task_queue.claim("worker-1", ["default"])
+    assert task_queue.fail(task_id, "worker-1", "ValueError: 2") == OUTCOME_DEAD
+
+    dead = db.query(DeadLetterTask).one()
+    assert (dead.name, dead.attempts, dead.error) == ("flaky", 2, "ValueError: 2")
+    assert task_queue.stats()["dead_letters"] == 1
+
+
+def test_release_does_not_consume_an_attempt(db, task_queue):
+    task_id = task_queue.enqueue("noop", max_attempts=1)
+    task_queue.claim("worker-1", ["default"])
+
+    assert task_queue.release(task_id, "worker-1") is True
+
+    row = queued_task(db, task_id)
+    assert row.status == TaskStatus.QUEUED and row.attempts == 0
+    (claimed,) = task_queue.claim("worker-2", ["default"])
+    assert claimed.attempts == 1
+
+
+@task("tests.slow_task")
+async def slow_task():
+    await asyncio.sleep(10)
+
+
+@pytest.mark.asyncio
+async def test_worker_releases_cancelled_task_on_shutdown(db, task_queue):
+    task_id = slow_task.enqueue(task_queue=task_queue)
+    worker = Worker(task_queue, poll_interval=0.05, shutdown_timeout=0.1, worker_id="worker-1")
+
+    running = asyncio.create_task(worker.run())
+
+    async def started():
+        while not worker._running:
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(started(), 5)
+    worker.stop()
+    await asyncio.wait_for(running, 5)
+
+    row = queued_task(db, task_id)
+    assert row.status == TaskStatus.QUEUED and row.attempts == 0 and row.locked_by is None
+    assert db.query(DeadLetterTask).count() == 0